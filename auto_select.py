@@ -0,0 +1,367 @@
+"""Pick the fastest MST engine for a graph from a cost model fitted to earlier results.
+
+For every engine in mst_engine.ALGORITHMS the model is a least-squares fit
+of ``log execution_time_ms`` on a few cheap graph features:
+
+    log_vertices, log_edges   size
+    density                   E / (V (V - 1) / 2), what separates Prim from Kruskal
+    weight_cv                 spread of the weights (standard deviation / mean)
+    distinct_weights          share of distinct weights in a strided sample of
+                              at most WEIGHT_SAMPLE edges
+
+Plain output.json results only carry V and E, so the weight terms are
+only fitted once enough observations provide them. Results written by this script carry
+all features in their ``selection`` block. The model file keeps every
+observation it was fitted to, so ``--learn`` can add a run's results and
+refit without the original result files.
+
+Java and NumPy timings of the same graph differ by orders of magnitude,
+so every observation records its timing ``source`` and all engines are
+fitted from one source. ``--train`` results count as NumPy timings unless
+``--train-source java`` says Main wrote them, and a model fitted to Java
+timings is flagged before it dispatches, as its predictions are not in
+NumPy milliseconds. That is the source that times the most engines,
+preferring the NumPy engine this script dispatches to. Without
+``--audit``, a run only times the engine it picked, so ``--learn`` moves
+the model onto its own timings only once audited runs cover every engine.
+
+Before a graph is solved, each engine's time is predicted and only the
+fastest one runs. Each result records the decision::
+
+    "selection": {"algorithm", "features", "predicted_ms", "overhead_ms"}
+
+With ``--audit`` the other engines run as well. The result then has the
+full output.json schema, and ``regret_ms`` records the time lost to a wrong
+pick. Predicted against actual times are plotted to selector_accuracy.png.
+"""
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from json_stream import iter_results, results_writer
+
+# Execution times are rounded to this resolution; faster runs are clamped to it before the log
+TIME_RESOLUTION_MS = 0.01
+WEIGHT_SAMPLE = 4096
+DEFAULT_MODEL = 'selector_model.json'
+MIN_COMPLETE_SAMPLES = 10
+
+# Where an observation's execution times were measured: Main or the NumPy engine
+TIMING_SOURCES = ('java', 'numpy')
+DISPATCHED_SOURCE = 'numpy'  # solve_selected runs mst_engine
+DEFAULT_TRAIN_SOURCE = DISPATCHED_SOURCE
+
+# Regression terms computed from a features dict, NaN when the feature is missing
+FEATURE_TERMS = {
+    'log_vertices': lambda f: math.log1p(f['vertices']),
+    'log_edges': lambda f: math.log1p(f['edges']),
+    'density': lambda f: f['density'],
+    'weight_cv': lambda f: f.get('weight_cv', math.nan),
+    'distinct_weights': lambda f: f.get('distinct_weight_ratio', math.nan),
+}
+
+def _density(v, e):
+    return e / (v * (v - 1) / 2) if v > 1 else 0.0
+
+def graph_features(graph):
+    """Model features of an IndexedGraph, in O(E) without sorting the edges"""
+    v, e = graph.vertex_count, graph.edge_count
+    features = {'vertices': v, 'edges': e, 'density': round(_density(v, e), 6)}
+    if e:
+        weight = np.asarray(graph.weight, dtype=np.float64)
+        mean = float(weight.mean())
+        sample = weight[::max(1, e // WEIGHT_SAMPLE)]
+        features['weight_cv'] = round(float(weight.std()) / mean, 6) if mean else 0.0
+        features['distinct_weight_ratio'] = round(len(np.unique(sample)) / len(sample), 6)
+    return features
+
+def result_features(result):
+    """Features of the graph behind a result: its selection block, else V and E from input_stats"""
+    if 'selection' in result:
+        return result['selection']['features']
+    v, e = result['input_stats']['vertices'], result['input_stats']['edges']
+    return {'vertices': v, 'edges': e, 'density': _density(v, e)}
+
+def _terms(features, names):
+    return [FEATURE_TERMS[name](features) for name in names]
+
+def observation(result, source=DEFAULT_TRAIN_SOURCE):
+    """Features, timing source and per-engine execution_time_ms of one result, as stored in the model file.
+
+    Results with a selection block were timed by this script, so their
+    source is always DISPATCHED_SOURCE.
+    """
+    from mst_engine import ALGORITHMS
+
+    return {
+        'features': result_features(result),
+        'source': DISPATCHED_SOURCE if 'selection' in result else source,
+        'execution_time_ms': {algorithm: result[algorithm]['execution_time_ms']
+                              for algorithm in ALGORITHMS if algorithm in result},
+    }
+
+def _fit_engines(observations):
+    """Fit for every engine with at least three timed observations.
+
+    Once MIN_COMPLETE_SAMPLES observations carry every feature, only those
+    are used; until then the fit falls back to the terms all of them share.
+    """
+    samples = {}
+    for entry in observations:
+        terms = _terms(entry['features'], FEATURE_TERMS)
+        for algorithm, time_ms in entry['execution_time_ms'].items():
+            rows, times = samples.setdefault(algorithm, ([], []))
+            rows.append(terms)
+            times.append(time_ms)
+
+    fits = {}
+    for algorithm, (rows, times) in samples.items():
+        if len(rows) < 3:
+            continue
+        terms = np.asarray(rows, dtype=np.float64)
+        times = np.asarray(times, dtype=np.float64)
+        complete = ~np.isnan(terms).any(axis=1)
+        if complete.sum() >= MIN_COMPLETE_SAMPLES:
+            terms, times = terms[complete], times[complete]
+        usable = ~np.isnan(terms).any(axis=0)
+        names = [name for name, keep in zip(FEATURE_TERMS, usable) if keep]
+        design = np.column_stack((np.ones(len(terms)), terms[:, usable]))
+        log_time = np.log(np.maximum(times, TIME_RESOLUTION_MS))
+        coefficients, *_ = np.linalg.lstsq(design, log_time, rcond=None)
+        residuals = log_time - design @ coefficients
+        spread = float(np.sum((log_time - log_time.mean()) ** 2))
+        fits[algorithm] = {
+            'terms': names,
+            'intercept': float(coefficients[0]),
+            'coefficients': [float(c) for c in coefficients[1:]],
+            'samples': len(times),
+            'r_squared_log': 1.0 - float(np.sum(residuals ** 2)) / spread if spread else None,
+        }
+    return fits
+
+def fit_selector(observations):
+    """Cost model fitted to the observations of a single timing source.
+
+    The source timing the most engines wins, then DISPATCHED_SOURCE, then
+    the one with more observations. All observations are kept in the model
+    so later runs can add theirs and refit (``--learn``).
+    """
+    by_source = {}
+    for entry in observations:
+        by_source.setdefault(entry.get('source', DEFAULT_TRAIN_SOURCE), []).append(entry)
+    fits = {source: _fit_engines(entries) for source, entries in by_source.items()}
+    source = max(fits, key=lambda s: (len(fits[s]), s == DISPATCHED_SOURCE, len(by_source[s])),
+                 default=None)
+    if source is None or not fits[source]:
+        raise ValueError('need at least three timed results for some engine to fit a cost model')
+    return {'source': source, 'algorithms': fits[source], 'observations': list(observations)}
+
+def predict_ms(model, features):
+    """Predicted execution_time_ms of every modeled engine for a graph with these features"""
+    predictions = {}
+    for algorithm, fit in model['algorithms'].items():
+        log_time = fit['intercept'] + sum(c * t for c, t in zip(fit['coefficients'],
+                                                                _terms(features, fit['terms'])))
+        predictions[algorithm] = round(math.exp(log_time), 4)
+    return predictions
+
+def solve_selected(graph, model, audit=False):
+    """Output.json record solved by the engine predicted to be fastest.
+
+    With ``audit`` every modeled engine runs, in the order of the
+    predictions, and ``regret_ms`` compares the pick with the fastest run.
+    """
+    from mst_engine import run_algorithm
+
+    start = time.perf_counter()
+    features = graph_features(graph)
+    predicted = predict_ms(model, features)
+    algorithm = min(predicted, key=predicted.get)
+    overhead_ms = (time.perf_counter() - start) * 1000.0
+
+    result = {
+        'graph_id': graph.graph_id,
+        'input_stats': {'vertices': graph.vertex_count, 'edges': graph.edge_count},
+    }
+    for name in sorted(predicted, key=predicted.get) if audit else [algorithm]:
+        result[name] = run_algorithm(name, graph)
+    result['selection'] = {
+        'algorithm': algorithm,
+        'features': features,
+        'predicted_ms': predicted,
+        'overhead_ms': round(overhead_ms, 4),
+    }
+    if audit:
+        fastest = min(result[name]['execution_time_ms'] for name in predicted)
+        result['selection']['regret_ms'] = round(result[algorithm]['execution_time_ms'] - fastest, 4)
+    return result
+
+def selection_summary(result):
+    """One-line progress message for a record written by solve_selected"""
+    selection = result['selection']
+    algorithm = selection['algorithm']
+    others = ', '.join(f"{name} {ms:.2f} ms" for name, ms in selection['predicted_ms'].items()
+                       if name != algorithm)
+    line = (f"Graph {result['graph_id']}: {algorithm} (predicted "
+            f"{selection['predicted_ms'][algorithm]:.2f} ms vs {others}), actual "
+            f"{result[algorithm]['execution_time_ms']:.2f} ms")
+    if 'regret_ms' in selection:
+        line += f", regret {selection['regret_ms']:.2f} ms"
+    return line
+
+def plot_selector_accuracy(results, output_dir):
+    """Predicted against actual time per engine, and the actual/predicted ratio per graph"""
+    from visualize_complexity import plt
+
+    colors = {'prim': 'blue', 'kruskal': 'red'}
+    plt.figure(figsize=(14, 6))
+
+    plt.subplot(1, 2, 1)
+    bounds = []
+    for algorithm in sorted({name for r in results for name in r['selection']['predicted_ms']}):
+        pairs = [(r['selection']['predicted_ms'][algorithm],
+                  max(r[algorithm]['execution_time_ms'], TIME_RESOLUTION_MS))
+                 for r in results if algorithm in r]
+        if not pairs:
+            continue
+        predicted, actual = zip(*pairs)
+        bounds += [min(predicted + actual), max(predicted + actual)]
+        plt.scatter(predicted, actual, label=algorithm.capitalize(),
+                    color=colors.get(algorithm), alpha=0.6, s=30)
+    if bounds:
+        low, high = min(bounds) / 1.5, max(bounds) * 1.5
+        plt.plot([low, high], [low, high], 'k--', linewidth=1, label='Perfect prediction')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.xlabel('Predicted Time (ms)', fontsize=12)
+    plt.ylabel('Actual Time (ms)', fontsize=12)
+    plt.title('Cost Model Accuracy', fontsize=14, fontweight='bold')
+    plt.legend(fontsize=11)
+    plt.grid(True, which='both', alpha=0.3)
+
+    # Ratio of the dispatched engine, in solve order; audited mispicks are ringed
+    plt.subplot(1, 2, 2)
+    x = np.arange(len(results))
+    ratio = [max(r[r['selection']['algorithm']]['execution_time_ms'], TIME_RESOLUTION_MS)
+             / r['selection']['predicted_ms'][r['selection']['algorithm']] for r in results]
+    chosen = [r['selection']['algorithm'] for r in results]
+    plt.scatter(x, ratio, c=[colors.get(name, 'gray') for name in chosen], s=30, alpha=0.7)
+    mispicked = [i for i, r in enumerate(results) if r['selection'].get('regret_ms', 0) > 0]
+    if mispicked:
+        plt.scatter(x[mispicked], np.asarray(ratio)[mispicked], s=120, facecolors='none',
+                    edgecolors='black', label=f'Slower pick ({len(mispicked)})')
+        plt.legend(fontsize=11)
+    plt.axhline(1, color='gray', linestyle='--', linewidth=1)
+    plt.yscale('log')
+    plt.xlabel('Graph (solve order)', fontsize=12)
+    plt.ylabel('Actual / Predicted Time', fontsize=12)
+    plt.title('Prediction Error of the Dispatched Engine', fontsize=14, fontweight='bold')
+    plt.grid(True, which='both', alpha=0.3)
+
+    plt.tight_layout()
+    filename = f'{output_dir}/selector_accuracy.png'
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"Saved: {filename}")
+    plt.close()
+
+def describe_model(model):
+    """One line per modeled engine"""
+    source = model.get('source', DEFAULT_TRAIN_SOURCE)
+    lines = []
+    for algorithm, fit in model['algorithms'].items():
+        r_squared = fit['r_squared_log']
+        lines.append(f"{algorithm}: {fit['samples']} {source} results, terms {', '.join(fit['terms'])}, "
+                     f"R²(log)={'n/a' if r_squared is None else f'{r_squared:.3f}'}")
+    return lines
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Solve each graph with the engine a cost model predicts to be fastest')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('-o', '--output', default='output_auto.json',
+                        help='results with selection blocks, JSON Lines for a .jsonl name '
+                             '(default: output_auto.json)')
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help=f'cost model to use, or to write with --train (default: {DEFAULT_MODEL})')
+    parser.add_argument('--train', nargs='+', metavar='RESULTS',
+                        help='fit the model from these result files first')
+    parser.add_argument('--train-source', choices=TIMING_SOURCES, default=DEFAULT_TRAIN_SOURCE,
+                        help='what timed the --train results: numpy (mst_engine.py, batch_solve.py) '
+                             'or java (Main); auto_select.py results are always numpy '
+                             f'(default: {DEFAULT_TRAIN_SOURCE})')
+    parser.add_argument('--learn', action='store_true',
+                        help='add the new results to the model observations and refit; without '
+                             '--audit only the picked engine is timed')
+    parser.add_argument('--audit', action='store_true',
+                        help='also run the engines that were not picked, to measure regret')
+    parser.add_argument('--output-dir', default='analysis_plots',
+                        help='where to write selector_accuracy.png (default: analysis_plots)')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='skip selector_accuracy.png')
+    return parser.parse_args(argv)
+
+def _save_model(model, filename):
+    with open(filename, 'w') as f:
+        json.dump(model, f, indent=2)
+
+def main(argv=None):
+    """Fit or load the cost model and solve every graph in the input file"""
+    from mst_engine import iter_graphs
+
+    args = parse_args(argv)
+    if args.train:
+        model = fit_selector([observation(result, args.train_source) for filename in args.train
+                              for result in iter_results(filename)])
+        _save_model(model, args.model)
+        print(f"Cost model fitted to {len(model['observations'])} result(s) and saved to {args.model}")
+    else:
+        with open(args.model) as f:
+            model = json.load(f)
+    for line in describe_model(model):
+        print(f"  {line}")
+    source = model.get('source', DEFAULT_TRAIN_SOURCE)
+    if source != DISPATCHED_SOURCE:
+        print(f"  Warning: fitted to {source} timings but dispatching to the {DISPATCHED_SOURCE} "
+              f"engine; predicted_ms, regret_ms and selector_accuracy.png compare different implementations")
+
+    # Kept without their mst_edges for the summary, --learn and the plot
+    results = []
+    with results_writer(args.output) as writer:
+        for graph in iter_graphs(args.input):
+            result = solve_selected(graph, model, args.audit)
+            writer.write(result)
+            print(selection_summary(result))
+            for block in result.values():
+                if isinstance(block, dict):
+                    block.pop('mst_edges', None)
+            results.append(result)
+    print(f"Results for {writer.count} graph(s) saved to {args.output}")
+
+    picks = {}
+    for result in results:
+        picks[result['selection']['algorithm']] = picks.get(result['selection']['algorithm'], 0) + 1
+    print(f"Dispatched: {', '.join(f'{name} {count}' for name, count in picks.items())}")
+    if args.audit and results:
+        regrets = [result['selection']['regret_ms'] for result in results]
+        print(f"Fastest engine picked for {sum(regret <= 0 for regret in regrets)}/{len(regrets)} "
+              f"graph(s), total regret {sum(max(regret, 0) for regret in regrets):.2f} ms")
+
+    if args.learn:
+        refitted = fit_selector(model['observations'] + [observation(result) for result in results])
+        _save_model(refitted, args.model)
+        print(f"Cost model refitted to {len(refitted['observations'])} result(s) and saved to {args.model}")
+        if refitted['source'] != DISPATCHED_SOURCE:
+            print(f"  Still fitted to {refitted['source']} timings: run with --audit until this "
+                  f"script's own timings cover every engine")
+    if not args.no_plot and results:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        plot_selector_accuracy(results, args.output_dir)
+
+if __name__ == '__main__':
+    main()
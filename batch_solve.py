@@ -0,0 +1,118 @@
+"""Solve every graph of a dataset in parallel across a process pool.
+
+Graphs are streamed from an input.json file (or a graph_store.py file)
+and handed to worker processes, each of which runs Prim and Kruskal with
+the NumPy engine. Results are written to an output.json-schema file as
+soon as every earlier graph has been written, so the output keeps the
+input order (graph_id order for the bundled and generated datasets). At
+most ``max_pending`` graphs are in flight or waiting to be written,
+which bounds memory regardless of dataset size.
+
+Graphs from a store are not shipped to the workers: each worker maps the
+store itself and receives only the graph position.
+"""
+import argparse
+import collections
+import concurrent.futures
+import os
+
+from graph_store import GraphStore, is_graph_store
+from json_stream import iter_json_array, results_writer
+from mst_engine import result_summary, solve_graph
+
+# In-flight graphs per worker when --max-pending is not given
+PENDING_PER_WORKER = 4
+
+# Store opened by _init_batch_worker, shared by every task in the process
+_worker_store = None
+
+def _init_batch_worker(store_file=None):
+    """Map the graph store once per worker process"""
+    global _worker_store
+    _worker_store = GraphStore(store_file) if store_file else None
+
+def _solve_task(task, phases=False, memory=False, sensitivity=False, certify=False):
+    """Solve one graph: a position in the worker's store, or an input.json graph dict"""
+    graph = _worker_store.graph_at(task) if isinstance(task, int) else task
+    return solve_graph(graph, phases, memory, sensitivity, certify)
+
+def _tasks(input_file, store_file):
+    """Work items for every graph in the input, in input order"""
+    if store_file:
+        return range(len(GraphStore(store_file)))
+    return iter_json_array(input_file, 'graphs')
+
+def solve_batch(input_file, output_file, workers=None, max_pending=None, phases=False,
+                memory=False, sensitivity=False, certify=False):
+    """Solve every graph in input_file across ``workers`` processes and return the count.
+
+    ``workers=1`` solves in-process. Results are written in input order;
+    ``max_pending`` caps how many graphs are queued or buffered at once.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, workers)
+    if max_pending is None:
+        max_pending = PENDING_PER_WORKER * workers
+    max_pending = max(1, max_pending)
+    store_file = input_file if is_graph_store(input_file) else None
+
+    with results_writer(output_file) as writer:
+        def write(result):
+            writer.write(result)
+            print(result_summary(result))
+
+        if workers == 1:
+            _init_batch_worker(store_file)
+            for task in _tasks(input_file, store_file):
+                write(_solve_task(task, phases, memory, sensitivity, certify))
+            return writer.count
+
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(store_file,)) as pool:
+            # Futures in input order; the oldest is written once it completes
+            pending = collections.deque()
+            for task in _tasks(input_file, store_file):
+                pending.append(pool.submit(_solve_task, task, phases, memory, sensitivity,
+                                           certify))
+                while len(pending) >= max_pending or (pending and pending[0].done()):
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Solve every graph of a dataset across a process pool')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('-o', '--output', default='output.json',
+                        help='results file in the output.json schema, or JSON Lines for a .jsonl name '
+                             '(default: output.json)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: CPU count)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='graphs queued or awaiting output at once '
+                             f'(default: {PENDING_PER_WORKER} per worker)')
+    parser.add_argument('--phases', action='store_true',
+                        help='add per-phase counts and timings to every result')
+    parser.add_argument('--memory', action='store_true',
+                        help='add peak allocated and resident bytes to every result')
+    parser.add_argument('--sensitivity', action='store_true',
+                        help='add per-edge weight tolerances to every result')
+    parser.add_argument('--certify', action='store_true',
+                        help='add a minimum spanning tree certificate to every result')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Solve every graph in the input file"""
+    args = parse_args(argv)
+    count = solve_batch(args.input, args.output, args.workers, args.max_pending, args.phases,
+                        args.memory, args.sensitivity, args.certify)
+    print(f"Results for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
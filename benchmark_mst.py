@@ -0,0 +1,156 @@
+"""Repeated-trial MST benchmark that writes output.json results with timing statistics.
+
+Each algorithm/graph pair is run for a number of untimed warm-up iterations
+followed by N timed trials. ``execution_time_ms`` becomes the median trial and
+an extra ``timing`` block records the spread:
+
+    "timing": {
+        "warmup": 3, "trials": 15,
+        "median_ms": ..., "mean_ms": ..., "stdev_ms": ..., "min_ms": ...,
+        "p5_ms": ..., "p95_ms": ..., "ci95_low_ms": ..., "ci95_high_ms": ...
+    }
+
+The confidence interval is the distribution-free order-statistic interval for
+the median, so it needs no normality assumption and is deterministic. With
+fewer than MIN_CI_TRIALS trials no interval reaches 95% coverage, and both
+bounds are null.
+"""
+import argparse
+import gc
+import math
+import statistics
+import time
+
+from json_stream import results_writer
+from mst_engine import ALGORITHMS, IndexedGraph, algorithm_result, iter_graphs
+
+DEFAULT_WARMUP = 3
+DEFAULT_TRIALS = 15
+# Even [min, max] covers the median with probability 1 - 2 ** (1 - n) only,
+# which first reaches 95% at n = 6; fewer trials get no interval
+MIN_CI_TRIALS = 6
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lo = math.floor(rank)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (rank - lo)
+
+def median_confidence_interval(sorted_values, z=1.96):
+    """Order-statistic confidence interval for the median (normal approximation to the binomial).
+
+    NaN bounds below MIN_CI_TRIALS samples, where no interval reaches 95% coverage.
+    """
+    n = len(sorted_values)
+    if n < MIN_CI_TRIALS:
+        return math.nan, math.nan
+    half_width = z * math.sqrt(n) / 2.0
+    lo = max(int(math.floor(n / 2.0 - half_width)), 0)
+    hi = min(int(math.ceil(n / 2.0 + half_width)), n - 1)
+    return sorted_values[lo], sorted_values[hi]
+
+def timing_summary(samples_ms, warmup):
+    """Summary statistics for a list of trial times in milliseconds"""
+    ordered = sorted(samples_ms)
+    ci_low, ci_high = median_confidence_interval(ordered)
+    return {
+        'warmup': warmup,
+        'trials': len(ordered),
+        'median_ms': round(statistics.median(ordered), 4),
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'stdev_ms': round(statistics.stdev(ordered), 4) if len(ordered) > 1 else 0.0,
+        'min_ms': round(ordered[0], 4),
+        'p5_ms': round(percentile(ordered, 5), 4),
+        'p95_ms': round(percentile(ordered, 95), 4),
+        'ci95_low_ms': None if math.isnan(ci_low) else round(ci_low, 4),
+        'ci95_high_ms': None if math.isnan(ci_high) else round(ci_high, 4),
+    }
+
+def benchmark_algorithm(tree_function, graph, warmup=DEFAULT_WARMUP, trials=DEFAULT_TRIALS):
+    """Warm up, then time repeated runs of one algorithm on one graph"""
+    for _ in range(warmup):
+        outcome = tree_function(graph)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # Keep collector pauses out of individual samples
+    try:
+        for _ in range(trials):
+            start = time.perf_counter()
+            outcome = tree_function(graph)
+            samples.append((time.perf_counter() - start) * 1000.0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    mst, total_cost, operations = outcome
+    timing = timing_summary(samples, warmup)
+    result = algorithm_result(graph, mst, total_cost, operations, timing['median_ms'])
+    # Keep the median at the timing block's precision; sub-0.01 ms runs would
+    # otherwise round to zero
+    result['execution_time_ms'] = timing['median_ms']
+    result['timing'] = timing
+    return result
+
+def benchmark_graph(graph, warmup=DEFAULT_WARMUP, trials=DEFAULT_TRIALS):
+    """Benchmark every engine on one input.json graph and return its output.json record"""
+    indexed = IndexedGraph.from_json(graph) if isinstance(graph, dict) else graph
+    record = {
+        'graph_id': indexed.graph_id,
+        'input_stats': {
+            'vertices': indexed.vertex_count,
+            'edges': indexed.edge_count,
+        },
+    }
+    for name, tree_function in ALGORITHMS.items():
+        record[name] = benchmark_algorithm(tree_function, indexed, warmup, trials)
+    return record
+
+def _interval_text(timing):
+    """Median with its confidence interval, or without one when there were too few trials"""
+    text = f"{timing['median_ms']:.3f} ms"
+    if timing['ci95_low_ms'] is not None:
+        text += f" [{timing['ci95_low_ms']:.3f}, {timing['ci95_high_ms']:.3f}]"
+    return text
+
+def benchmark_file(input_file, output_file, warmup=DEFAULT_WARMUP, trials=DEFAULT_TRIALS):
+    """Benchmark every graph in an input.json file or graph store"""
+    with results_writer(output_file) as writer:
+        for graph in iter_graphs(input_file):
+            record = benchmark_graph(graph, warmup, trials)
+            writer.write(record)
+            summary = ', '.join(f"{name} {_interval_text(record[name]['timing'])}"
+                                for name in ALGORITHMS)
+            print(f"Graph {record['graph_id']}: {summary}")
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Benchmark MST engines with repeated trials')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('-o', '--output', default='output.json',
+                        help='results file in the output.json schema, or JSON Lines for a .jsonl name '
+                             '(default: output.json)')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                        help=f'untimed iterations per algorithm and graph (default: {DEFAULT_WARMUP})')
+    parser.add_argument('--trials', type=int, default=DEFAULT_TRIALS,
+                        help=f'timed iterations per algorithm and graph (default: {DEFAULT_TRIALS})')
+    args = parser.parse_args(argv)
+    if args.trials < 1 or args.warmup < 0:
+        parser.error('--trials must be at least 1 and --warmup non-negative')
+    return args
+
+def main(argv=None):
+    """Benchmark every graph in the input file"""
+    args = parse_args(argv)
+    count = benchmark_file(args.input, args.output, args.warmup, args.trials)
+    print(f"Benchmarked {count} graph(s) with {args.warmup} warm-up and "
+          f"{args.trials} timed trial(s); results saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+"""Worker-count scaling records of parallel_boruvka.py results.
+
+Kept apart from parallel_boruvka.py so that visualize_complexity.py can
+read the ``scaling`` list without importing multiprocessing. Only the
+standard library is used.
+"""
+
+# Worker counts timed by default, up to the CPU count
+DEFAULT_SCALING_WORKERS = (1, 2, 4, 8, 16, 32, 64)
+
+# Distinct worker counts per result that visualize_complexity.py keeps columns for
+MAX_SCALING_POINTS = 8
+
+def scaling_times(boruvka):
+    """(workers, execution_time_ms) pairs of a boruvka block, by increasing worker count"""
+    times = {entry['workers']: entry['execution_time_ms'] for entry in boruvka.get('scaling', [])}
+    return sorted(times.items())
@@ -0,0 +1,209 @@
+"""Certify that the Prim and Kruskal trees of a result are minimum spanning trees.
+
+A claimed tree passes when:
+
+- every tree edge is an edge of the graph and the tree weight equals the
+  reported ``total_cost``;
+- it is acyclic: a forest on V vertices with r components has V - r edges;
+- it spans: the endpoints of every non-tree edge lie in the same tree
+  component, so the tree connects whatever the graph connects;
+- it satisfies the cycle property: no non-tree edge is lighter than the
+  heaviest tree edge on the path between its endpoints.
+
+The cycle property is checked with one batch of path-maximum queries over
+the rooted tree (the binary lifting in sensitivity.py), so no MST is
+solved again and the work stays close to one pass over the edges.
+
+Each algorithm block gets::
+
+    "certificate": {"valid", "spanning", "acyclic", "cost_matches", "cycle_violations"}
+
+When the cycle property fails, ``violation`` names the non-tree edge that
+undercuts its tree path by the most and the tree edge it should replace.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from json_stream import results_writer
+from sensitivity import _component_roots, _path_maxima, _root_forest, tree_edge_ids
+
+# Bits of check_status(), from a Prim/Kruskal comparison and the certificates
+COST_MISMATCH = 1  # The two algorithms report different total costs
+EDGES_DIFFER = 2   # Same cost, different edge sets (equal weights broken differently)
+INVALID = 4        # A certificate was computed and failed
+CERTIFIED = 8      # Every tree present carries a passing certificate
+
+PROBLEMS = COST_MISMATCH | EDGES_DIFFER | INVALID
+
+# Label shown in the summaries for each bit, most severe first
+CHECK_LABELS = ((INVALID, 'invalid'), (COST_MISMATCH, 'cost differs'),
+                (EDGES_DIFFER, 'edges differ'), (CERTIFIED, 'certified'))
+
+def _tree_key(block):
+    """Edge multiset of an algorithm block, independent of edge order and direction"""
+    return sorted((min(e['from'], e['to']), max(e['from'], e['to']), e['weight'])
+                  for e in block['mst_edges'])
+
+def _blocks(result):
+    """(algorithm, block) pairs for the Prim and Kruskal blocks a result actually has"""
+    return [(algorithm, result[algorithm]) for algorithm in ('prim', 'kruskal') if algorithm in result]
+
+def check_status(result):
+    """CHECK_LABELS bits for one result record; 0 when the trees agree and nothing is certified.
+
+    The two trees are only compared when both blocks are present, as
+    auto_select.py and external_kruskal.py write a single one.
+    """
+    blocks = [block for _, block in _blocks(result)]
+    status = 0
+    if len(blocks) == 2:
+        prim, kruskal = blocks
+        if prim['total_cost'] != kruskal['total_cost']:
+            status |= COST_MISMATCH
+        elif _tree_key(prim) != _tree_key(kruskal):
+            status |= EDGES_DIFFER
+    certificates = [block.get('certificate') for block in blocks]
+    if any(certificate is not None and not certificate['valid'] for certificate in certificates):
+        status |= INVALID
+    elif certificates and all(certificate is not None for certificate in certificates):
+        status |= CERTIFIED
+    return status
+
+def check_label(status):
+    """Most severe outcome in a check_status value, or 'agree'"""
+    for bit, label in CHECK_LABELS:
+        if status & bit:
+            return label
+    return 'agree'
+
+def _failed(error):
+    """Certificate for a tree that could not be matched against the graph"""
+    return {'valid': False, 'spanning': False, 'acyclic': False, 'cost_matches': False,
+            'cycle_violations': None, 'error': error}
+
+def certify_tree(graph, tree_ids, total_cost, names=None):
+    """Certificate for the tree made of the graph edges ``tree_ids`` (see tree_edge_ids)"""
+    n = graph.vertex_count
+    src = np.asarray(graph.src, dtype=np.int64)
+    dst = np.asarray(graph.dst, dtype=np.int64)
+    weight = np.asarray(graph.weight, dtype=np.int64)
+    cost_matches = int(weight[tree_ids].sum()) == total_cost
+
+    parent, parent_edge, depth = _root_forest(n, src[tree_ids], dst[tree_ids])
+    parent = np.asarray(parent, dtype=np.int64)
+    acyclic = len(tree_ids) == n - int((parent == np.arange(n)).sum())
+
+    root = _component_roots(parent)
+    in_tree = np.zeros(len(weight), dtype=bool)
+    in_tree[tree_ids] = True
+    non_tree = np.flatnonzero(~in_tree)
+    connected = root[src[non_tree]] == root[dst[non_tree]]
+    spanning = bool(connected.all())
+
+    queries = non_tree[connected & (src[non_tree] != dst[non_tree])]  # Self-loops close no cycle
+    path_max, path_arg = _path_maxima(parent, parent_edge, depth, weight[tree_ids].astype(np.float64),
+                                      src[queries], dst[queries])
+    gap = path_max - weight[queries]
+    violations = int((gap > 0).sum())
+
+    certificate = {
+        'valid': bool(spanning and acyclic and cost_matches and violations == 0),
+        'spanning': spanning,
+        'acyclic': bool(acyclic),
+        'cost_matches': bool(cost_matches),
+        'cycle_violations': violations,
+    }
+    if violations:
+        if names is None:
+            names = list(graph.names)
+        worst = int(np.argmax(gap))
+        edge, heavier = int(queries[worst]), int(tree_ids[path_arg[worst]])
+        certificate['violation'] = {
+            'edge': {'from': names[src[edge]], 'to': names[dst[edge]], 'weight': int(weight[edge])},
+            'replaces': {'from': names[src[heavier]], 'to': names[dst[heavier]],
+                         'weight': int(weight[heavier])},
+        }
+    return certificate
+
+def certify_result(result, graph):
+    """Attach a certificate to every algorithm block of a result; identical trees share one"""
+    names = list(graph.names)
+    vertex_ids = {name: i for i, name in enumerate(names)}
+    computed = {}
+    for _, block in _blocks(result):
+        try:
+            mst = [(vertex_ids[e['from']], vertex_ids[e['to']], e['weight']) for e in block['mst_edges']]
+            tree_ids = tree_edge_ids(graph, mst)
+        except KeyError as error:
+            block['certificate'] = _failed(f'vertex {error} is not in the graph')
+            continue
+        except ValueError as error:
+            block['certificate'] = _failed(str(error))
+            continue
+        key = (np.sort(tree_ids).tobytes(), block['total_cost'])
+        if key not in computed:
+            computed[key] = certify_tree(graph, tree_ids, block['total_cost'], names=names)
+        block['certificate'] = dict(computed[key])
+    return result
+
+def _problems(certificate):
+    """Failed checks of a certificate as a short comma-separated list"""
+    if 'error' in certificate:
+        return certificate['error']
+    problems = [label for check, label in (('spanning', 'not spanning'), ('acyclic', 'has a cycle'),
+                                           ('cost_matches', 'cost mismatch'))
+                if not certificate[check]]
+    if certificate['cycle_violations']:
+        problems.append(f"{certificate['cycle_violations']} cycle-property violation(s)")
+    return ', '.join(problems)
+
+def certify_file(input_file, output_file, results_file=None):
+    """Write certified results for every graph in input_file and return (count, failed graph ids).
+
+    With ``results_file`` (e.g. the Java output.json), its trees are
+    checked as they are; otherwise the graphs are solved first with the
+    NumPy engine.
+    """
+    from mst_engine import iter_graph_results
+
+    failed = []
+    with results_writer(output_file) as writer:
+        for graph, result in iter_graph_results(input_file, results_file):
+            writer.write(certify_result(result, graph))
+            status = check_status(result)
+            if status & INVALID:
+                failed.append(result['graph_id'])
+            print(f"Graph {result['graph_id']}: {check_label(status)}"
+                  + ''.join(f"; {algorithm} {_problems(block['certificate'])}"
+                            for algorithm, block in _blocks(result)
+                            if not block['certificate']['valid']))
+    return writer.count, failed
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Check that Prim and Kruskal trees are minimum spanning trees')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('results', nargs='?',
+                        help='existing results for these graphs, e.g. from Main '
+                             '(default: solve them with mst_engine.py)')
+    parser.add_argument('-o', '--output', default='output_certified.json',
+                        help='results with certificate blocks (default: output_certified.json)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Certify every graph in the input file and return a process exit status"""
+    args = parse_args(argv)
+    count, failed = certify_file(args.input, args.output, args.results)
+    print(f"Certified results for {count} graph(s) saved to {args.output}")
+    if failed:
+        print(f"✗ {len(failed)} graph(s) with a tree that is not a minimum spanning tree: {failed}")
+        return 1
+    print("✓ Every tree is a minimum spanning tree")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Compare two MST result files and flag performance regressions.
+
+Graphs are aligned by ``graph_id``. For every algorithm the relative change in
+``operations_count`` and ``execution_time_ms`` is computed per graph and in
+aggregate. A graph regresses when the candidate is slower/costlier than the
+baseline by more than the configured threshold. When both runs carry
+benchmark confidence intervals, a time regression also requires the
+intervals not to overlap, so run-to-run noise is not reported. The script
+exits with status 1 if any regression is found, and with status 2 if the
+two runs have no graph id in common.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from visualize_complexity import load_columns_cached
+
+ALGORITHMS = ('prim', 'kruskal')
+DEFAULT_OPS_THRESHOLD = 0.05
+DEFAULT_TIME_THRESHOLD = 0.10
+DEFAULT_MIN_TIME_DELTA_MS = 0.05
+
+def align_runs(baseline, candidate):
+    """Indices into each run for the graph ids they have in common"""
+    common, base_idx, cand_idx = np.intersect1d(
+        baseline['graph_ids'], candidate['graph_ids'], assume_unique=False, return_indices=True)
+    return common, base_idx, cand_idx
+
+def _relative(base, cand):
+    """Absolute and relative change, NaN where either run lacks the algorithm's block"""
+    base = np.asarray(base, dtype=np.float64)
+    cand = np.asarray(cand, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel = np.where(base > 0, (cand - base) / base, np.where(cand > 0, np.inf, 0.0))
+    rel[np.isnan(base) | np.isnan(cand)] = np.nan
+    return cand - base, rel
+
+def compare_runs(baseline, candidate, ops_threshold=DEFAULT_OPS_THRESHOLD,
+                 time_threshold=DEFAULT_TIME_THRESHOLD, min_time_delta_ms=DEFAULT_MIN_TIME_DELTA_MS):
+    """Per-graph and aggregate deltas between two column dicts from visualize_complexity"""
+    graph_ids, bi, ci = align_runs(baseline, candidate)
+    report = {
+        'graph_ids': graph_ids,
+        'only_in_baseline': np.setdiff1d(baseline['graph_ids'], graph_ids),
+        'only_in_candidate': np.setdiff1d(candidate['graph_ids'], graph_ids),
+        'algorithms': {},
+    }
+
+    for algorithm in ALGORITHMS:
+        ops_delta, ops_rel = _relative(baseline[f'{algorithm}_ops'][bi], candidate[f'{algorithm}_ops'][ci])
+        time_delta, time_rel = _relative(baseline[f'{algorithm}_time'][bi], candidate[f'{algorithm}_time'][ci])
+
+        ops_regressed = ops_rel > ops_threshold
+        time_regressed = (time_rel > time_threshold) & (time_delta > min_time_delta_ms)
+
+        # With benchmark intervals on both sides, require them to separate
+        base_high = baseline[f'{algorithm}_time_ci_high'][bi]
+        cand_low = candidate[f'{algorithm}_time_ci_low'][ci]
+        has_noise = ~np.isnan(base_high) & ~np.isnan(cand_low)
+        time_regressed &= ~has_noise | (cand_low > base_high)
+
+        report['algorithms'][algorithm] = {
+            'ops_delta': ops_delta,
+            'ops_relative': ops_rel,
+            'time_delta_ms': time_delta,
+            'time_relative': time_rel,
+            'ops_regressed': ops_regressed,
+            'time_regressed': time_regressed,
+            'aggregate': _aggregate(baseline, candidate, algorithm, bi, ci),
+        }
+    return report
+
+def _aggregate(baseline, candidate, algorithm, bi, ci):
+    """Totals and geometric-mean ratios for one algorithm over the aligned graphs both runs solved with it"""
+    summary = {}
+    for label, column in (('ops', f'{algorithm}_ops'), ('time_ms', f'{algorithm}_time')):
+        base = np.asarray(baseline[column][bi], dtype=np.float64)
+        cand = np.asarray(candidate[column][ci], dtype=np.float64)
+        recorded = ~np.isnan(base) & ~np.isnan(cand)
+        base, cand = base[recorded], cand[recorded]
+        both = (base > 0) & (cand > 0)
+        summary[f'{label}_baseline_total'] = float(base.sum())
+        summary[f'{label}_candidate_total'] = float(cand.sum())
+        summary[f'{label}_total_relative'] = float((cand.sum() - base.sum()) / base.sum()) if base.sum() else None
+        summary[f'{label}_geomean_ratio'] = float(np.exp(np.mean(np.log(cand[both] / base[both])))) if both.any() else None
+    return summary
+
+def regressions(report):
+    """(graph_id, algorithm, metric, relative change) for every flagged regression"""
+    found = []
+    for algorithm, result in report['algorithms'].items():
+        for metric, flags, rel in (('operations', result['ops_regressed'], result['ops_relative']),
+                                   ('time', result['time_regressed'], result['time_relative'])):
+            for i in np.flatnonzero(flags):
+                found.append((int(report['graph_ids'][i]), algorithm, metric, float(rel[i])))
+    return sorted(found)
+
+def plot_deltas(report, output_dir, baseline_name, candidate_name):
+    """Side-by-side relative change in operations and time per graph"""
+    from visualize_complexity import plt
+
+    graph_ids = report['graph_ids']
+    x = np.arange(len(graph_ids))
+    width = 0.35
+    plt.figure(figsize=(14, 6))
+
+    for panel, (metric, flag_key, title) in enumerate((
+            ('ops_relative', 'ops_regressed', 'Operations Count Change'),
+            ('time_relative', 'time_regressed', 'Execution Time Change')), start=1):
+        plt.subplot(1, 2, panel)
+        for offset, algorithm, color in ((-width / 2, 'prim', 'skyblue'), (width / 2, 'kruskal', 'lightcoral')):
+            result = report['algorithms'][algorithm]
+            values = np.nan_to_num(result[metric] * 100, posinf=0.0)
+            edgecolors = np.where(result[flag_key], 'black', color)
+            plt.bar(x + offset, values, width, label=algorithm.capitalize(), color=color,
+                    alpha=0.8, edgecolor=edgecolors, linewidth=1.5)
+        plt.axhline(0, color='gray', linewidth=1)
+        plt.xlabel('Graph ID', fontsize=12)
+        plt.ylabel(f'{candidate_name} vs {baseline_name} (%)', fontsize=12)
+        plt.title(title, fontsize=14, fontweight='bold')
+        if len(graph_ids) <= 50:
+            plt.xticks(x, graph_ids)
+        plt.legend(fontsize=11)
+        plt.grid(True, axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    filename = f'{output_dir}/comparison_delta.png'
+    plt.savefig(filename, dpi=300, bbox_inches='tight')
+    print(f"Saved: {filename}")
+    plt.close()
+
+def _report_json(report):
+    """JSON-serializable view of a comparison report"""
+    def convert(value):
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        if isinstance(value, np.ndarray):
+            return [convert(v) for v in value.tolist()]
+        if isinstance(value, float) and not np.isfinite(value):
+            return None
+        return value
+    return convert(report)
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Compare two MST result files for regressions')
+    parser.add_argument('baseline', help='baseline results (output.json schema)')
+    parser.add_argument('candidate', help='candidate results (output.json schema)')
+    parser.add_argument('--ops-threshold', type=float, default=DEFAULT_OPS_THRESHOLD,
+                        help=f'relative operations increase that counts as a regression '
+                             f'(default: {DEFAULT_OPS_THRESHOLD})')
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help=f'relative time increase that counts as a regression '
+                             f'(default: {DEFAULT_TIME_THRESHOLD})')
+    parser.add_argument('--min-time-delta-ms', type=float, default=DEFAULT_MIN_TIME_DELTA_MS,
+                        help='ignore time increases smaller than this many ms '
+                             f'(default: {DEFAULT_MIN_TIME_DELTA_MS})')
+    parser.add_argument('--output-dir', default='analysis_plots',
+                        help='directory for comparison_delta.png (default: analysis_plots)')
+    parser.add_argument('--report', help='optional path for a JSON report of all deltas')
+    parser.add_argument('--no-plot', action='store_true', help='skip the delta plot')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Compare the two runs and return a process exit status"""
+    args = parse_args(argv)
+    baseline = load_columns_cached(args.baseline)
+    candidate = load_columns_cached(args.candidate)
+    report = compare_runs(baseline, candidate, args.ops_threshold,
+                          args.time_threshold, args.min_time_delta_ms)
+
+    if len(report['graph_ids']) == 0:
+        print(f"✗ {args.baseline} and {args.candidate} have no graph id in common; nothing to compare")
+        return 2
+    print(f"Compared {len(report['graph_ids'])} graph(s): {args.baseline} -> {args.candidate}")
+    for label in ('only_in_baseline', 'only_in_candidate'):
+        if len(report[label]):
+            print(f"  Warning: {len(report[label])} graph(s) {label.replace('_', ' ')} were not compared: "
+                  f"{report[label].tolist()}")
+    for algorithm, result in report['algorithms'].items():
+        agg = result['aggregate']
+        ops_change = agg['ops_total_relative']
+        time_change = agg['time_ms_total_relative']
+        print(f"  {algorithm.capitalize()}: total ops "
+              f"{'n/a' if ops_change is None else f'{ops_change:+.1%}'}, total time "
+              f"{'n/a' if time_change is None else f'{time_change:+.1%}'}")
+
+    if not args.no_plot:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        plot_deltas(report, args.output_dir, Path(args.baseline).stem, Path(args.candidate).stem)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(_report_json(report), f, indent=2)
+        print(f"Saved: {args.report}")
+
+    found = regressions(report)
+    if not found:
+        print("✓ No regressions detected")
+        return 0
+    print(f"✗ {len(found)} regression(s) detected:")
+    for graph_id, algorithm, metric, rel in found:
+        print(f"  Graph {graph_id}: {algorithm} {metric} {rel:+.1%}")
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
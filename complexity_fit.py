@@ -0,0 +1,165 @@
+"""Least-squares fits of MST operation counts and run times against complexity models.
+
+Each candidate model f(V, E) is fitted as ``y = constant * f(V, E) + intercept``
+and reported with R², RMSE and per-graph residuals. A free power law
+``y = c * V^a * E^b`` is fitted in log space to give empirical exponents.
+Results are written as JSON next to the plots so scaling can be checked
+quantitatively rather than by eye.
+"""
+import argparse
+import json
+
+import numpy as np
+
+def inverse_ackermann(n):
+    """Inverse Ackermann function alpha(n), elementwise (at most 4 for any practical n)"""
+    n = np.asarray(n, dtype=np.float64)
+    # alpha(n) = min k with A(k, k) >= n, where A(k, k) = 1, 3, 7, 61, ...
+    return np.select([n <= 1, n <= 3, n <= 7, n <= 61], [0, 1, 2, 3], default=4).astype(np.float64)
+
+CANDIDATE_MODELS = {
+    'E log V': lambda v, e: e * np.log2(np.maximum(v, 2)),
+    'E log E': lambda v, e: e * np.log2(np.maximum(e, 2)),
+    'V^2': lambda v, e: v * v,
+    'E alpha(V)': lambda v, e: e * np.maximum(inverse_ackermann(v), 1),
+}
+
+# Quantities fitted per algorithm: output key -> column suffix in the data dict
+FIT_TARGETS = {
+    'operations': 'ops',
+    'time_ms': 'time',
+}
+
+def _finite_or_none(value):
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+def _r_squared(y, predicted):
+    ss_res = float(np.sum((y - predicted) ** 2))
+    ss_tot = float(np.sum((y - y.mean()) ** 2))
+    if ss_tot == 0:
+        return None
+    return 1.0 - ss_res / ss_tot
+
+def fit_model(v, e, y, model):
+    """Fit y = constant * model(V, E) + intercept by ordinary least squares"""
+    feature = CANDIDATE_MODELS[model](v, e)
+    design = np.column_stack((feature, np.ones_like(feature)))
+    (constant, intercept), *_ = np.linalg.lstsq(design, y, rcond=None)
+    predicted = constant * feature + intercept
+    residuals = y - predicted
+    return {
+        'constant': _finite_or_none(constant),
+        'intercept': _finite_or_none(intercept),
+        'r_squared': _r_squared(y, predicted),
+        'rmse': _finite_or_none(np.sqrt(np.mean(residuals ** 2))),
+        'residuals': np.round(residuals, 6).tolist(),
+    }
+
+def fit_power_law(v, e, y):
+    """Fit log y = log c + a log V + b log E on the strictly positive samples"""
+    positive = (y > 0) & (v > 0) & (e > 0)
+    if positive.sum() < 3:
+        return None
+    log_v, log_e, log_y = np.log(v[positive]), np.log(e[positive]), np.log(y[positive])
+    design = np.column_stack((log_v, log_e, np.ones_like(log_v)))
+    (a, b, log_c), *_ = np.linalg.lstsq(design, log_y, rcond=None)
+    return {
+        'vertex_exponent': _finite_or_none(a),
+        'edge_exponent': _finite_or_none(b),
+        'constant': _finite_or_none(np.exp(log_c)),
+        'r_squared_log': _r_squared(log_y, design @ np.array([a, b, log_c])),
+        'samples': int(positive.sum()),
+    }
+
+def fit_target(v, e, y):
+    """Fit every candidate model and the power law to one series.
+
+    Graphs without a value (NaN) are left out of the fit and get a None residual.
+    """
+    recorded = ~np.isnan(y)
+    v, e, y = v[recorded], e[recorded], y[recorded]
+    models = {name: fit_model(v, e, y, name) for name in CANDIDATE_MODELS}
+    if not recorded.all():
+        for fit in models.values():
+            residuals = iter(fit['residuals'])
+            fit['residuals'] = [next(residuals) if row else None for row in recorded]
+    ranked = [name for name in models if models[name]['r_squared'] is not None]
+    best = max(ranked, key=lambda name: models[name]['r_squared']) if ranked else None
+    return {
+        'models': models,
+        'best_model': best,
+        'power_law': fit_power_law(v, e, y),
+    }
+
+def fit_all(data, algorithms=('prim', 'kruskal')):
+    """Fit operations and time for each algorithm in a column dict from visualize_complexity"""
+    v = np.asarray(data['vertices'], dtype=np.float64)
+    e = np.asarray(data['edges'], dtype=np.float64)
+    fits = {
+        'graph_ids': [int(g) for g in data['graph_ids']],
+        'algorithms': {},
+    }
+    if len(v) < 2:
+        return fits
+    for algorithm in algorithms:
+        # Skip algorithms that too few records have a block for (see auto_select.py)
+        if np.count_nonzero(~np.isnan(np.asarray(data[f'{algorithm}_ops'], dtype=np.float64))) < 2:
+            continue
+        fits['algorithms'][algorithm] = {
+            target: fit_target(v, e, np.asarray(data[f'{algorithm}_{suffix}'], dtype=np.float64))
+            for target, suffix in FIT_TARGETS.items()
+        }
+    return fits
+
+def predict(fit, model, v, e):
+    """Evaluate a fitted candidate model at the given V and E"""
+    params = fit['models'][model]
+    feature = CANDIDATE_MODELS[model](np.asarray(v, dtype=np.float64), np.asarray(e, dtype=np.float64))
+    return params['constant'] * feature + params['intercept']
+
+def write_fits(data, filename):
+    """Fit every series and write the results as compact JSON"""
+    fits = fit_all(data)
+    with open(filename, 'w') as f:
+        json.dump(fits, f, separators=(',', ':'))
+    return fits
+
+def describe(fits):
+    """One line per algorithm and target naming the best model"""
+    lines = []
+    for algorithm, targets in fits['algorithms'].items():
+        for target, fit in targets.items():
+            best = fit['best_model']
+            if best is None:
+                continue
+            power = fit['power_law']
+            exponents = ''
+            if power is not None:
+                exponents = (f", V^{power['vertex_exponent']:.2f} "
+                             f"E^{power['edge_exponent']:.2f}")
+            lines.append(f"{algorithm} {target}: best {best} "
+                         f"(R²={fit['models'][best]['r_squared']:.4f}{exponents})")
+    return lines
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Fit complexity models to MST results')
+    parser.add_argument('results', nargs='?', default='output.json',
+                        help='results file in the output.json schema or JSON Lines (default: output.json)')
+    parser.add_argument('-o', '--output', default='complexity_fit.json',
+                        help='where to write the fits (default: complexity_fit.json)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Fit the models for one results file"""
+    from visualize_complexity import load_columns_cached
+
+    args = parse_args(argv)
+    fits = write_fits(load_columns_cached(args.results), args.output)
+    for line in describe(fits):
+        print(line)
+    print(f"Fits saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""MSTs of district networks given as coordinates, without the complete graph.
+
+Each graph lists its districts with positions instead of roads::
+
+    {"id": 1, "name": "...", "nodes": ["A", "B", ...], "coordinates": [[x, y], ...],
+     "cost": {"distance_unit": 100, "minimum": 1, "exponent": 1}}
+
+Any pair of districts may be joined. A road costs
+``max(minimum, ceil(distance_unit * length ** exponent))``, and ``cost`` is
+optional. The cost only grows with length, so the Euclidean MST is a
+minimum spanning tree for it. The MST is therefore found inside a sparse
+candidate set that contains the Euclidean MST:
+
+    delaunay  the Delaunay triangulation (needs scipy), at most 3V edges
+    grid      each district's nearest neighbours from a uniform grid, plus
+              the Euclidean MST edges those lists miss. A Borůvka pass finds
+              them, looking up each component's nearest outside district in
+              the lists first and searching grid rings outward only when the
+              lists cannot rule out a closer one
+
+The candidate set then goes through mst_engine.solve_graph like any
+input.json graph. The result is an ordinary output.json record, plus a
+``geometry`` block describing the candidate set.
+"""
+import argparse
+import importlib.util
+import math
+import time
+
+import numpy as np
+
+from json_stream import iter_json_array, results_writer
+
+CANDIDATE_METHODS = ('auto', 'delaunay', 'grid')
+DEFAULT_NEIGHBOURS = 6
+POINTS_PER_CELL = 2
+PAIR_BATCH = 1 << 20  # Candidate (query, point) pairs examined per NumPy step
+DEFAULT_COST = {'distance_unit': 100, 'minimum': 1, 'exponent': 1.0}
+
+class PointGrid:
+    """Uniform grid over the points, with the points of each cell contiguous in ``order``"""
+
+    def __init__(self, points, per_cell=POINTS_PER_CELL):
+        n = len(points)
+        low = points.min(axis=0)
+        extent = points.max(axis=0) - low
+        area = float(extent[0] * extent[1])
+        if area > 0:
+            size = math.sqrt(area * per_cell / n)
+        else:  # Collinear or coincident points
+            size = float(extent.max()) * per_cell / n or 1.0
+        shape = np.minimum(np.floor(extent / size).astype(np.int64) + 1, 4 * n + 1)
+        self.size = size
+        self.nx, self.ny = int(shape[0]), int(shape[1])
+        cells = np.minimum(((points - low) / size).astype(np.int64), shape - 1)
+        self.cx, self.cy = cells[:, 0], cells[:, 1]
+        cell = self.cx * self.ny + self.cy
+        self.order = np.argsort(cell, kind='stable')
+        self.start = np.zeros(self.nx * self.ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell, minlength=self.nx * self.ny), out=self.start[1:])
+
+    def members(self, tx, ty):
+        """(row, point) for every point in cell (tx[row], ty[row]); rows outside the grid give none"""
+        valid = (tx >= 0) & (tx < self.nx) & (ty >= 0) & (ty < self.ny)
+        rows = np.flatnonzero(valid)
+        cell = tx[rows] * self.ny + ty[rows]
+        first, count = self.start[cell], self.start[cell + 1] - self.start[cell]
+        offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        return np.repeat(rows, count), self.order[np.repeat(first, count) + offsets]
+
+def _ring(r):
+    """Cell offsets at Chebyshev distance exactly r"""
+    if r == 0:
+        return np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+    side = np.arange(-r, r + 1)
+    inner = side[1:-1]
+    dx = np.concatenate((side, side, np.full(len(inner), -r), np.full(len(inner), r)))
+    dy = np.concatenate((np.full(len(side), -r), np.full(len(side), r), inner, inner))
+    return dx, dy
+
+def _first_per_row(rows, distance, *payload):
+    """Smallest distance per row among (row, distance) pairs, with its payload"""
+    order = np.lexsort((distance, rows))
+    rows = rows[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    return (rows[first], distance[order][first]) + tuple(p[order][first] for p in payload)
+
+def neighbour_lists(points, grid, k=DEFAULT_NEIGHBOURS):
+    """k nearest neighbours of every point from its 3x3 block of cells.
+
+    Returns (neighbours, distances, radius): ``neighbours`` is padded with
+    -1 and sorted by distance, and every point closer than ``radius`` is
+    listed. Anything missing from a list is at least ``radius`` away.
+    """
+    n = len(points)
+    neighbours = np.full((n, k), -1, dtype=np.int64)
+    distances = np.full((n, k), np.inf)
+    radius = np.full(n, grid.size)
+    dx, dy = (offset.ravel() for offset in np.meshgrid((-1, 0, 1), (-1, 0, 1)))
+    batch = max(1, PAIR_BATCH // (9 * POINTS_PER_CELL * 2))
+    for lo in range(0, n, batch):
+        query = np.arange(lo, min(lo + batch, n))
+        rows, member = grid.members(np.repeat(grid.cx[query], 9) + np.tile(dx, len(query)),
+                                    np.repeat(grid.cy[query], 9) + np.tile(dy, len(query)))
+        rows //= 9
+        distance = np.hypot(*(points[query[rows]] - points[member]).T)
+        # Only the 3x3 block is complete, and only up to one cell width
+        keep = (member != query[rows]) & (distance <= grid.size)
+        rows, member, distance = rows[keep], member[keep], distance[keep]
+        order = np.lexsort((distance, rows))
+        rows, member, distance = rows[order], member[order], distance[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        listed = rank < k
+        neighbours[query[rows[listed]], rank[listed]] = member[listed]
+        distances[query[rows[listed]], rank[listed]] = distance[listed]
+    full = neighbours[:, -1] >= 0
+    radius[full] = distances[full, -1]
+    return neighbours, distances, radius
+
+def _nearest_outside(points, grid, component, queries, component_best):
+    """Nearest point of another component for each query, searching grid rings outward.
+
+    A query stops once no farther ring can beat its own find or the best
+    edge already known for its component (``component_best``, updated in
+    place). Returns (partner, distance), -1/inf where nothing is closer.
+    """
+    partner = np.full(len(queries), -1, dtype=np.int64)
+    best = np.full(len(queries), np.inf)
+    active = np.arange(len(queries))
+    r = 0
+    while len(active):
+        dx, dy = _ring(r)
+        batch = max(1, PAIR_BATCH // (len(dx) * POINTS_PER_CELL))
+        for lo in range(0, len(active), batch):
+            rows = active[lo:lo + batch]
+            query = queries[rows]
+            pair_rows, member = grid.members(np.repeat(grid.cx[query], len(dx)) + np.tile(dx, len(rows)),
+                                             np.repeat(grid.cy[query], len(dy)) + np.tile(dy, len(rows)))
+            pair_rows = rows[pair_rows // len(dx)]
+            outside = component[member] != component[queries[pair_rows]]
+            pair_rows, member = pair_rows[outside], member[outside]
+            distance = np.hypot(*(points[queries[pair_rows]] - points[member]).T)
+            found, distance, member = _first_per_row(pair_rows, distance, member)
+            closer = distance < best[found]
+            best[found[closer]] = distance[closer]
+            partner[found[closer]] = member[closer]
+            np.minimum.at(component_best, component[queries[found]], distance)
+        # Points in ring r + 1 or beyond are at least r cell widths away
+        reach = r * grid.size
+        active = active[(best[active] > reach) & (component_best[component[queries[active]]] > reach)]
+        r += 1
+        if r > max(grid.nx, grid.ny):
+            break
+    return partner, best
+
+def grid_candidates(points, k=DEFAULT_NEIGHBOURS):
+    """Nearest-neighbour edges plus the Euclidean MST edges they miss, as (src, dst) arrays"""
+    n = len(points)
+    if n < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    grid = PointGrid(points)
+    neighbours, distances, radius = neighbour_lists(points, grid, k)
+
+    parent = np.arange(n)
+    tree_src, tree_dst = [], []
+    rows = np.arange(n)
+    while len(tree_src) < n - 1:
+        component = parent
+        # Nearest point of another component according to the lists
+        outside = (neighbours >= 0) & (component[np.maximum(neighbours, 0)] != component[:, None])
+        listed = outside.any(axis=1)
+        first = outside.argmax(axis=1)
+        partner = np.where(listed, neighbours[rows, first], -1)
+        distance = np.where(listed, distances[rows, first], np.inf)
+        component_best = np.full(n, np.inf)
+        np.minimum.at(component_best, component, distance)
+
+        # Unlisted points that might still hold their component's shortest edge
+        search = np.flatnonzero(~listed & (radius < component_best[component]))
+        if len(search):
+            partner[search], distance[search] = _nearest_outside(points, grid, component, search,
+                                                                 component_best)
+        found = np.flatnonzero(partner >= 0)
+        _, _, src, dst = _first_per_row(component[found], distance[found], found, partner[found])
+
+        # Equal distances can close a cycle; the union-find drops the extra edge
+        for u, v in zip(src.tolist(), dst.tolist()):
+            root_u, root_v = u, v
+            while parent[root_u] != root_u:
+                root_u = parent[root_u]
+            while parent[root_v] != root_v:
+                root_v = parent[root_v]
+            if root_u != root_v:
+                parent[root_u] = root_v
+                tree_src.append(u)
+                tree_dst.append(v)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    listed = neighbours >= 0
+    src = np.concatenate((np.repeat(rows, k)[listed.ravel()], tree_src))
+    dst = np.concatenate((neighbours[listed], tree_dst))
+    return src, dst
+
+def delaunay_candidates(points):
+    """Delaunay triangulation edges as (src, dst) arrays; coincident points join their twin"""
+    from scipy.spatial import Delaunay
+
+    triangulation = Delaunay(points)
+    simplices = triangulation.simplices
+    src = np.concatenate((simplices[:, 0], simplices[:, 1], simplices[:, 2]))
+    dst = np.concatenate((simplices[:, 1], simplices[:, 2], simplices[:, 0]))
+    if len(triangulation.coplanar):
+        src = np.concatenate((src, triangulation.coplanar[:, 0]))
+        dst = np.concatenate((dst, triangulation.coplanar[:, 2]))
+    return src.astype(np.int64), dst.astype(np.int64)
+
+def candidate_edges(points, method='auto', k=DEFAULT_NEIGHBOURS):
+    """Distinct candidate pairs (src < dst) containing a Euclidean MST, and the method used"""
+    if method in ('auto', 'delaunay') and len(points) >= 3:
+        try:
+            src, dst = delaunay_candidates(points)
+            method = 'delaunay'
+        except ImportError:
+            if method == 'delaunay':
+                raise
+            method = 'grid'
+        except Exception:  # Qhull rejects degenerate inputs such as collinear points
+            method = 'grid'
+    else:
+        method = 'grid'
+    if method == 'grid':
+        src, dst = grid_candidates(points, k)
+    if len(points) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), method
+    low, high = np.minimum(src, dst), np.maximum(src, dst)
+    pairs = np.sort(low * len(points) + high)
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    return pairs // len(points), pairs % len(points), method
+
+def road_costs(length, distance_unit=100, minimum=1, exponent=1.0):
+    """Integer road cost for each length; non-decreasing in length"""
+    return np.maximum(minimum, np.ceil(distance_unit * length ** exponent)).astype(np.int64)
+
+def check_cost(cost, graph_id):
+    """Reject a cost block that road_costs cannot apply or that would not grow with length"""
+    unknown = set(cost) - set(DEFAULT_COST)
+    if unknown:
+        raise ValueError(f"graph {graph_id}: unknown cost field(s) {', '.join(sorted(unknown))}")
+    for field, value in cost.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"graph {graph_id}: cost {field} must be a finite number, got {value!r}")
+    if cost['exponent'] <= 0 or cost['distance_unit'] < 0:
+        raise ValueError(f"graph {graph_id}: cost exponent must be positive and distance_unit "
+                         f"non-negative, or costs would not grow with length")
+
+def geometric_graph(graph, method='auto', k=DEFAULT_NEIGHBOURS, cost=None):
+    """IndexedGraph over the candidate roads of a coordinates graph, and its geometry block"""
+    from mst_engine import IndexedGraph
+
+    points = np.asarray(graph['coordinates'], dtype=np.float64).reshape(-1, 2)
+    names = list(graph.get('nodes') or (f'N{i}' for i in range(len(points))))
+    if len(names) != len(points):
+        raise ValueError(f"graph {graph['id']}: {len(names)} nodes but {len(points)} coordinates")
+    cost = {**DEFAULT_COST, **(cost or {}), **graph.get('cost', {})}
+    check_cost(cost, graph['id'])
+
+    start = time.perf_counter()
+    src, dst, method = candidate_edges(points, method, k)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    length = np.hypot(*(points[src] - points[dst]).T)
+    indexed = IndexedGraph(graph['id'], names, src.astype(np.int32), dst.astype(np.int32),
+                           road_costs(length, **cost))
+    geometry = {
+        'candidates': method,
+        'candidate_edges': len(src),
+        'candidate_ms': round(elapsed_ms, 2),
+        'cost': cost,
+    }
+    return indexed, geometry
+
+def solve_file(input_file, output_file, method='auto', k=DEFAULT_NEIGHBOURS, cost=None):
+    """Solve every coordinates graph in input_file and write output.json records"""
+    from mst_engine import result_summary, solve_graph
+
+    with results_writer(output_file) as writer:
+        for graph in iter_json_array(input_file, 'graphs'):
+            indexed, geometry = geometric_graph(graph, method, k, cost)
+            result = solve_graph(indexed)
+            result['geometry'] = geometry
+            writer.write(result)
+            print(f"{result_summary(result)} ({geometry['candidates']} candidates, "
+                  f"{geometry['candidate_ms']:.2f} ms)")
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='MSTs of district networks given as coordinates')
+    parser.add_argument('input', nargs='?', default='districts.json',
+                        help='graphs with "coordinates" instead of "edges" (default: districts.json)')
+    parser.add_argument('-o', '--output', default='output.json',
+                        help='results file in the output.json schema, or JSON Lines for a .jsonl name '
+                             '(default: output.json)')
+    parser.add_argument('--candidates', choices=CANDIDATE_METHODS, default='auto',
+                        help='candidate roads: delaunay (needs scipy), grid, or auto '
+                             '(delaunay when scipy is installed)')
+    parser.add_argument('--neighbours', type=int, default=DEFAULT_NEIGHBOURS,
+                        help=f'nearest neighbours per district for grid candidates (default: {DEFAULT_NEIGHBOURS})')
+    parser.add_argument('--distance-unit', type=float, default=DEFAULT_COST['distance_unit'],
+                        help='cost per unit of road length, unless a graph sets its own "cost"')
+    parser.add_argument('--min-cost', type=int, default=DEFAULT_COST['minimum'],
+                        help='cheapest possible road')
+    parser.add_argument('--exponent', type=float, default=DEFAULT_COST['exponent'],
+                        help='cost grows with length ** exponent (must be positive)')
+    args = parser.parse_args(argv)
+    if args.neighbours < 1 or args.exponent <= 0:
+        parser.error('--neighbours and --exponent must be positive')
+    if args.distance_unit < 0:
+        parser.error('--distance-unit must not be negative')
+    if args.candidates == 'delaunay' and importlib.util.find_spec('scipy') is None:
+        parser.error('--candidates delaunay needs scipy; use grid or auto')
+    return args
+
+def main(argv=None):
+    """Solve every coordinates graph in the input file"""
+    args = parse_args(argv)
+    cost = {'distance_unit': args.distance_unit, 'minimum': args.min_cost, 'exponent': args.exponent}
+    count = solve_file(args.input, args.output, args.candidates, args.neighbours, cost)
+    print(f"Results for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
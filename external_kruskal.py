@@ -0,0 +1,451 @@
+"""Out-of-core Kruskal for graphs whose edge lists do not fit in memory.
+
+The edges never sit in memory all at once. They are read from disk in
+chunks:
+- a graph_store.py file is read straight from its edge arrays;
+- input.json graphs are streamed edge by edge and spooled to a scratch file.
+
+The work is a filter-Kruskal over files, bounded by ``--memory-mb``:
+
+1. A run of edges larger than the budget is partitioned into weight
+   buckets with pivots from a random sample, written as scratch files.
+2. Buckets are processed lightest first. Edges whose endpoints the
+   union-find already connects cannot enter the tree, so each chunk is
+   filtered before it is sorted or written again.
+3. A bucket that fits is loaded, filtered, sorted and joined. One that
+   still does not fit is partitioned again, or streamed in file order
+   when all its weights are equal.
+
+Partitions keep file order, so ties are broken by input position exactly
+as in mst_engine.kruskal_tree, and the tree is the same. Reading stops
+once the tree spans all V vertices.
+
+Per-vertex state stays resident: an int32 parent array with byte ranks,
+the tree found so far, and the vertex names (for JSON input, also the
+name-to-id dictionary). Only the per-edge working set is bounded.
+
+Results follow the output.json schema with a ``kruskal`` block only (Prim
+needs the whole adjacency in memory), plus an ``external`` block
+describing the passes and the peak resident memory.
+"""
+import argparse
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from json_stream import iter_graph_edges, results_writer
+from memory_profile import ResidentGrowth
+
+# One edge as spooled and partitioned on disk
+EDGE_DTYPE = np.dtype([('src', '<i4'), ('dst', '<i4'), ('weight', '<i8')])
+
+DEFAULT_MEMORY_MB = 256
+# Working memory per edge of a loaded chunk: the record, its filtered and
+# sorted copies, endpoint roots and the sort order
+WORKING_BYTES_PER_EDGE = 80
+# Resident bytes per vertex: int32 parent, byte rank and a 16-byte tree edge
+VERTEX_BYTES = 21
+MIN_CHUNK_EDGES = 1024
+MAX_BUCKETS = 64        # Scratch files open at once during a partition pass
+PIVOT_SAMPLE = 4096     # Weights sampled to choose the bucket pivots
+UNION_BATCH = 1 << 14   # Edges converted to Python lists per union-find step
+INT32_MAX = np.iinfo(np.int32).max
+
+class EdgeFile:
+    """EDGE_DTYPE records in a scratch file, appended and read back in chunks"""
+
+    def __init__(self, directory):
+        handle, self.path = tempfile.mkstemp(suffix='.edges', dir=directory)
+        self._file = os.fdopen(handle, 'wb')
+        self.count = 0
+        self.low = None
+        self.high = None
+
+    def append(self, records):
+        """Write records at the end of the file, tracking their weight range"""
+        if len(records) == 0:
+            return
+        records.tofile(self._file)
+        self.count += len(records)
+        low, high = int(records['weight'].min()), int(records['weight'].max())
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+
+    def close(self):
+        self._file.close()
+
+    def chunks(self, size):
+        """Records in file order, at most size at a time"""
+        with open(self.path, 'rb') as f:
+            while True:
+                records = np.fromfile(f, dtype=EDGE_DTYPE, count=size)
+                if len(records) == 0:
+                    return
+                yield records
+
+    def weights_at(self, positions):
+        """Weights of the records at sorted positions"""
+        weights = np.empty(len(positions), dtype=np.int64)
+        with open(self.path, 'rb') as f:
+            for i, position in enumerate(positions.tolist()):
+                f.seek(position * EDGE_DTYPE.itemsize + EDGE_DTYPE.fields['weight'][1])
+                weights[i] = np.frombuffer(f.read(8), dtype='<i8')[0]
+        return weights
+
+    def remove(self):
+        os.remove(self.path)
+
+class StoreEdges:
+    """Edge arrays of one graph_store.py graph, read with plain file reads instead of a mapping"""
+
+    def __init__(self, filename, entry):
+        self.filename = filename
+        self.count = entry['edges']
+        self.offsets = {name: entry['arrays'][name][0] for name in ('src', 'dst', 'weight')}
+        self.low = None
+        self.high = None
+
+    def _read(self, f, name, start, count):
+        f.seek(self.offsets[name] + start * 4)
+        return np.fromfile(f, dtype='<i4', count=count)
+
+    def chunks(self, size):
+        with open(self.filename, 'rb') as f:
+            for start in range(0, self.count, size):
+                count = min(size, self.count - start)
+                records = np.empty(count, dtype=EDGE_DTYPE)
+                for name in ('src', 'dst', 'weight'):
+                    records[name] = self._read(f, name, start, count)
+                yield records
+
+    def weights_at(self, positions):
+        with open(self.filename, 'rb') as f:
+            return np.array([self._read(f, 'weight', position, 1)[0]
+                             for position in positions.tolist()], dtype=np.int64)
+
+    def remove(self):
+        pass  # The store is the caller's file
+
+class DiskForest:
+    """Union-find over int vertex ids with the spanning forest built so far.
+
+    All arrays are allocated up front, so nothing is copied while the tree
+    grows. The per-edge loop indexes them through memoryviews at list
+    speed, and the NumPy parent array answers batched root queries for
+    whole chunks.
+    """
+
+    def __init__(self, vertex_count):
+        self.vertex_count = vertex_count
+        self._parent = np.arange(vertex_count, dtype=np.int32)
+        self.parent = memoryview(self._parent)
+        self.rank = bytearray(vertex_count)
+        size = max(vertex_count - 1, 0)
+        self.tree_src = np.zeros(size, dtype=np.int32)
+        self.tree_dst = np.zeros(size, dtype=np.int32)
+        self.tree_weight = np.zeros(size, dtype=np.int64)
+        self.tree_size = 0
+        self.operations = vertex_count  # Initialization of Union-Find
+
+    @property
+    def complete(self):
+        return self.tree_size >= self.vertex_count - 1
+
+    def tree(self):
+        """(src, dst, weight) arrays of the tree edges in the order they were added"""
+        size = self.tree_size
+        return self.tree_src[:size], self.tree_dst[:size], self.tree_weight[:size]
+
+    def roots(self, vertices):
+        """Root of every vertex in an array, linking each of them straight to it"""
+        parent = self._parent
+        roots = parent[vertices]
+        while True:
+            above = parent[roots]
+            if np.array_equal(above, roots):
+                break
+            roots = above
+        parent[vertices] = roots
+        return roots
+
+    def separated(self, records):
+        """Mask of records whose endpoints are not yet connected"""
+        self.operations += 3 * len(records)  # Two batched finds and a comparison
+        return self.roots(records['src']) != self.roots(records['dst'])
+
+    def join(self, records):
+        """Kruskal's union-find loop over records already in (weight, position) order"""
+        parent, rank = self.parent, self.rank
+        tree_src, tree_dst, tree_weight = (memoryview(a) for a in
+                                           (self.tree_src, self.tree_dst, self.tree_weight))
+        for lo in range(0, len(records), UNION_BATCH):
+            batch = records[lo:lo + UNION_BATCH]
+            for u, v, w in zip(batch['src'].tolist(), batch['dst'].tolist(), batch['weight'].tolist()):
+                self.operations += 4  # Iteration, two finds and a comparison
+                root_u = u
+                while parent[root_u] != root_u:
+                    parent[root_u] = parent[parent[root_u]]  # Path halving
+                    root_u = parent[root_u]
+                root_v = v
+                while parent[root_v] != root_v:
+                    parent[root_v] = parent[parent[root_v]]
+                    root_v = parent[root_v]
+                if root_u == root_v:
+                    continue
+
+                size = self.tree_size
+                tree_src[size], tree_dst[size], tree_weight[size] = u, v, w
+                self.tree_size = size + 1
+                if rank[root_u] < rank[root_v]:
+                    root_u, root_v = root_v, root_u
+                parent[root_v] = root_u
+                if rank[root_u] == rank[root_v]:
+                    rank[root_u] += 1
+                self.operations += 2  # Union operation counting
+                if self.complete:
+                    return
+
+class ExternalKruskal:
+    """Filter-Kruskal over edge runs on disk, with a per-chunk edge budget"""
+
+    def __init__(self, forest, chunk_edges, directory, seed=0):
+        self.forest = forest
+        self.chunk_edges = chunk_edges
+        self.directory = directory
+        self.rng = np.random.default_rng(seed)
+        self.stats = {'partition_passes': 0, 'buckets': 0, 'loaded_buckets': 0,
+                      'filtered_edges': 0, 'spilled_bytes': 0, 'max_depth': 0}
+
+    def _filter(self, records):
+        keep = self.forest.separated(records)
+        self.stats['filtered_edges'] += len(records) - int(keep.sum())
+        return records[keep]
+
+    def _pivots(self, run):
+        """Bucket upper bounds from a weight sample; never a single bucket for the whole run"""
+        buckets = min(MAX_BUCKETS, math.ceil(2 * run.count / self.chunk_edges))
+        positions = np.unique(self.rng.integers(0, run.count, size=PIVOT_SAMPLE))
+        sample = np.sort(run.weights_at(positions))
+        pivots = np.unique(sample[(np.arange(1, buckets) * len(sample)) // buckets])
+        if run.high is not None:
+            pivots = pivots[pivots < run.high]
+            if len(pivots) == 0:
+                pivots = np.array([(run.low + run.high) // 2])
+        return pivots
+
+    def _partition(self, run, pivots):
+        """Filtered records of a run split into weight buckets (pivots[j - 1], pivots[j]]"""
+        buckets = [EdgeFile(self.directory) for _ in range(len(pivots) + 1)]
+        try:
+            for records in run.chunks(self.chunk_edges):
+                records = self._filter(records)
+                index = np.searchsorted(pivots, records['weight'])
+                order = np.argsort(index, kind='stable')
+                bounds = np.cumsum(np.bincount(index, minlength=len(buckets)))
+                for bucket, part in zip(buckets, np.split(records[order], bounds[:-1])):
+                    bucket.append(part)
+        finally:
+            for bucket in buckets:
+                bucket.close()
+        self.stats['partition_passes'] += 1
+        self.stats['buckets'] += len(buckets)
+        self.stats['spilled_bytes'] += sum(bucket.count for bucket in buckets) * EDGE_DTYPE.itemsize
+        return buckets
+
+    def solve(self, run, depth=0):
+        """Add the tree edges of one run, lightest first; the run is removed afterwards"""
+        self.stats['max_depth'] = max(self.stats['max_depth'], depth)
+        try:
+            if run.count <= self.chunk_edges:
+                records = np.concatenate(list(run.chunks(self.chunk_edges)) or
+                                         [np.empty(0, dtype=EDGE_DTYPE)])
+                records = self._filter(records)
+                order = np.argsort(records['weight'], kind='stable')
+                self.forest.operations += int(len(records) * math.log(len(records))) if len(records) else 0
+                self.stats['loaded_buckets'] += 1
+                self.forest.join(records[order])
+            elif run.high is not None and run.low == run.high:
+                # Equal weights: file order is already Kruskal order
+                for records in run.chunks(self.chunk_edges):
+                    self.forest.join(self._filter(records))
+                    if self.forest.complete:
+                        break
+            else:
+                buckets = self._partition(run, self._pivots(run))
+                for i, bucket in enumerate(buckets):
+                    if self.forest.complete:
+                        for unused in buckets[i:]:
+                            unused.remove()
+                        break
+                    self.solve(bucket, depth + 1)
+        finally:
+            run.remove()
+
+def memory_budget(memory_mb, vertex_count):
+    """Edges per in-memory chunk once the per-vertex state is set aside"""
+    available = memory_mb * (1 << 20) - VERTEX_BYTES * vertex_count
+    chunk_edges = available // WORKING_BYTES_PER_EDGE
+    if chunk_edges < MIN_CHUNK_EDGES:
+        needed = (VERTEX_BYTES * vertex_count + MIN_CHUNK_EDGES * WORKING_BYTES_PER_EDGE) / (1 << 20)
+        raise ValueError(f'a memory budget of {memory_mb} MB cannot hold the union-find for '
+                         f'{vertex_count} vertices; use at least {math.ceil(needed)} MB')
+    return int(chunk_edges)
+
+def _spool_json(graph, edges, directory, chunk_edges):
+    """Stream one input.json graph's edges to a scratch file; returns (names, EdgeFile)"""
+    index = {}
+    names = []
+
+    def vertex(name):
+        # Like Graph.addEdge, endpoints missing from "nodes" are added
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    for name in graph.get('nodes', []):
+        vertex(name)
+    spool = EdgeFile(directory)
+    src, dst, weight = [], [], []
+    try:
+        for edge in edges:
+            src.append(vertex(edge['from']))
+            dst.append(vertex(edge['to']))
+            weight.append(edge['weight'])
+            if len(weight) == chunk_edges:
+                spool.append(_records(src, dst, weight))
+                src, dst, weight = [], [], []
+        spool.append(_records(src, dst, weight))
+        for name in graph.get('nodes', []):  # "nodes" may follow "edges"
+            vertex(name)
+    finally:
+        spool.close()
+    if len(names) > INT32_MAX:
+        spool.remove()
+        raise ValueError(f"graph {graph['id']} is too large for int32 vertex ids")
+    return names, spool
+
+def _records(src, dst, weight):
+    records = np.empty(len(weight), dtype=EDGE_DTYPE)
+    records['src'], records['dst'], records['weight'] = src, dst, weight
+    return records
+
+def iter_edge_runs(filename, directory, memory_mb):
+    """(graph_id, names, run, spool_ms) per graph of an input.json file or graph store"""
+    from graph_store import GraphStore, is_graph_store
+
+    if is_graph_store(filename):
+        store = GraphStore(filename)
+        for position, entry in enumerate(store.entries):
+            names = store.graph_at(position).names
+            yield entry['id'], names, StoreEdges(filename, entry), 0.0
+        return
+    # Spool in small pieces: the vertex count, and so the budget, is not known yet
+    for graph, edges in iter_graph_edges(filename):
+        start = time.perf_counter()
+        names, spool = _spool_json(graph, edges, directory, memory_budget(memory_mb, 0) // 4)
+        yield graph['id'], names, spool, (time.perf_counter() - start) * 1000.0
+
+class _Names:
+    """Stand-in graph for algorithm_result, which only needs the vertex names"""
+
+    def __init__(self, names):
+        self.names = names
+
+def solve_external(graph_id, names, run, memory_mb, directory, spool_ms=0.0):
+    """Kruskal over one on-disk edge run, as an output.json record with an ``external`` block"""
+    from mst_engine import algorithm_result
+
+    edge_count = run.count
+    try:
+        chunk_edges = memory_budget(memory_mb, len(names))
+    except ValueError:
+        run.remove()
+        raise
+    with ResidentGrowth() as resident:
+        start = time.perf_counter()
+        forest = DiskForest(len(names))
+        solver = ExternalKruskal(forest, chunk_edges, directory)
+        if len(names) > 1:
+            solver.solve(run)
+        else:
+            run.remove()
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+    src, dst, weight = forest.tree()
+    mst = zip(src.tolist(), dst.tolist(), weight.tolist())
+    external = {
+        'memory_budget_mb': memory_mb,
+        'chunk_edges': chunk_edges,
+        **solver.stats,
+        'spool_ms': round(spool_ms, 2),
+    }
+    if resident.bytes is not None:
+        external['peak_rss_bytes'] = resident.bytes
+    return {
+        'graph_id': graph_id,
+        'input_stats': {
+            'vertices': len(names),
+            'edges': edge_count,
+        },
+        'kruskal': algorithm_result(_Names(names), mst, int(weight.sum()),
+                                    forest.operations, elapsed_ms),
+        'external': external,
+    }
+
+def external_summary(result):
+    """One-line progress message for a record written by solve_external"""
+    external = result['external']
+    line = (f"Graph {result['graph_id']}: V={result['input_stats']['vertices']}, "
+            f"E={result['input_stats']['edges']}, cost={result['kruskal']['total_cost']}, "
+            f"Kruskal {result['kruskal']['execution_time_ms']:.2f} ms "
+            f"({external['partition_passes']} partition pass(es), "
+            f"{external['filtered_edges']} edge(s) filtered")
+    if 'peak_rss_bytes' in external:
+        line += f", peak RSS +{external['peak_rss_bytes'] / (1 << 20):.1f} MB"
+    return line + ')'
+
+def solve_file(input_file, output_file, memory_mb=DEFAULT_MEMORY_MB, temp_dir=None):
+    """Solve every graph of input_file out of core and write the results to output_file"""
+    directory = tempfile.mkdtemp(prefix='external_kruskal_', dir=temp_dir)
+    try:
+        with results_writer(output_file) as writer:
+            for graph_id, names, run, spool_ms in iter_edge_runs(input_file, directory, memory_mb):
+                result = solve_external(graph_id, names, run, memory_mb, directory, spool_ms)
+                writer.write(result)
+                print(external_summary(result))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Kruskal MSTs for edge lists larger than memory')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('-o', '--output', default='output_external.json',
+                        help='results file in the output.json schema, or JSON Lines for a .jsonl name '
+                             '(default: output_external.json)')
+    parser.add_argument('--memory-mb', type=float, default=DEFAULT_MEMORY_MB,
+                        help='memory for the union-find, the tree and loaded edge chunks '
+                             f'(default: {DEFAULT_MEMORY_MB})')
+    parser.add_argument('--temp-dir',
+                        help='directory for the scratch edge files (default: the system temp directory)')
+    args = parser.parse_args(argv)
+    if args.memory_mb <= 0:
+        parser.error('--memory-mb must be positive')
+    return args
+
+def main(argv=None):
+    """Solve every graph in the input file"""
+    args = parse_args(argv)
+    count = solve_file(args.input, args.output, args.memory_mb, args.temp_dir)
+    print(f"Results for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""Synthetic city network generator that streams graphs in the input.json schema.
+
+Three topologies are available:
+
+    grid       street grid; a comb of streets keeps it connected and the
+               remaining blocks/diagonals are sampled to reach the degree
+    geometric  random districts joined to every district within a radius
+               chosen from the target degree, plus a local backbone path
+    hub        hub-and-spoke transit: a ring of hubs with chords, spokes
+               clustered around their hub, and extra local feeder links
+
+Every vertex gets a position measured in "blocks" (about one district per
+unit area), so ``--weights distance`` prices roads by length for all
+topologies. Edges are produced and written in fixed-size NumPy batches, so
+memory per graph is O(V) for positions plus one edge batch, independent of E.
+
+With ``--coordinates`` only the district positions are written (the
+"coordinates" layout read by euclidean_mst.py) and the roads are left for
+the Euclidean MST mode to choose.
+"""
+import argparse
+import math
+
+import numpy as np
+
+TOPOLOGIES = ('grid', 'geometric', 'hub')
+WEIGHT_DISTRIBUTIONS = ('uniform', 'normal', 'lognormal', 'distance')
+DEFAULT_BATCH_SIZE = 1 << 16
+
+def grid_network(n, degree, rng, batch_size=DEFAULT_BATCH_SIZE):
+    """Street grid with ~degree streets per intersection (at most 6 with diagonals)"""
+    cols = max(1, math.ceil(math.sqrt(n)))
+    ids = np.arange(n, dtype=np.int64)
+    positions = np.column_stack((ids % cols, ids // cols)).astype(np.float64)
+
+    # Horizontal streets plus column 0 always exist, which spans the grid
+    keep_vertical = float(np.clip((degree - 2) / 2, 0, 1))
+    keep_diagonal = float(np.clip((degree - 4) / 2, 0, 1))
+
+    def batches():
+        for lo in range(0, n, batch_size):
+            node = ids[lo:lo + batch_size]
+            col = node % cols
+            right = node + 1
+            horizontal = (col < cols - 1) & (right < n)
+            down = node + cols
+            vertical = (down < n) & ((col == 0) | (rng.random(len(node)) < keep_vertical))
+            diag = node + cols + 1
+            diagonal = (col < cols - 1) & (diag < n) & (rng.random(len(node)) < keep_diagonal)
+            yield (np.concatenate((node[horizontal], node[vertical], node[diagonal])),
+                   np.concatenate((right[horizontal], down[vertical], diag[diagonal])))
+
+    return positions, batches()
+
+def geometric_network(n, degree, rng, batch_size=DEFAULT_BATCH_SIZE):
+    """Random geometric districts: every pair closer than a degree-derived radius"""
+    side = math.sqrt(n)
+    positions = rng.random((n, 2)) * side
+    # The backbone path already contributes ~2 to the average degree
+    radius = math.sqrt(max(degree - 2, 0.0) / math.pi)
+    cells = max(1, min(int(side / radius) if radius > 0 else 1, 1 << 20))
+    cell_size = side / cells
+
+    cx = np.minimum((positions[:, 0] / cell_size).astype(np.int64), cells - 1)
+    cy = np.minimum((positions[:, 1] / cell_size).astype(np.int64), cells - 1)
+
+    # Backbone along a boustrophedon walk of the cells keeps the graph connected
+    snake = np.argsort(cx * cells + np.where(cx % 2 == 0, cy, cells - 1 - cy), kind='stable')
+
+    order = np.argsort(cx * cells + cy, kind='stable')
+    sorted_cell = (cx * cells + cy)[order]
+    sorted_pos = positions[order]
+
+    def cell_pairs(lo, hi, dx, dy):
+        """Pairs (i, j) of sorted indices with i in [lo, hi) and j in the offset cell"""
+        i = np.arange(lo, hi, dtype=np.int64)
+        tx = cx[order[i]] + dx
+        ty = cy[order[i]] + dy
+        valid = (tx < cells) & (ty >= 0) & (ty < cells)
+        i, target = i[valid], (tx * cells + ty)[valid]
+        start = np.searchsorted(sorted_cell, target, side='left')
+        if dx == 0 and dy == 0:
+            start = i + 1  # Same cell: only later points, so each pair appears once
+        stop = np.searchsorted(sorted_cell, target, side='right')
+        count = np.maximum(stop - start, 0)
+        first = np.repeat(i, count)
+        offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        return first, np.repeat(start, count) + offsets
+
+    def batches():
+        for lo in range(0, n - 1, batch_size):
+            hi = min(lo + batch_size, n - 1)
+            yield snake[lo:hi], snake[lo + 1:hi + 1]
+        if radius <= 0:
+            return
+        # Smaller batches here: each point pairs with ~degree/2 neighbours per offset
+        pair_batch = max(1, batch_size // max(1, int(degree)))
+        for lo in range(0, n, pair_batch):
+            hi = min(lo + pair_batch, n)
+            for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+                i, j = cell_pairs(lo, hi, dx, dy)
+                close = np.hypot(*(sorted_pos[i] - sorted_pos[j]).T) <= radius
+                yield order[i[close]], order[j[close]]
+
+    return positions, batches()
+
+def hub_network(n, degree, rng, batch_size=DEFAULT_BATCH_SIZE, hub_fraction=0.01):
+    """Hub-and-spoke transit network with local feeder links between spokes"""
+    side = math.sqrt(n)
+    hubs = int(min(n, max(2, round(n * hub_fraction))))
+    hub_pos = rng.random((hubs, 2)) * side
+    spoke_hub = rng.integers(0, hubs, size=n - hubs)
+    spread = side / math.sqrt(hubs) / 3
+    spoke_pos = hub_pos[spoke_hub] + rng.normal(0, spread, size=(n - hubs, 2))
+    positions = np.vstack((hub_pos, np.clip(spoke_pos, 0, side)))
+
+    # Spokes grouped by hub so a random same-hub partner is an index range
+    spoke_order = np.argsort(spoke_hub, kind='stable') + hubs
+    hub_start = np.searchsorted(spoke_hub[spoke_order - hubs], np.arange(hubs))
+    hub_count = np.bincount(spoke_hub, minlength=hubs)
+
+    base_edges = hubs + hubs + (n - hubs)  # Ring, chords, spoke links
+    extra_edges = max(0, int(degree * n / 2) - base_edges)
+
+    def batches():
+        ring = np.arange(hubs, dtype=np.int64)
+        if hubs > 1:
+            yield ring, (ring + 1) % hubs
+        chords = rng.integers(0, hubs, size=hubs)
+        yield ring[chords != ring], chords[chords != ring]
+        for lo in range(hubs, n, batch_size):
+            spokes = np.arange(lo, min(lo + batch_size, n), dtype=np.int64)
+            yield spokes, spoke_hub[spokes - hubs].astype(np.int64)
+        for lo in range(0, extra_edges, batch_size):
+            size = min(batch_size, extra_edges - lo)
+            spoke = rng.integers(hubs, n, size=size) if n > hubs else np.empty(0, np.int64)
+            hub = spoke_hub[spoke - hubs]
+            partner = spoke_order[hub_start[hub] + (rng.random(size) * hub_count[hub]).astype(np.int64)]
+            distinct = spoke != partner
+            yield spoke[distinct], partner[distinct]
+
+    return positions, batches()
+
+NETWORK_BUILDERS = {
+    'grid': grid_network,
+    'geometric': geometric_network,
+    'hub': hub_network,
+}
+
+def edge_weights(src, dst, positions, rng, distribution, weight_min, weight_max, distance_unit):
+    """Integer road costs for one edge batch"""
+    size = len(src)
+    if distribution == 'uniform':
+        weights = rng.integers(weight_min, weight_max + 1, size=size)
+    elif distribution == 'normal':
+        mean = (weight_min + weight_max) / 2
+        weights = np.rint(rng.normal(mean, (weight_max - weight_min) / 6, size=size))
+    elif distribution == 'lognormal':
+        weights = weight_min + np.rint(rng.lognormal(0.0, 1.0, size=size) * (weight_max - weight_min) / 10)
+    elif distribution == 'distance':
+        length = np.hypot(*(positions[src] - positions[dst]).T)
+        weights = np.maximum(weight_min, np.ceil(length * distance_unit))
+    else:
+        raise ValueError(f"Unknown weight distribution '{distribution}'")
+    return np.clip(weights, weight_min, weight_max).astype(np.int64)
+
+def write_graph(f, graph_id, name, n, batches, weight_fn, first=False):
+    """Stream one graph object in the input.json layout, returning its edge count"""
+    f.write(('' if first else ',\n') + '    {\n')
+    f.write(f'      "id": {graph_id},\n')
+    f.write(f'      "name": "{name}",\n')
+    f.write('      "nodes": [')
+    for lo in range(0, n, DEFAULT_BATCH_SIZE):
+        hi = min(lo + DEFAULT_BATCH_SIZE, n)
+        f.write((', ' if lo else '') + ', '.join(f'"N{i}"' for i in range(lo, hi)))
+    f.write('],\n      "edges": [')
+
+    edge_count = 0
+    for src, dst in batches:
+        if len(src) == 0:
+            continue
+        weights = weight_fn(src, dst)
+        f.write(('' if edge_count == 0 else ',') + ','.join(
+            f'\n        {{"from": "N{u}", "to": "N{v}", "weight": {w}}}'
+            for u, v, w in zip(src.tolist(), dst.tolist(), weights.tolist())))
+        edge_count += len(src)
+    f.write('\n      ]\n    }' if edge_count else ']\n    }')
+    return edge_count
+
+def write_districts(f, graph_id, name, positions, cost, first=False):
+    """Stream one graph object with district coordinates instead of edges"""
+    f.write(('' if first else ',\n') + '    {\n')
+    f.write(f'      "id": {graph_id},\n')
+    f.write(f'      "name": "{name}",\n')
+    f.write(f'      "cost": {{"distance_unit": {cost[0]:g}, "minimum": {cost[1]}}},\n')
+    f.write('      "coordinates": [')
+    for lo in range(0, len(positions), DEFAULT_BATCH_SIZE):
+        f.write((', ' if lo else '') + ', '.join(
+            f'[{x:.6g}, {y:.6g}]' for x, y in positions[lo:lo + DEFAULT_BATCH_SIZE].tolist()))
+    f.write(']\n    }')
+
+def generate_corpus(output_file, topologies, sizes, degree, distribution='uniform',
+                    weight_min=1, weight_max=1000, distance_unit=100, seed=42,
+                    graphs_per_size=1, start_id=1, batch_size=DEFAULT_BATCH_SIZE,
+                    coordinates=False):
+    """Write every (topology, size, repeat) combination to one input.json file"""
+    graph_id = start_id
+    with open(output_file, 'w') as f:
+        f.write('{\n  "graphs": [\n')
+        for topology in topologies:
+            for n in sizes:
+                for repeat in range(graphs_per_size):
+                    # Independent stream per graph so corpora are reproducible piecewise
+                    rng = np.random.default_rng([seed, graph_id])
+                    positions, batches = NETWORK_BUILDERS[topology](n, degree, rng, batch_size)
+
+                    def weight_fn(src, dst):
+                        return edge_weights(src, dst, positions, rng, distribution,
+                                            weight_min, weight_max, distance_unit)
+
+                    name = f'Synthetic {topology} network ({n} vertices, degree {degree:g}, seed {seed})'
+                    if coordinates:
+                        write_districts(f, graph_id, name, positions, (distance_unit, weight_min),
+                                        first=graph_id == start_id)
+                        print(f"Graph {graph_id}: {topology}, V={n}, coordinates only")
+                        graph_id += 1
+                        continue
+                    edges = write_graph(f, graph_id, name, n, batches, weight_fn,
+                                        first=graph_id == start_id)
+                    print(f"Graph {graph_id}: {topology}, V={n}, E={edges}")
+                    graph_id += 1
+        f.write('\n  ]\n}\n')
+    return graph_id - start_id
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Generate synthetic city networks in the input.json schema')
+    parser.add_argument('-o', '--output', default='generated_networks.json',
+                        help='output file (default: generated_networks.json)')
+    parser.add_argument('--topology', nargs='+', choices=TOPOLOGIES, default=list(TOPOLOGIES),
+                        help='topologies to generate (default: all)')
+    parser.add_argument('--vertices', nargs='+', type=int, default=[1000, 10000, 100000],
+                        help='vertex counts to generate for each topology')
+    parser.add_argument('--degree', type=float, default=4.0,
+                        help='target average degree (default: 4)')
+    parser.add_argument('--weights', choices=WEIGHT_DISTRIBUTIONS, default='uniform',
+                        help='road cost distribution (default: uniform)')
+    parser.add_argument('--weight-min', type=int, default=1)
+    parser.add_argument('--weight-max', type=int, default=1000)
+    parser.add_argument('--distance-unit', type=float, default=100,
+                        help='cost per block of road length for --weights distance')
+    parser.add_argument('--graphs-per-size', type=int, default=1)
+    parser.add_argument('--start-id', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'edges generated and written per batch (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--coordinates', action='store_true',
+                        help='write district coordinates instead of edges, for euclidean_mst.py')
+    args = parser.parse_args(argv)
+    if min(args.vertices) < 1 or args.weight_min > args.weight_max or args.batch_size < 1:
+        parser.error('vertex counts and batch size must be positive and weight-min <= weight-max')
+    return args
+
+def main(argv=None):
+    """Generate the requested corpus"""
+    args = parse_args(argv)
+    count = generate_corpus(args.output, args.topology, args.vertices, args.degree,
+                            args.weights, args.weight_min, args.weight_max,
+                            args.distance_unit, args.seed, args.graphs_per_size,
+                            args.start_id, args.batch_size, args.coordinates)
+    print(f"Generated {count} graph(s) in {args.output}")
+
+if __name__ == '__main__':
+    main()
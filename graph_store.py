@@ -0,0 +1,200 @@
+"""Compact CSR binary store for input.json graphs, loaded by memory-mapping.
+
+A store file holds any number of graphs. Each graph is kept as flat
+little-endian arrays: the edge list (int32 endpoints and weights), a CSR
+adjacency (int64 offsets, int32 targets, weights and edge ids) and a name
+dictionary (UTF-8 bytes plus int64 offsets), so integer vertex ids can be
+mapped back to the original node names. A JSON index at the end of the
+file records where each array starts. Opening a store maps the file once
+and hands out NumPy views into it, so no graph data is parsed or copied
+until it is used.
+
+Layout::
+
+    0   magic            8 bytes, b'MSTCSR\\x00\\x01'
+    8   index offset     uint64
+    16  index length     uint64
+    64  arrays           each aligned to 64 bytes
+    ..  index            UTF-8 JSON
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from json_stream import iter_json_array
+from mst_engine import IndexedGraph
+
+STORE_MAGIC = b'MSTCSR\x00\x01'
+STORE_VERSION = 1
+HEADER_SIZE = 64
+ALIGNMENT = 64
+
+# Arrays stored per graph, in file order
+STORE_ARRAYS = (
+    ('src', '<i4'),
+    ('dst', '<i4'),
+    ('weight', '<i4'),
+    ('indptr', '<i8'),
+    ('targets', '<i4'),
+    ('adjacency_weights', '<i4'),
+    ('adjacency_edges', '<i4'),
+    ('name_offsets', '<i8'),
+    ('name_bytes', 'u1'),
+)
+
+INT32_MAX = np.iinfo(np.int32).max
+
+class NameTable:
+    """Read-only sequence of vertex names, decoded from the UTF-8 dictionary on access"""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = memoryview(blob)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError('vertex id out of range')
+        i %= len(self)
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+def is_graph_store(filename):
+    """Whether filename starts with the store magic bytes"""
+    with open(filename, 'rb') as f:
+        return f.read(len(STORE_MAGIC)) == STORE_MAGIC
+
+def _store_arrays(graph):
+    """The STORE_ARRAYS of one IndexedGraph, checked against the int32 limits"""
+    if graph.vertex_count > INT32_MAX or 2 * graph.edge_count > INT32_MAX:
+        raise ValueError(f'graph {graph.graph_id} is too large for int32 vertex and edge ids')
+    weight = np.asarray(graph.weight)
+    if len(weight) and (weight.min() < np.iinfo(np.int32).min or weight.max() > INT32_MAX):
+        raise ValueError(f'graph {graph.graph_id} has weights outside the int32 range')
+
+    indptr, targets, adjacency_weights, adjacency_edges = graph.csr()
+    encoded = [name.encode('utf-8') for name in graph.names]
+    name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+    columns = (graph.src, graph.dst, weight, indptr, targets, adjacency_weights,
+               adjacency_edges, name_offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    return [(name, np.ascontiguousarray(column, dtype=dtype))
+            for (name, dtype), column in zip(STORE_ARRAYS, columns)]
+
+def write_store(graphs, filename):
+    """Write IndexedGraphs to a store file and return the number written.
+
+    Graphs are written one at a time, so only one is held in memory. The
+    file is built under a temporary name and moved into place at the end.
+    """
+    tmp_name = f'{filename}.tmp.{os.getpid()}'
+    index = []
+    try:
+        with open(tmp_name, 'wb') as f:
+            f.write(bytes(HEADER_SIZE))
+            for graph in graphs:
+                arrays = {}
+                for name, array in _store_arrays(graph):
+                    f.write(bytes(-f.tell() % ALIGNMENT))
+                    arrays[name] = [f.tell(), len(array)]
+                    array.tofile(f)
+                index.append({
+                    'id': graph.graph_id,
+                    'vertices': graph.vertex_count,
+                    'edges': graph.edge_count,
+                    'arrays': arrays,
+                })
+
+            index_bytes = json.dumps({'version': STORE_VERSION, 'graphs': index}).encode('utf-8')
+            index_offset = f.tell()
+            f.write(index_bytes)
+            f.seek(0)
+            f.write(STORE_MAGIC)
+            f.write(np.array([index_offset, len(index_bytes)], dtype='<u8').tobytes())
+        os.replace(tmp_name, filename)
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+    return len(index)
+
+def convert_file(input_file, output_file):
+    """Convert an input.json file to a store, streaming one graph at a time"""
+    def graphs():
+        for graph in iter_json_array(input_file, 'graphs'):
+            indexed = IndexedGraph.from_json(graph)
+            print(f"Graph {indexed.graph_id}: V={indexed.vertex_count}, E={indexed.edge_count}")
+            yield indexed
+    return write_store(graphs(), output_file)
+
+class GraphStore:
+    """Memory-mapped view of a store file; graphs are IndexedGraphs backed by the mapping"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        # Plain ndarray view of the mapping: slicing np.memmap subclasses is slow
+        self._map = np.memmap(filename, dtype=np.uint8, mode='r').view(np.ndarray)
+        if self._map[:len(STORE_MAGIC)].tobytes() != STORE_MAGIC:
+            raise ValueError(f'{filename} is not a graph store')
+        index_offset, index_length = self._map[8:24].view('<u8').tolist()
+        index = json.loads(self._map[index_offset:index_offset + index_length].tobytes())
+        if index.get('version') != STORE_VERSION:
+            raise ValueError(f"{filename} has unsupported store version {index.get('version')}")
+        self.entries = index['graphs']
+        self._positions = {entry['id']: i for i, entry in enumerate(self.entries)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (self._graph(entry) for entry in self.entries)
+
+    @property
+    def graph_ids(self):
+        return [entry['id'] for entry in self.entries]
+
+    def graph(self, graph_id):
+        """The graph with this id"""
+        return self.graph_at(self._positions[graph_id])
+
+    def graph_at(self, position):
+        """The graph at this position in file order"""
+        return self._graph(self.entries[position])
+
+    def _array(self, entry, name, dtype):
+        offset, count = entry['arrays'][name]
+        return self._map[offset:offset + count * np.dtype(dtype).itemsize].view(dtype)
+
+    def _graph(self, entry):
+        arrays = {name: self._array(entry, name, dtype) for name, dtype in STORE_ARRAYS}
+        names = NameTable(arrays['name_offsets'], arrays['name_bytes'])
+        adjacency = (arrays['indptr'], arrays['targets'], arrays['adjacency_weights'],
+                     arrays['adjacency_edges'])
+        return IndexedGraph(entry['id'], names, arrays['src'], arrays['dst'], arrays['weight'],
+                            adjacency=adjacency)
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Convert input.json graphs to a memory-mappable CSR store')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema (default: input.json)')
+    parser.add_argument('-o', '--output',
+                        help='store file to write (default: input name with a .csr suffix)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Convert one input file"""
+    args = parse_args(argv)
+    output = args.output or str(Path(args.input).with_suffix('.csr'))
+    count = convert_file(args.input, output)
+    size_mb = os.path.getsize(output) / (1 << 20)
+    print(f"Stored {count} graph(s) in {output} ({size_mb:.1f} MB)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,493 @@
+"""Incremental minimum spanning tree under road insertions, removals and cost changes.
+
+IncrementalMST holds a minimum spanning forest in a link-cut tree, where
+every tree edge is its own node carrying the edge weight, so the heaviest
+edge on any tree path is found in O(log V) amortized time.
+
+- Inserting a road, or lowering the cost of a road outside the tree, uses
+  the cycle property: the new edge replaces the heaviest edge on the tree
+  path between its endpoints if it is lighter. This is O(log V) amortized.
+- Lowering the cost of a tree road, or raising the cost of a road outside
+  the tree, never changes the tree.
+- Removing a tree road, or raising its cost, uses the cut property. The
+  road is cut out, and the lightest non-tree road that reconnects the two
+  sides (and for a raise, is lighter than the new cost) takes its place.
+  Both sides are searched in lockstep, so only the smaller side is
+  enumerated; its incident roads are then scanned for the lightest
+  crossing one. The cost is proportional to the smaller side, which is
+  small for most cuts of a road network. It is not polylogarithmic in
+  the worst case, which would need a level-structured connectivity index
+  (Holm et al.).
+
+Results use the MSTResult / output.json algorithm block shape. The
+incremental_mst.py CLI applies an updates file to every graph of an
+input file.
+"""
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from json_stream import iter_json_array, results_writer
+from mst_engine import IndexedGraph, algorithm_result, iter_graphs, kruskal_tree
+
+NEG_INF = float('-inf')
+
+class LinkCutForest:
+    """Array-backed link-cut trees with path-maximum queries over node values"""
+
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.value = []
+        self.best = []  # node with the largest value in each splay subtree
+        self.rotations = 0
+
+    def add_node(self, value=NEG_INF):
+        """Add an isolated node and return its index"""
+        node = len(self.value)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.value.append(value)
+        self.best.append(node)
+        return node
+
+    def reset_node(self, node, value=NEG_INF):
+        """Reuse an isolated node with a new value"""
+        self.left[node] = self.right[node] = self.parent[node] = -1
+        self.flip[node] = False
+        self.value[node] = value
+        self.best[node] = node
+
+    def _is_splay_root(self, x):
+        p = self.parent[x]
+        return p == -1 or (self.left[p] != x and self.right[p] != x)
+
+    def _push(self, x):
+        if self.flip[x]:
+            self.left[x], self.right[x] = self.right[x], self.left[x]
+            for child in (self.left[x], self.right[x]):
+                if child != -1:
+                    self.flip[child] = not self.flip[child]
+            self.flip[x] = False
+
+    def _update(self, x):
+        best = x
+        value = self.value
+        for child in (self.left[x], self.right[x]):
+            if child != -1 and value[self.best[child]] > value[best]:
+                best = self.best[child]
+        self.best[x] = best
+
+    def _rotate(self, x):
+        p = self.parent[x]
+        g = self.parent[p]
+        if not self._is_splay_root(p):
+            if self.left[g] == p:
+                self.left[g] = x
+            else:
+                self.right[g] = x
+        self.parent[x] = g
+        if self.left[p] == x:
+            child = self.right[x]
+            self.left[p] = child
+            self.right[x] = p
+        else:
+            child = self.left[x]
+            self.right[p] = child
+            self.left[x] = p
+        if child != -1:
+            self.parent[child] = p
+        self.parent[p] = x
+        self._update(p)
+        self._update(x)
+        self.rotations += 1
+
+    def _splay(self, x):
+        path = [x]
+        while not self._is_splay_root(path[-1]):
+            path.append(self.parent[path[-1]])
+        for node in reversed(path):
+            self._push(node)
+        while not self._is_splay_root(x):
+            p = self.parent[x]
+            if not self._is_splay_root(p):
+                g = self.parent[p]
+                zig_zig = (self.left[g] == p) == (self.left[p] == x)
+                self._rotate(p if zig_zig else x)
+            self._rotate(x)
+
+    def _access(self, x):
+        last = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self.right[y] = last
+            self._update(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def make_root(self, x):
+        """Re-root x's tree at x"""
+        self._access(x)
+        self.flip[x] = not self.flip[x]
+
+    def find_root(self, x):
+        """Root of x's tree"""
+        self._access(x)
+        self._push(x)
+        while self.left[x] != -1:
+            x = self.left[x]
+            self._push(x)
+        self._splay(x)
+        return x
+
+    def connected(self, u, v):
+        """Whether u and v are in the same tree"""
+        return u == v or self.find_root(u) == self.find_root(v)
+
+    def link(self, u, v):
+        """Join the trees of u and v with the link u - v (they must not be connected)"""
+        self.make_root(u)
+        self.parent[u] = v
+
+    def cut(self, u, v):
+        """Remove the link u - v"""
+        self.make_root(u)
+        self._access(v)
+        self.left[v] = -1
+        self.parent[u] = -1
+        self._update(v)
+
+    def path_max(self, u, v):
+        """Node with the largest value on the tree path between u and v"""
+        self.make_root(u)
+        self._access(v)
+        return self.best[v]
+
+    def set_value(self, x, value):
+        """Change the value of node x"""
+        self._access(x)
+        self.value[x] = value
+        self._update(x)
+
+class IncrementalMST:
+    """Minimum spanning forest of one graph, updated in place as roads change.
+
+    Roads are addressed by their endpoint names, one road per pair of
+    districts; parallel edges in the input keep only the lightest.
+    """
+
+    def __init__(self, graph):
+        graph = IndexedGraph.from_json(graph) if isinstance(graph, dict) else graph
+        self.graph_id = graph.graph_id
+        self.names = list(graph.names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.forest = LinkCutForest()
+        self.vertex_node = [self.forest.add_node() for _ in self.names]
+
+        # Edge id -> [u, v, weight, in_tree]; edge ids incident to each vertex;
+        # edge node ids in the forest
+        self.edges = {}
+        self.pairs = {}
+        self.incident = [[] for _ in self.names]
+        self.edge_node = {}
+        self.node_edge = {}
+        self._free_nodes = []
+        self._next_edge = 0
+        self.total_cost = 0
+        self.operations = 0
+
+        order = np.lexsort((np.arange(graph.edge_count), graph.weight))
+        src, dst, weight = graph.src.tolist(), graph.dst.tolist(), graph.weight.tolist()
+        for k in order.tolist():
+            pair = (min(src[k], dst[k]), max(src[k], dst[k]))
+            if pair not in self.pairs and src[k] != dst[k]:
+                self._new_edge(src[k], dst[k], int(weight[k]))
+        self._build_forest()
+
+    def _new_edge(self, u, v, weight):
+        edge_id = self._next_edge
+        self._next_edge += 1
+        self.edges[edge_id] = [u, v, weight, False]
+        self.pairs[(min(u, v), max(u, v))] = edge_id
+        self.incident[u].append(edge_id)
+        self.incident[v].append(edge_id)
+        return edge_id
+
+    def _build_forest(self):
+        """Kruskal over the edges in weight order, then root every tree in O(V)"""
+        n = len(self.names)
+        parent = list(range(n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # Path halving
+                x = parent[x]
+            return x
+
+        for edge_id, (u, v, w, _) in self.edges.items():  # inserted in weight order
+            root_u, root_v = find(u), find(v)
+            if root_u == root_v:
+                continue
+            parent[root_u] = root_v
+            self.edges[edge_id][3] = True
+            self.total_cost += w
+
+        # Every node starts as its own preferred path, so path-parent
+        # pointers along a rooted traversal form a valid link-cut forest
+        seen = [False] * n
+        for root in range(n):
+            if seen[root]:
+                continue
+            seen[root] = True
+            stack = [root]
+            while stack:
+                x = stack.pop()
+                for edge_id in self.incident[x]:
+                    u, v, w, in_tree = self.edges[edge_id]
+                    y = v if u == x else u
+                    if not in_tree or seen[y]:
+                        continue
+                    seen[y] = True
+                    node = self._edge_node(edge_id, w)
+                    self.forest.parent[node] = self.vertex_node[x]
+                    self.forest.parent[self.vertex_node[y]] = node
+                    stack.append(y)
+
+    def _edge_node(self, edge_id, weight):
+        if self._free_nodes:
+            node = self._free_nodes.pop()
+            self.forest.reset_node(node, weight)
+        else:
+            node = self.forest.add_node(weight)
+        self.edge_node[edge_id] = node
+        self.node_edge[node] = edge_id
+        return node
+
+    def _vertex(self, name, create=False):
+        if name not in self.index:
+            if not create:
+                raise KeyError(f'unknown vertex {name!r}')
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.vertex_node.append(self.forest.add_node())
+            self.incident.append([])
+        return self.index[name]
+
+    def _edge_id(self, from_name, to_name):
+        u, v = self._vertex(from_name), self._vertex(to_name)
+        edge_id = self.pairs.get((min(u, v), max(u, v)))
+        if edge_id is None:
+            raise KeyError(f'no road between {from_name!r} and {to_name!r}')
+        return edge_id
+
+    def _link_edge(self, edge_id):
+        u, v, w, _ = self.edges[edge_id]
+        node = self._edge_node(edge_id, w)
+        self.forest.link(self.vertex_node[u], node)
+        self.forest.link(node, self.vertex_node[v])
+        self.edges[edge_id][3] = True
+        self.total_cost += w
+        self.operations += 2
+
+    def _cut_edge(self, edge_id):
+        u, v, w, _ = self.edges[edge_id]
+        node = self.edge_node.pop(edge_id)
+        del self.node_edge[node]
+        self.forest.cut(self.vertex_node[u], node)
+        self.forest.cut(node, self.vertex_node[v])
+        self._free_nodes.append(node)
+        self.edges[edge_id][3] = False
+        self.total_cost -= w
+        self.operations += 2
+
+    def _try_replace(self, edge_id):
+        """Cycle property: swap non-tree edge_id in for the heaviest edge on its tree path"""
+        u, v, w, _ = self.edges[edge_id]
+        self.operations += 1
+        u, v = self.vertex_node[u], self.vertex_node[v]
+        if not self.forest.connected(u, v):
+            self._link_edge(edge_id)
+            return True
+        heaviest = self.forest.path_max(u, v)
+        if self.forest.value[heaviest] <= w:
+            return False
+        self._cut_edge(self.node_edge[heaviest])
+        self._link_edge(edge_id)
+        return True
+
+    def _smaller_side(self, a, b):
+        """Vertices of the smaller of the trees holding a and b, searching both in lockstep"""
+        sides = ({a}, {b})
+        frontiers = ([a], [b])
+        while True:
+            for side, frontier in zip(sides, frontiers):
+                if not frontier:
+                    return side
+                x = frontier.pop()
+                self.operations += 1  # Vertex visit
+                for edge_id in self.incident[x]:
+                    u, v, _, in_tree = self.edges[edge_id]
+                    y = v if u == x else u
+                    if in_tree and y not in side:
+                        side.add(y)
+                        frontier.append(y)
+
+    def _reconnect(self, a, b, limit=None):
+        """Cut property: link the lightest non-tree edge (below limit) between a's and b's trees"""
+        side = self._smaller_side(a, b)
+        best = None
+        for x in side:
+            for edge_id in self.incident[x]:
+                u, v, w, in_tree = self.edges[edge_id]
+                self.operations += 1  # Crossing check
+                if in_tree or (u in side and v in side) or (limit is not None and w >= limit):
+                    continue
+                if best is None or (w, edge_id) < best:
+                    best = (w, edge_id)
+        if best is None:
+            return None
+        self._link_edge(best[1])
+        return best[1]
+
+    def insert_edge(self, from_name, to_name, weight):
+        """Add a road, creating unknown districts; returns whether the tree changed"""
+        if from_name == to_name:
+            raise ValueError('a road must join two different districts')
+        u, v = self._vertex(from_name, create=True), self._vertex(to_name, create=True)
+        if (min(u, v), max(u, v)) in self.pairs:
+            raise ValueError(f'road between {from_name!r} and {to_name!r} already exists')
+        return self._try_replace(self._new_edge(u, v, int(weight)))
+
+    def delete_edge(self, from_name, to_name):
+        """Remove a road; returns whether the tree changed"""
+        edge_id = self._edge_id(from_name, to_name)
+        u, v, _, in_tree = self.edges[edge_id]
+        if in_tree:
+            self._cut_edge(edge_id)
+        del self.edges[edge_id]
+        del self.pairs[(min(u, v), max(u, v))]
+        self.incident[u].remove(edge_id)
+        self.incident[v].remove(edge_id)
+        if in_tree:
+            self._reconnect(u, v)
+        return in_tree
+
+    def update_weight(self, from_name, to_name, weight):
+        """Change the cost of a road; returns whether the tree changed"""
+        edge_id = self._edge_id(from_name, to_name)
+        edge = self.edges[edge_id]
+        old, weight = edge[2], int(weight)
+        edge[2] = weight
+        self.operations += 1
+        if not edge[3]:
+            return weight < old and self._try_replace(edge_id)
+
+        self.total_cost += weight - old
+        self.forest.set_value(self.edge_node[edge_id], weight)
+        if weight <= old:
+            return False
+        # The edge may now be beaten by a non-tree edge across the same cut
+        self._cut_edge(edge_id)
+        if self._reconnect(edge[0], edge[1], limit=weight) is None:
+            self._link_edge(edge_id)
+            return False
+        return True
+
+    def apply(self, update):
+        """Apply one {"action": insert|delete|update, "from", "to", "weight"} record"""
+        action = update['action']
+        if action == 'insert':
+            return self.insert_edge(update['from'], update['to'], update['weight'])
+        if action == 'delete':
+            return self.delete_edge(update['from'], update['to'])
+        if action == 'update':
+            return self.update_weight(update['from'], update['to'], update['weight'])
+        raise ValueError(f'unknown update action {action!r}')
+
+    def tree_edges(self):
+        """Current tree as (u, v, weight) tuples ordered by weight"""
+        tree = sorted((w, edge_id) for edge_id, (u, v, w, in_tree) in self.edges.items() if in_tree)
+        return [(self.edges[e][0], self.edges[e][1], w) for w, e in tree]
+
+    def result(self, elapsed_ms=0.0):
+        """Current tree as an output.json algorithm block"""
+        graph = IndexedGraph(self.graph_id, self.names, None, None, None)
+        return algorithm_result(graph, self.tree_edges(), self.total_cost,
+                                self.operations + self.forest.rotations, elapsed_ms)
+
+def load_updates(filename):
+    """Updates from an {"updates": [...]} file, grouped by graph_id in file order"""
+    updates = defaultdict(list)
+    for update in iter_json_array(filename, 'updates'):
+        updates[update['graph_id']].append(update)
+    return updates
+
+def solve_updates(input_file, updates_file, output_file, verify=False):
+    """Apply every update to its graph and write the final trees in the output.json schema"""
+    updates = load_updates(updates_file)
+    with results_writer(output_file) as writer:
+        for graph in iter_graphs(input_file):
+            mst = IncrementalMST(graph)
+            graph_updates = updates.get(graph.graph_id, [])
+            start = time.perf_counter()
+            changed = sum(bool(mst.apply(update)) for update in graph_updates)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            record = {
+                'graph_id': graph.graph_id,
+                'input_stats': {
+                    'vertices': len(mst.names),
+                    'edges': len(mst.edges),
+                },
+                'updates': {
+                    'applied': len(graph_updates),
+                    'tree_changed': changed,
+                },
+                'incremental': mst.result(elapsed_ms),
+            }
+            message = (f"Graph {graph.graph_id}: {len(graph_updates)} update(s), "
+                       f"{changed} changed the tree, cost={mst.total_cost}, {elapsed_ms:.2f} ms")
+            if verify:
+                _, expected, _ = kruskal_tree(_current_graph(mst))
+                if expected != mst.total_cost:
+                    raise AssertionError(f'graph {graph.graph_id}: incremental cost '
+                                         f'{mst.total_cost} != recomputed {expected}')
+                message += ' (verified)'
+            writer.write(record)
+            print(message)
+    return writer.count
+
+def _current_graph(mst):
+    """IndexedGraph of the roads currently held by an IncrementalMST"""
+    edges = list(mst.edges.values())
+    return IndexedGraph(mst.graph_id, mst.names,
+                        np.array([e[0] for e in edges], dtype=np.int32),
+                        np.array([e[1] for e in edges], dtype=np.int32),
+                        np.array([e[2] for e in edges], dtype=np.int64))
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Apply road updates to MSTs without recomputing them')
+    parser.add_argument('input', help='graphs in the input.json schema or a graph_store.py file')
+    parser.add_argument('updates', help='{"updates": [{"graph_id", "action", "from", "to", "weight"}]}')
+    parser.add_argument('-o', '--output', default='output_incremental.json',
+                        help='results file (default: output_incremental.json)')
+    parser.add_argument('--verify', action='store_true',
+                        help='recompute each final MST cost with Kruskal and compare')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Apply the updates file to every graph in the input file"""
+    args = parse_args(argv)
+    count = solve_updates(args.input, args.updates, args.output, args.verify)
+    print(f"Results for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""Incremental readers and writers for the input.json / output.json documents.
+
+Results can also be kept as JSON Lines (``.jsonl``): one compact result
+record per line, appended and flushed as each graph finishes, so a crash
+loses at most the line being written and the file can be read while it
+grows. ``iter_results`` accepts either layout.
+
+Only the standard library is used so these helpers stay cheap to import from
+command-line tools that never touch NumPy or matplotlib.
+"""
+import json
+import re
+
+_ARRAY_SEPARATOR = re.compile(r'[\s,]*')
+
+# Output names with these suffixes are written as JSON Lines
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+# A results document opens with its "results" key (Gson and JsonArrayWriter
+# both write it first); a JSON Lines stream opens with a result record
+_RESULTS_DOCUMENT = re.compile(r'\s*\{\s*"results"\s*:')
+
+def iter_json_array(filename, key, chunk_size=1 << 20):
+    """Stream the elements of a top-level JSON array one record at a time"""
+    decoder = json.JSONDecoder()
+    array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+
+    with open(filename, 'r') as f:
+        buf = f.read(chunk_size)
+        eof = not buf
+
+        # Locate the opening bracket of the requested array
+        match = array_start.search(buf)
+        while match is None:
+            if eof:
+                raise ValueError(f"No '{key}' array found in {filename}")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            match = array_start.search(buf)
+        pos = match.end()
+
+        while True:
+            pos = _ARRAY_SEPARATOR.match(buf, pos).end()
+            if pos < len(buf):
+                if buf[pos] == ']':
+                    return
+                try:
+                    item, pos = decoder.raw_decode(buf, pos)
+                    yield item
+                    continue
+                except ValueError:
+                    pass  # Record is split across chunks
+            if eof:
+                raise ValueError(f"Truncated '{key}' array in {filename}")
+
+            # Drop consumed text and grow the read size so that very large
+            # records are not re-decoded once per chunk
+            buf = buf[pos:]
+            pos = 0
+            chunk = f.read(max(chunk_size, len(buf)))
+            eof = not chunk
+            buf += chunk
+
+class _JsonReader:
+    """Incremental reader over one JSON document, decoding a value at a time from a sliding buffer"""
+
+    def __init__(self, f, filename, chunk_size):
+        self.f = f
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _read(self):
+        """Drop consumed text and append the next chunk; False at end of file"""
+        if self.eof:
+            return False
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        chunk = self.f.read(max(self.chunk_size, len(self.buf)))
+        self.eof = not chunk
+        self.buf += chunk
+        return not self.eof
+
+    def find(self, pattern):
+        """Move past the next match of a compiled pattern"""
+        match = pattern.search(self.buf, self.pos)
+        while match is None:
+            if not self._read():
+                raise ValueError(f"No match for {pattern.pattern!r} in {self.filename}")
+            match = pattern.search(self.buf, self.pos)
+        self.pos = match.end()
+
+    def peek(self):
+        """Next character after whitespace and commas"""
+        while True:
+            self.pos = _ARRAY_SEPARATOR.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._read():
+                raise ValueError(f"Truncated JSON in {self.filename}")
+
+    def expect(self, char):
+        """Consume one structural character"""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self.buf[self.pos:self.pos + 20]!r} in {self.filename}")
+        self.pos += 1
+
+    def more(self, closing):
+        """Whether another element follows; consumes the closing bracket if not"""
+        if self.peek() == closing:
+            self.pos += 1
+            return False
+        return True
+
+    def decode(self):
+        """Next complete JSON value"""
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                pass  # Value is split across chunks
+            if not self._read():
+                raise ValueError(f"Truncated JSON in {self.filename}")
+
+def _read_members(reader, obj, stream_key):
+    """Decode members into obj up to its closing brace (False) or the opening of stream_key's array (True)"""
+    while reader.more('}'):
+        key = reader.decode()
+        reader.expect(':')
+        if key == stream_key:
+            reader.expect('[')
+            return True
+        obj[key] = reader.decode()
+    return False
+
+def _stream_members(reader, obj, stream_key):
+    """Elements of the open stream_key array, then the members of obj that follow it"""
+    while reader.more(']'):
+        yield reader.decode()
+    _read_members(reader, obj, stream_key)
+
+def iter_graph_edges(filename, chunk_size=1 << 20):
+    """Stream input.json graphs without holding any graph's ``edges`` array in memory.
+
+    Yields ``(graph, edges)`` per graph. ``graph`` holds the members written
+    before "edges" (in practice ``id``, ``name`` and ``nodes``). ``edges``
+    iterates over the edge records. It must be used before the next graph
+    is requested, and members written after "edges" are added to ``graph``
+    once it is exhausted.
+    """
+    with open(filename, 'r') as f:
+        reader = _JsonReader(f, filename, chunk_size)
+        reader.find(re.compile(r'"graphs"\s*:\s*\['))
+        while reader.more(']'):
+            reader.expect('{')
+            graph = {}
+            if _read_members(reader, graph, 'edges'):
+                edges = _stream_members(reader, graph, 'edges')
+            else:
+                edges = iter(())
+            yield graph, edges
+            for _ in edges:
+                pass
+
+def is_json_lines(filename):
+    """Whether a results file is a JSON Lines stream rather than a ``{"results": [...]}`` document"""
+    if str(filename).endswith(JSON_LINES_SUFFIXES):
+        return True
+    with open(filename, 'r') as f:
+        head = f.read(4096)
+    return bool(head.strip()) and not _RESULTS_DOCUMENT.match(head)
+
+def read_json_lines(filename, offset=0):
+    """Records on the complete lines after byte ``offset``, and the offset to resume from.
+
+    A trailing line without its newline is still being written (or was cut
+    off by a crash) and is left for the next call.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+    return records, offset + end
+
+def iter_json_lines(filename):
+    """Stream the records of a JSON Lines file, skipping an unfinished last line"""
+    with open(filename, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            if line.strip():
+                yield json.loads(line)
+
+def iter_results(filename):
+    """Stream result records from either an output.json document or a JSON Lines stream"""
+    if is_json_lines(filename):
+        return iter_json_lines(filename)
+    return iter_json_array(filename, 'results')
+
+class JsonArrayWriter:
+    """Write a ``{"<key>": [...]}`` document one record at a time.
+
+    Records are pretty-printed the same way Gson lays out output.json, so the
+    result is interchangeable with files written by GraphDataLoader.
+    """
+
+    def __init__(self, filename, key='results', indent=2):
+        self.filename = filename
+        self.key = key
+        self.indent = indent
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.filename, 'w')
+        pad = ' ' * self.indent
+        self._file.write('{\n%s%s: [' % (pad, json.dumps(self.key)))
+        return self
+
+    def write(self, record):
+        """Append one record to the array"""
+        pad = ' ' * (2 * self.indent)
+        text = json.dumps(record, indent=self.indent).replace('\n', '\n' + pad)
+        self._file.write((',\n' if self.count else '\n') + pad + text)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        pad = ' ' * self.indent
+        self._file.write(('\n' + pad if self.count else '') + ']\n}\n')
+        self._file.close()
+        return False
+
+class JsonLinesWriter:
+    """Write result records as JSON Lines, flushing each one as it is written"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.filename, 'w')
+        return self
+
+    def write(self, record):
+        """Append one record as a single line"""
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        return False
+
+def results_writer(filename):
+    """Writer for a results file: JSON Lines for .jsonl/.ndjson names, an output.json document otherwise"""
+    if str(filename).endswith(JSON_LINES_SUFFIXES):
+        return JsonLinesWriter(filename)
+    return JsonArrayWriter(filename, 'results')
@@ -0,0 +1,94 @@
+"""Peak memory of a single MST algorithm run.
+
+Two figures are recorded for each run, both relative to the process state
+just before it:
+
+    peak_allocated_bytes  highest total of live Python and NumPy allocations
+                          (tracemalloc), e.g. Prim's heap and CSR lists or
+                          Kruskal's sorted edge copies
+    peak_rss_bytes        growth of the resident set high-water mark; only on
+                          Linux, where /proc/self/clear_refs can reset the mark.
+                          Memory the process already holds from earlier runs is
+                          reused first, so small graphs often show no growth
+
+tracemalloc slows allocation-heavy code and its own bookkeeping takes
+resident memory, so each figure comes from a separate run and neither run
+is the one that supplies ``execution_time_ms``.
+"""
+import gc
+import tracemalloc
+
+PROC_STATUS = '/proc/self/status'
+PROC_CLEAR_REFS = '/proc/self/clear_refs'
+
+def _resident_kb():
+    """(current, high-water) resident set in kB from /proc, or None where unavailable"""
+    try:
+        with open(PROC_STATUS) as f:
+            fields = dict(line.split(':', 1) for line in f)
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _reset_resident_peak():
+    """Reset the kernel's resident high-water mark to the current RSS; False if not supported"""
+    try:
+        with open(PROC_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+class ResidentGrowth:
+    """Growth of the resident high-water mark over a ``with`` block.
+
+    ``bytes`` is set when the block exits, and stays None where the mark
+    cannot be reset or read.
+    """
+
+    def __init__(self):
+        self.bytes = None
+        self._before = None
+
+    def __enter__(self):
+        if _reset_resident_peak():
+            self._before = _resident_kb()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        after = _resident_kb()
+        if self._before is not None and after is not None:
+            self.bytes = max(0, after[1] - self._before[0]) * 1024
+        return False
+
+def peak_rss_bytes(function, *args):
+    """Growth of the resident high-water mark while function(*args) runs, or None"""
+    gc.collect()
+    with ResidentGrowth() as growth:
+        function(*args)
+    return growth.bytes
+
+def peak_allocated_bytes(function, *args):
+    """Peak of traced allocations above the starting level while function(*args) runs"""
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return max(0, peak - baseline)
+
+def measure_memory(function, *args):
+    """Memory block for an output.json algorithm record"""
+    # Resident first: pages freed by the traced run stay mapped and would be reused
+    rss = peak_rss_bytes(function, *args)
+    memory = {'peak_allocated_bytes': peak_allocated_bytes(function, *args)}
+    if rss is not None:
+        memory['peak_rss_bytes'] = rss
+    return memory
@@ -0,0 +1,329 @@
+"""NumPy MST engine that reads input.json and writes output.json-compatible results.
+
+Vertex names are mapped to dense integer ids once per graph. Kruskal orders
+the edges with ``argsort`` and runs an array-backed union-find; Prim walks a
+CSR adjacency with a binary heap. Operation counts follow the same accounting
+as the Java PrimAlgorithm / KruskalAlgorithm so both sources can be plotted
+side by side by visualize_complexity.py.
+"""
+import argparse
+import heapq
+import math
+import time
+
+import numpy as np
+
+from json_stream import iter_json_array, iter_results, results_writer
+from memory_profile import measure_memory
+from phase_profile import PHASE_PROFILERS
+
+class IndexedGraph:
+    """Graph from the input.json schema with vertex names mapped to integer ids"""
+
+    def __init__(self, graph_id, names, src, dst, weight, adjacency=None):
+        self.graph_id = graph_id
+        self.names = names
+        self.src = src
+        self.dst = dst
+        self.weight = weight
+        # Precomputed csr() arrays, e.g. memory-mapped from a graph_store file
+        self._adjacency = adjacency
+
+    @property
+    def vertex_count(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self):
+        return len(self.weight)
+
+    @classmethod
+    def from_json(cls, graph):
+        """Build from one element of the input.json ``graphs`` array"""
+        index = {}
+        names = []
+        for name in graph.get('nodes', []):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+
+        edges = graph.get('edges', [])
+        src = np.empty(len(edges), dtype=np.int32)
+        dst = np.empty(len(edges), dtype=np.int32)
+        weight = np.empty(len(edges), dtype=np.int64)
+        for i, edge in enumerate(edges):
+            # Like Graph.addEdge, endpoints missing from "nodes" are added
+            for name in (edge['from'], edge['to']):
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+            src[i] = index[edge['from']]
+            dst[i] = index[edge['to']]
+            weight[i] = edge['weight']
+
+        return cls(graph['id'], names, src, dst, weight)
+
+    def csr(self):
+        """Undirected adjacency as (indptr, neighbours, weights, edge ids) arrays"""
+        if self._adjacency is not None:
+            return self._adjacency
+        heads = np.concatenate((self.src, self.dst))
+        tails = np.concatenate((self.dst, self.src))
+        weights = np.concatenate((self.weight, self.weight))
+        edge_ids = np.tile(np.arange(self.edge_count, dtype=np.int64), 2)
+
+        order = np.argsort(heads, kind='stable')
+        indptr = np.zeros(self.vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=self.vertex_count), out=indptr[1:])
+        return indptr, tails[order], weights[order], edge_ids[order]
+
+def _edge_record(graph, u, v, w):
+    return {'from': graph.names[u], 'to': graph.names[v], 'weight': int(w)}
+
+def algorithm_result(graph, mst, total_cost, operations, elapsed_ms):
+    """Algorithm block in the output.json schema"""
+    return {
+        'mst_edges': [_edge_record(graph, u, v, w) for u, v, w in mst],
+        'total_cost': int(total_cost),
+        'operations_count': int(operations),
+        'execution_time_ms': round(elapsed_ms, 2),
+    }
+
+def kruskal_tree(graph):
+    """Kruskal's algorithm with argsort edge ordering and an array-backed union-find.
+
+    Returns (mst, total_cost, operations) where mst holds (u, v, weight) tuples.
+    """
+    n = graph.vertex_count
+    m = graph.edge_count
+    if n == 0:
+        return [], 0, 0
+
+    order = np.argsort(graph.weight, kind='stable')
+    operations = int(m * math.log(m)) if m else 0  # Sorting complexity
+
+    parent = list(range(n))
+    rank = [0] * n
+    operations += n  # Initialization of Union-Find
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+
+    src = graph.src[order].tolist()
+    dst = graph.dst[order].tolist()
+    weight = graph.weight[order].tolist()
+
+    mst = []
+    total_cost = 0
+    for u, v, w in zip(src, dst, weight):
+        operations += 3  # Iteration and two find operations
+        root_u = find(u)
+        root_v = find(v)
+        operations += 1  # Comparison
+        if root_u == root_v:
+            continue
+
+        mst.append((u, v, w))
+        total_cost += w
+        if rank[root_u] < rank[root_v]:
+            root_u, root_v = root_v, root_u
+        parent[root_v] = root_u
+        if rank[root_u] == rank[root_v]:
+            rank[root_u] += 1
+        operations += 2  # Union operation counting
+
+        if len(mst) == n - 1:
+            operations += 1  # Comparison
+            break
+
+    return mst, total_cost, operations
+
+def prim_tree(graph, start_vertex=0):
+    """Prim's algorithm over a CSR adjacency with a binary heap.
+
+    Returns (mst, total_cost, operations) where mst holds (u, v, weight) tuples.
+    """
+    n = graph.vertex_count
+    if n == 0:
+        return [], 0, 0
+
+    indptr, neighbours, weights, edge_ids = (a.tolist() for a in graph.csr())
+
+    visited = [False] * n
+    visited[start_vertex] = True
+    visited_count = 1
+    operations = 1  # Adding to visited set
+
+    # Heap entries carry the edge id as a deterministic tie-breaker
+    heap = []
+    for k in range(indptr[start_vertex], indptr[start_vertex + 1]):
+        heapq.heappush(heap, (weights[k], edge_ids[k], start_vertex, neighbours[k]))
+        operations += 1  # Queue insertion
+
+    mst = []
+    total_cost = 0
+    while heap and visited_count < n:
+        w, _, u, v = heapq.heappop(heap)
+        operations += 2  # Queue removal and comparison
+        if visited[v]:
+            operations += 1  # Set lookup operations
+            continue
+
+        operations += 2  # Set lookups
+        visited[v] = True
+        visited_count += 1
+        mst.append((u, v, w))
+        total_cost += w
+        operations += 3  # Add to visited, add to MST, addition operation
+
+        for k in range(indptr[v], indptr[v + 1]):
+            operations += 1  # Iteration
+            neighbour = neighbours[k]
+            if not visited[neighbour]:
+                heapq.heappush(heap, (weights[k], edge_ids[k], v, neighbour))
+                operations += 2  # Set lookup and queue insertion
+            else:
+                operations += 1  # Set lookup
+
+    return mst, total_cost, operations
+
+def _timed(tree_function, graph):
+    """Run a *_tree function once and wrap it as an output.json algorithm block"""
+    if graph.vertex_count == 0:
+        return algorithm_result(graph, [], 0, 0, 0.0)
+    start = time.perf_counter()
+    mst, total_cost, operations = tree_function(graph)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    return algorithm_result(graph, mst, total_cost, operations, elapsed_ms)
+
+def kruskal(graph):
+    """Kruskal's MST as an output.json algorithm block"""
+    return _timed(kruskal_tree, graph)
+
+def prim(graph):
+    """Prim's MST as an output.json algorithm block"""
+    return _timed(prim_tree, graph)
+
+# Engines available to benchmark and batch tools, keyed by output.json field
+ALGORITHMS = {
+    'prim': prim_tree,
+    'kruskal': kruskal_tree,
+}
+
+def run_algorithm(name, graph):
+    """Timed output.json algorithm block from the ALGORITHMS engine of that name"""
+    return _timed(ALGORITHMS[name], graph)
+
+def iter_graphs(filename):
+    """IndexedGraphs from an input.json file or a CSR store written by graph_store.py"""
+    from graph_store import GraphStore, is_graph_store
+
+    if is_graph_store(filename):
+        yield from GraphStore(filename)
+        return
+    for graph in iter_json_array(filename, 'graphs'):
+        yield IndexedGraph.from_json(graph)
+
+def iter_graph_results(input_file, results_file=None):
+    """(IndexedGraph, result) pairs for every graph in input_file.
+
+    With ``results_file`` (e.g. the Java output.json), its records are
+    paired with the graphs in order and must carry the same graph ids;
+    otherwise each graph is solved with this engine first.
+    """
+    results = iter_results(results_file) if results_file else None
+    for graph in iter_graphs(input_file):
+        result = solve_graph(graph) if results is None else next(results, None)
+        if result is None:
+            raise ValueError(f'{results_file} has no result for graph {graph.graph_id}')
+        if result['graph_id'] != graph.graph_id:
+            raise ValueError(f"result for graph {result['graph_id']} does not match "
+                             f"input graph {graph.graph_id}")
+        yield graph, result
+
+def solve_graph(graph, phases=False, memory=False, sensitivity=False, certify=False):
+    """Run Prim and Kruskal on one input.json graph and return its output.json record.
+
+    With ``phases``, each algorithm block also gets a per-phase breakdown
+    from a separate instrumented run (see phase_profile.py); with
+    ``memory``, peak memory figures from further runs (see memory_profile.py);
+    with ``sensitivity``, the weight tolerance of every edge (see sensitivity.py);
+    with ``certify``, a check that each tree is a minimum spanning tree (see certify.py).
+    """
+    indexed = IndexedGraph.from_json(graph) if isinstance(graph, dict) else graph
+    result = {
+        'graph_id': indexed.graph_id,
+        'input_stats': {
+            'vertices': indexed.vertex_count,
+            'edges': indexed.edge_count,
+        },
+        'prim': prim(indexed),
+        'kruskal': kruskal(indexed),
+    }
+    if phases:
+        for algorithm, profiler in PHASE_PROFILERS.items():
+            result[algorithm]['phases'] = profiler(indexed)[2].to_json()
+    if memory:
+        for algorithm, tree_function in ALGORITHMS.items():
+            result[algorithm]['memory'] = measure_memory(tree_function, indexed)
+    if sensitivity:
+        from sensitivity import add_sensitivity
+        add_sensitivity(result, indexed)
+    if certify:
+        from certify import certify_result
+        certify_result(result, indexed)
+    return result
+
+def result_summary(result):
+    """One-line progress message for an output.json record, ending in any certify.py flag"""
+    from certify import check_label, check_status
+
+    status = check_status(result)
+    return (f"Graph {result['graph_id']}: V={result['input_stats']['vertices']}, "
+            f"E={result['input_stats']['edges']}, cost={result['prim']['total_cost']}, "
+            f"Prim {result['prim']['execution_time_ms']:.2f} ms, "
+            f"Kruskal {result['kruskal']['execution_time_ms']:.2f} ms"
+            + (f" [{check_label(status)}]" if status else ''))
+
+def solve_file(input_file, output_file, phases=False, memory=False, sensitivity=False,
+               certify=False):
+    """Stream graphs from an input.json file or graph store and write their results to output_file"""
+    with results_writer(output_file) as writer:
+        for graph in iter_graphs(input_file):
+            result = solve_graph(graph, phases, memory, sensitivity, certify)
+            writer.write(result)
+            print(result_summary(result))
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Compute MSTs with the NumPy engine')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('-o', '--output', default='output.json',
+                        help='results file in the output.json schema, or JSON Lines for a .jsonl name '
+                             '(default: output.json)')
+    parser.add_argument('--phases', action='store_true',
+                        help='add per-phase counts and timings (sort/find/union, '
+                             'heap push/pop/visited) from an instrumented rerun')
+    parser.add_argument('--memory', action='store_true',
+                        help='add peak allocated and resident bytes per algorithm run')
+    parser.add_argument('--sensitivity', action='store_true',
+                        help='add the weight range over which each edge keeps its MST status')
+    parser.add_argument('--certify', action='store_true',
+                        help='check that both trees span, are acyclic and pass the cycle property')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Solve every graph in the input file"""
+    args = parse_args(argv)
+    count = solve_file(args.input, args.output, args.phases, args.memory, args.sensitivity,
+                       args.certify)
+    print(f"Results for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,370 @@
+"""Multi-core Borůvka engine for single graphs too large for one core.
+
+Prim's heap loop and Kruskal's sorted scan are sequential, so batch_solve.py
+cannot speed up a job that is one huge graph. Borůvka can: in every round,
+each component takes its lightest outgoing edge, and all of those edges
+join the tree at once.
+
+The edges are copied once into shared memory, where every worker process
+maps them. Worker k also owns a contiguous range of component ids. Each
+round then has three parallel steps:
+
+    scan     every worker owns a slice of the live edge ids. It drops
+             edges that now lie inside one component (compacting its slice
+             in place), then stages each remaining edge once per endpoint
+             component, grouped by the worker owning that component
+    reduce   every worker takes the staged edges of its own components from
+             all slices and keeps the lightest per component
+    relabel  workers map vertex labels to the contracted component ids
+
+Between them, the main process joins the components that the lightest
+edges connect (pointer jumping over the hook forest) and numbers the new
+components densely. Shared memory is O(V + E) for any worker count: the
+staging area holds two entries per edge and the lightest edges one per
+vertex. Edges are ordered by (weight, input position), the same tie-break
+as mst_engine.kruskal_tree, so the tree is identical to Kruskal's.
+
+Results are full output.json records: the Prim and Kruskal blocks from
+mst_engine, plus a ``boruvka`` block timed at every requested worker count::
+
+    "boruvka": {"mst_edges", "total_cost", "operations_count", "execution_time_ms",
+                "workers", "rounds", "scaling": [{"workers", "execution_time_ms"}, ...]}
+"""
+import argparse
+import concurrent.futures
+import os
+import statistics
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from boruvka_scaling import DEFAULT_SCALING_WORKERS, MAX_SCALING_POINTS, scaling_times
+from json_stream import results_writer
+
+DEFAULT_TRIALS = 3
+NO_EDGE = np.iinfo(np.int64).max
+EDGE_BITS = 32  # Low bits of a packed (weight, edge id) key
+
+class SharedArrays:
+    """NumPy arrays in named shared memory blocks, created by the main process and mapped by workers"""
+
+    def __init__(self):
+        self.blocks = {}
+        self.arrays = {}
+
+    def create(self, name, shape, dtype):
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks[name] = block
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        return self.arrays[name]
+
+    def spec(self):
+        """What a worker needs to map the same arrays"""
+        return {name: (self.blocks[name].name, array.shape, array.dtype.str)
+                for name, array in self.arrays.items()}
+
+    @classmethod
+    def attach(cls, spec):
+        shared = cls()
+        for name, (block_name, shape, dtype) in spec.items():
+            # Workers share the main process's resource tracker, which unlinks nothing the main
+            # process has already unlinked
+            block = shared_memory.SharedMemory(name=block_name)
+            shared.blocks[name] = block
+            shared.arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return shared
+
+    def release(self, unlink=True):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+        self.blocks.clear()
+
+# Arrays mapped by _init_worker, shared by every task in the process; the
+# blocks must stay referenced, since collecting one unmaps its array
+_worker_shared = None
+
+def _init_worker(spec):
+    """Map the shared arrays once per worker process"""
+    global _worker_shared
+    _worker_shared = SharedArrays.attach(spec)
+
+def _worker_ready(_):
+    """No-op task that makes the pool start its processes"""
+    return _worker_shared is not None
+
+def _owner_bounds(owner, owners, component_count):
+    """Component ids [lo, hi) reduced by one worker; component c belongs to c * owners // component_count"""
+    return ((owner * component_count + owners - 1) // owners,
+            ((owner + 1) * component_count + owners - 1) // owners)
+
+def _scan_slice(slice_index, component_count, arrays=None):
+    """Compact one slice of live edges and stage (component, key) pairs grouped by owning worker"""
+    a = arrays if arrays is not None else _worker_shared.arrays
+    start, count = int(a['slice_start'][slice_index]), int(a['slice_count'][slice_index])
+    live = a['live'][start:start + count]
+    label = a['label']
+    u = label[a['src'][live]]
+    v = label[a['dst'][live]]
+    keep = u != v
+    kept = int(np.count_nonzero(keep))
+    if kept < count:
+        live[:kept] = live[keep]
+        u, v = u[keep], v[keep]
+        a['slice_count'][slice_index] = kept
+    key = a['key'][live[:kept]]
+    component = np.concatenate((u, v))
+    key = np.concatenate((key, key))
+
+    owners = len(a['owner_count'])
+    if owners > 1:
+        owner = (component.astype(np.int64) * owners // component_count).astype(np.min_scalar_type(owners))
+        order = np.argsort(owner, kind='stable')  # Radix sort on the small owner ids
+        component, key = component[order], key[order]
+        a['owner_count'][slice_index] = np.bincount(owner, minlength=owners)
+    else:
+        a['owner_count'][slice_index, 0] = 2 * kept
+    a['stage_component'][2 * start:2 * (start + kept)] = component
+    a['stage_key'][2 * start:2 * (start + kept)] = key
+    return count
+
+def _reduce_components(owner, component_count, arrays=None):
+    """Lightest staged edge key of every component this worker owns, written to ``best``"""
+    a = arrays if arrays is not None else _worker_shared.arrays
+    counts = a['owner_count']
+    lo, hi = _owner_bounds(owner, len(counts), component_count)
+    starts = 2 * a['slice_start'] + counts[:, :owner].sum(axis=1)
+    best = a['best'][lo:hi]
+    best.fill(NO_EDGE)
+    staged = 0
+    for start, count in zip(starts.tolist(), counts[:, owner].tolist()):
+        if count:
+            stop = start + count
+            np.minimum.at(best, a['stage_component'][start:stop] - lo, a['stage_key'][start:stop])
+            staged += count
+    return staged
+
+def _relabel(lo, hi, arrays=None):
+    """Move the labels of vertices lo..hi to the contracted components"""
+    a = arrays if arrays is not None else _worker_shared.arrays
+    a['label'][lo:hi] = a['component_map'][a['label'][lo:hi]]
+
+def _ranges(count, parts):
+    """Split range(count) into ``parts`` contiguous (lo, hi) pieces"""
+    bounds = np.linspace(0, count, parts + 1).astype(np.int64)
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+def edge_keys(weight):
+    """Unique int64 keys ordered by (weight, edge id), and a function mapping keys back to edge ids"""
+    weight = np.asarray(weight, dtype=np.int64)
+    edge_ids = np.arange(len(weight), dtype=np.int64)
+    if len(weight) and len(weight) < 1 << EDGE_BITS:
+        low = int(weight.min())
+        if int(weight.max()) - low < 1 << (63 - EDGE_BITS):
+            return ((weight - low) << EDGE_BITS) | edge_ids, lambda key: key & ((1 << EDGE_BITS) - 1)
+    # Weight range too wide to pack: rank the edges once instead
+    order = np.argsort(weight, kind='stable')
+    rank = np.empty(len(weight), dtype=np.int64)
+    rank[order] = edge_ids
+    return rank, lambda key: order[key]
+
+class BoruvkaEngine:
+    """One graph copied into shared memory, solved with any number of worker processes"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.shared = SharedArrays()
+        n, m = graph.vertex_count, graph.edge_count
+        self.shared.create('src', m, np.int32)[:] = graph.src
+        self.shared.create('dst', m, np.int32)[:] = graph.dst
+        key, self.decode = edge_keys(graph.weight)
+        self.shared.create('key', m, np.int64)[:] = key
+        self.shared.create('live', m, np.int64)
+        self.shared.create('label', n, np.int32)
+        self.shared.create('component_map', n, np.int32)
+        self.shared.create('stage_component', 2 * m, np.int32)
+        self.shared.create('stage_key', 2 * m, np.int64)
+        self.shared.create('best', n, np.int64)
+
+    def close(self):
+        self.shared.release()
+
+    def _prepare(self, slices):
+        """Reset the per-run arrays for a run with this many edge slices"""
+        a = self.shared.arrays
+        a['live'][:] = np.arange(self.graph.edge_count)
+        a['label'][:] = np.arange(self.graph.vertex_count)
+        bounds = _ranges(self.graph.edge_count, slices)
+        for name in ('slice_start', 'slice_count', 'owner_count'):
+            if name in self.shared.blocks:
+                del a[name]
+                block = self.shared.blocks.pop(name)
+                block.close()
+                block.unlink()
+        self.shared.create('slice_start', slices, np.int64)[:] = [lo for lo, _ in bounds]
+        self.shared.create('slice_count', slices, np.int64)[:] = [hi - lo for lo, hi in bounds]
+        self.shared.create('owner_count', (slices, slices), np.int64)
+
+    def solve(self, workers=1):
+        """Borůvka with ``workers`` processes; returns (edge ids, rounds, operations, elapsed ms)"""
+        self._prepare(workers)
+        pool = None
+        if workers > 1:
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(self.shared.spec(),))
+            list(pool.map(_worker_ready, range(workers)))  # Start the workers before the clock
+        try:
+            start = time.perf_counter()
+            tree, rounds, operations = self._rounds(workers, pool)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return tree, rounds, operations, elapsed_ms
+
+    def _map(self, pool, function, *iterables):
+        if pool is None:
+            return [function(*args, arrays=self.shared.arrays) for args in zip(*iterables)]
+        return list(pool.map(function, *iterables))
+
+    def _rounds(self, workers, pool):
+        a = self.shared.arrays
+        src, dst, label = a['src'], a['dst'], a['label']
+        component_count = self.graph.vertex_count
+        vertex_ranges = _ranges(self.graph.vertex_count, workers)
+        tree = []
+        rounds = operations = 0
+        while component_count > 1:
+            scanned = self._map(pool, _scan_slice, range(workers), [component_count] * workers)
+            staged = self._map(pool, _reduce_components, range(workers), [component_count] * workers)
+            operations += 2 * sum(scanned) + sum(staged)  # Two label lookups per live edge, one min per staged entry
+
+            best = a['best'][:component_count]
+            hooked = np.flatnonzero(best != NO_EDGE)
+            if len(hooked) == 0:
+                break  # Remaining components are not connected
+            rounds += 1
+            edges = self.decode(best[hooked])
+            u, v = label[src[edges]], label[dst[edges]]
+
+            # Each component points at the one across its lightest edge; a pair that
+            # picked the same edge points at each other and the lower id becomes the root
+            ids = np.arange(component_count)
+            hook = ids.copy()
+            hook[hooked] = np.where(u == hooked, v, u)
+            mutual = (hook[hook] == ids) & (ids < hook)
+            hook[mutual] = ids[mutual]
+            tree.append(edges[~mutual[hooked]])  # The other side of a pair holds the same edge
+            while True:
+                jumped = hook[hook]
+                if np.array_equal(jumped, hook):
+                    break
+                hook = jumped
+
+            roots = hook == ids
+            a['component_map'][:component_count] = (np.cumsum(roots) - 1)[hook]
+            self._map(pool, _relabel, *zip(*vertex_ranges))
+            operations += self.graph.vertex_count + component_count
+            component_count = int(roots.sum())
+
+        edges = np.concatenate(tree) if tree else np.empty(0, dtype=np.int64)
+        # Kruskal order, so the block reads like the other engines' trees
+        return edges[np.argsort(a['key'][edges])], rounds, operations
+
+def boruvka_block(graph, worker_counts=(1,), trials=DEFAULT_TRIALS):
+    """output.json algorithm block for Borůvka, timed at every worker count"""
+    from mst_engine import algorithm_result
+
+    engine = BoruvkaEngine(graph)
+    try:
+        scaling = []
+        for workers in worker_counts:
+            runs = [engine.solve(workers) for _ in range(trials)]
+            tree, rounds, operations, _ = runs[0]
+            scaling.append({'workers': workers,
+                            'execution_time_ms': round(statistics.median(run[3] for run in runs), 2)})
+    finally:
+        engine.close()
+
+    mst = zip(graph.src[tree].tolist(), graph.dst[tree].tolist(), graph.weight[tree].tolist())
+    block = algorithm_result(graph, mst, int(graph.weight[tree].sum()), operations,
+                             scaling[-1]['execution_time_ms'])
+    block.update(workers=scaling[-1]['workers'], rounds=rounds, scaling=scaling)
+    return block
+
+def solve_graph(graph, worker_counts=(1,), trials=DEFAULT_TRIALS):
+    """Prim and Kruskal from mst_engine plus the Borůvka block, as one output.json record"""
+    import mst_engine
+
+    indexed = mst_engine.IndexedGraph.from_json(graph) if isinstance(graph, dict) else graph
+    result = mst_engine.solve_graph(indexed)
+    result['boruvka'] = boruvka_block(indexed, worker_counts, trials)
+    return result
+
+def boruvka_summary(result):
+    """One-line progress message for a record written by solve_graph"""
+    from mst_engine import result_summary
+
+    boruvka = result['boruvka']
+    times = scaling_times(boruvka)
+    line = f"{result_summary(result)}, Borůvka " + ', '.join(
+        f"{ms:.2f} ms on {workers}" for workers, ms in times)
+    (base_workers, base_ms), (most_workers, most_ms) = times[0], times[-1]
+    if most_workers != base_workers and most_ms > 0:
+        line += f" (speedup {base_ms / most_ms:.2f}x over {base_workers})"
+    if boruvka['total_cost'] != result['kruskal']['total_cost']:
+        line += ' [Borůvka cost differs]'
+    return line
+
+def default_workers():
+    """Powers of two up to the CPU count"""
+    cpus = os.cpu_count() or 1
+    return [workers for workers in DEFAULT_SCALING_WORKERS if workers <= cpus]
+
+def solve_file(input_file, output_file, worker_counts=None, trials=DEFAULT_TRIALS):
+    """Solve every graph with Prim, Kruskal and Borůvka and write the results to output_file"""
+    from mst_engine import iter_graphs
+
+    worker_counts = worker_counts or default_workers()
+    with results_writer(output_file) as writer:
+        for graph in iter_graphs(input_file):
+            result = solve_graph(graph, worker_counts, trials)
+            writer.write(result)
+            print(boruvka_summary(result))
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Parallel Borůvka MSTs benchmarked against Prim and Kruskal')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('-o', '--output', default='output_boruvka.json',
+                        help='results file in the output.json schema, or JSON Lines for a .jsonl name '
+                             '(default: output_boruvka.json)')
+    parser.add_argument('--workers', nargs='+', type=int,
+                        help='worker process counts to time, in order '
+                             '(default: powers of two up to the CPU count)')
+    parser.add_argument('--trials', type=int, default=DEFAULT_TRIALS,
+                        help=f'timed runs per worker count; the median is kept (default: {DEFAULT_TRIALS})')
+    args = parser.parse_args(argv)
+    if args.trials < 1 or (args.workers and min(args.workers) < 1):
+        parser.error('--workers and --trials must be positive')
+    if args.workers and len(set(args.workers)) > MAX_SCALING_POINTS:
+        parser.error(f'--workers takes at most {MAX_SCALING_POINTS} distinct counts, '
+                     f'the most visualize_complexity.py plots per graph')
+    return args
+
+def main(argv=None):
+    """Solve every graph in the input file"""
+    args = parse_args(argv)
+    count = solve_file(args.input, args.output, args.workers, args.trials)
+    print(f"Results for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Per-phase operation counts and timings for Prim and Kruskal.
+
+The ``operations_count`` reported by the engines follows the original Java
+accounting, which mixes counted events with estimates (Kruskal's sort is
+charged E ln E). This module reruns each algorithm with every primitive
+counted and timed on its own, so the plots can show which phase dominates:
+
+    kruskal  sort       edges ordered
+             find       union-find nodes visited: one per call plus one per parent hop
+             union      trees linked
+    prim     heap_push  heap insertions
+             heap_pop   heap removals
+             visited    visited-set lookups
+
+Timing each primitive costs a clock read pair, which is calibrated once
+and subtracted. Phase times therefore describe the instrumented run, while
+``execution_time_ms`` keeps coming from the plain one.
+"""
+import heapq
+import time
+
+import numpy as np
+
+# Phases recorded per algorithm, in plotting order
+PHASES = {
+    'prim': ('heap_push', 'heap_pop', 'visited'),
+    'kruskal': ('sort', 'find', 'union'),
+}
+
+_clock_overhead = None
+
+def clock_overhead_ns(samples=2000):
+    """Median cost of one back-to-back perf_counter_ns pair, measured once per process"""
+    global _clock_overhead
+    if _clock_overhead is None:
+        clock = time.perf_counter_ns
+        deltas = []
+        for _ in range(samples):
+            start = clock()
+            deltas.append(clock() - start)
+        _clock_overhead = sorted(deltas)[samples // 2]
+    return _clock_overhead
+
+class PhaseProfile:
+    """Event counts and timed nanoseconds per phase"""
+
+    def __init__(self, phases):
+        self.counts = dict.fromkeys(phases, 0)
+        self.nanos = dict.fromkeys(phases, 0)
+        self.sections = dict.fromkeys(phases, 0)
+
+    def add(self, phase, count, nanos, sections=1):
+        """Record ``count`` events that took ``nanos`` over ``sections`` timed regions"""
+        self.counts[phase] += count
+        self.nanos[phase] += nanos
+        self.sections[phase] += sections
+
+    def to_json(self):
+        """Nested breakdown for an output.json algorithm block"""
+        overhead = clock_overhead_ns()
+        return {
+            phase: {
+                'count': self.counts[phase],
+                'time_ms': round(max(0, self.nanos[phase] - self.sections[phase] * overhead) / 1e6, 4),
+            }
+            for phase in self.counts
+        }
+
+def kruskal_phases(graph):
+    """Kruskal with sort, find and union counted and timed; returns (mst, total_cost, profile)"""
+    profile = PhaseProfile(PHASES['kruskal'])
+    n = graph.vertex_count
+    if n == 0:
+        return [], 0, profile
+    clock = time.perf_counter_ns
+
+    start = clock()
+    order = np.argsort(graph.weight, kind='stable')
+    profile.add('sort', graph.edge_count, clock() - start)
+
+    parent = list(range(n))
+    rank = [0] * n
+    src = graph.src[order].tolist()
+    dst = graph.dst[order].tolist()
+    weight = graph.weight[order].tolist()
+
+    find_steps = find_ns = find_sections = 0
+    unions = union_ns = 0
+    mst = []
+    total_cost = 0
+    for u, v, w in zip(src, dst, weight):
+        start = clock()
+        x = u
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+            find_steps += 1
+        root_u = x
+        x = v
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+            find_steps += 1
+        root_v = x
+        find_ns += clock() - start
+        find_steps += 2
+        find_sections += 1
+        if root_u == root_v:
+            continue
+
+        mst.append((u, v, w))
+        total_cost += w
+        start = clock()
+        if rank[root_u] < rank[root_v]:
+            root_u, root_v = root_v, root_u
+        parent[root_v] = root_u
+        if rank[root_u] == rank[root_v]:
+            rank[root_u] += 1
+        union_ns += clock() - start
+        unions += 1
+        if len(mst) == n - 1:
+            break
+
+    profile.add('find', find_steps, find_ns, find_sections)
+    profile.add('union', unions, union_ns, unions)
+    return mst, total_cost, profile
+
+def prim_phases(graph, start_vertex=0):
+    """Prim with heap pushes, heap pops and visited lookups counted and timed.
+
+    Returns (mst, total_cost, profile).
+    """
+    profile = PhaseProfile(PHASES['prim'])
+    n = graph.vertex_count
+    if n == 0:
+        return [], 0, profile
+    clock = time.perf_counter_ns
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    indptr, neighbours, weights, edge_ids = (a.tolist() for a in graph.csr())
+    visited = [False] * n
+    visited[start_vertex] = True
+    visited_count = 1
+
+    pushes = push_ns = 0
+    pops = pop_ns = 0
+    lookups = lookup_ns = 0
+    heap = []
+    for k in range(indptr[start_vertex], indptr[start_vertex + 1]):
+        start = clock()
+        heappush(heap, (weights[k], edge_ids[k], start_vertex, neighbours[k]))
+        push_ns += clock() - start
+        pushes += 1
+
+    mst = []
+    total_cost = 0
+    while heap and visited_count < n:
+        start = clock()
+        w, _, u, v = heappop(heap)
+        pop_ns += clock() - start
+        pops += 1
+
+        start = clock()
+        seen = visited[v]
+        lookup_ns += clock() - start
+        lookups += 1
+        if seen:
+            continue
+
+        visited[v] = True
+        visited_count += 1
+        mst.append((u, v, w))
+        total_cost += w
+
+        for k in range(indptr[v], indptr[v + 1]):
+            neighbour = neighbours[k]
+            start = clock()
+            seen = visited[neighbour]
+            lookup_ns += clock() - start
+            lookups += 1
+            if not seen:
+                start = clock()
+                heappush(heap, (weights[k], edge_ids[k], v, neighbour))
+                push_ns += clock() - start
+                pushes += 1
+
+    profile.add('heap_push', pushes, push_ns, pushes)
+    profile.add('heap_pop', pops, pop_ns, pops)
+    profile.add('visited', lookups, lookup_ns, lookups)
+    return mst, total_cost, profile
+
+# Instrumented runners keyed by output.json field
+PHASE_PROFILERS = {
+    'prim': prim_phases,
+    'kruskal': kruskal_phases,
+}
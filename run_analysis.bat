@@ -34,98 +34,40 @@ echo.
 echo ============================================================
 echo Step 3: Running MST analysis with PRIMARY dataset (input.json)...
 echo ============================================================
-call mvn exec:java
+call mvn exec:java -Dexec.args="input.json output_primary.json"
 
 if %ERRORLEVEL% NEQ 0 (
     echo X Primary dataset analysis failed!
     exit /b 1
 )
 
-REM Backup primary results
-echo.
-echo Backing up primary dataset results...
-copy output.json output_primary.json
-
 REM Step 4: Run with additional test datasets
 echo.
 echo ============================================================
 echo Step 4: Running MST analysis with ADDITIONAL dataset (test_datasets.json)...
 echo ============================================================
-
-REM Backup original input.json
-copy input.json input_original_backup.json
-
-REM Copy test_datasets.json to input.json
-copy test_datasets.json input.json
-
-REM Run analysis on test datasets
-call mvn exec:java
+call mvn exec:java -Dexec.args="test_datasets.json output_test_datasets.json"
 
 if %ERRORLEVEL% NEQ 0 (
     echo X Test dataset analysis failed!
-    REM Restore original input
-    move /y input_original_backup.json input.json
     exit /b 1
 )
 
-REM Backup test dataset results
-copy output.json output_test_datasets.json
-
-REM Restore original input.json
-move /y input_original_backup.json input.json
-
 echo.
 echo + Both dataset analyses completed successfully!
 
-REM Step 5: Generate visualizations for primary dataset
+REM Step 5: Generate visualizations and the combined report in one pass
 echo.
 echo ============================================================
-echo Step 5: Generating complexity visualizations...
+echo Step 5: Generating complexity visualizations and combined report...
 echo ============================================================
-
-REM Generate visualizations for primary dataset
-copy output_primary.json output.json
-python visualize_complexity.py
+python visualize_complexity.py primary=output_primary.json test=output_test_datasets.json
 
 if %ERRORLEVEL% NEQ 0 (
-    echo ! Python visualization failed for primary dataset.
+    echo ! Python visualization failed.
     echo   Make sure matplotlib and numpy are installed: pip install matplotlib numpy
 ) else (
-    echo + Primary dataset visualizations generated successfully!
-    REM Rename plots folder
-    if exist analysis_plots_primary rmdir /s /q analysis_plots_primary
-    move analysis_plots analysis_plots_primary
-)
-
-REM Generate visualizations for test dataset
-echo.
-echo Generating visualizations for test dataset...
-copy output_test_datasets.json output.json
-python visualize_complexity.py
-
-if %ERRORLEVEL% NEQ 0 (
-    echo ! Python visualization failed for test dataset.
-) else (
-    echo + Test dataset visualizations generated successfully!
-    REM Rename plots folder
-    if exist analysis_plots_test rmdir /s /q analysis_plots_test
-    move analysis_plots analysis_plots_test
-)
-
-REM Restore primary output as default
-copy output_primary.json output.json
-
-REM Step 6: Generate combined summary report
-echo.
-echo ============================================================
-echo Step 6: Generating combined summary report...
-echo ============================================================
-python generate_combined_report.py
-
-if %ERRORLEVEL% NEQ 0 (
-    echo ! Combined report generation skipped (script may not exist yet)
-) else (
-    echo + Combined report generated successfully!
+    echo + Visualizations and combined report generated successfully!
 )
 
 echo.
@@ -136,9 +78,9 @@ echo.
 echo Results Summary:
 echo   - Primary dataset results: output_primary.json
 echo   - Test dataset results: output_test_datasets.json
-echo   - Current output: output.json
-echo   - Primary visualizations: analysis_plots_primary\
-echo   - Test visualizations: analysis_plots_test\
+echo   - Primary visualizations: analysis_plots\primary\
+echo   - Test visualizations: analysis_plots\test\
+echo   - Combined report: analysis_plots\dataset_summary.png, analysis_plots\combined_summary.json
 echo   - Test results: target\surefire-reports\
 echo.
 echo Total graphs analyzed: 30 (15 primary + 15 test)
@@ -146,23 +88,28 @@ echo.
 echo Files generated:
 echo   [Primary Dataset - 15 graphs, IDs 1-15]
 echo   - output_primary.json
-echo   - analysis_plots_primary\operations_vs_vertices.png
-echo   - analysis_plots_primary\time_vs_vertices.png
-echo   - analysis_plots_primary\operations_comparison.png
-echo   - analysis_plots_primary\time_comparison.png
-echo   - analysis_plots_primary\density_analysis.png
-echo   - analysis_plots_primary\complexity_verification.png
-echo   - analysis_plots_primary\summary_table.png
+echo   - analysis_plots\primary\operations_vs_vertices.png
+echo   - analysis_plots\primary\time_vs_vertices.png
+echo   - analysis_plots\primary\operations_comparison.png
+echo   - analysis_plots\primary\time_comparison.png
+echo   - analysis_plots\primary\density_analysis.png
+echo   - analysis_plots\primary\complexity_verification.png
+echo   - analysis_plots\primary\summary_table.png
 echo.
 echo   [Test Dataset - 15 graphs, IDs 101-115]
 echo   - output_test_datasets.json
-echo   - analysis_plots_test\operations_vs_vertices.png
-echo   - analysis_plots_test\time_vs_vertices.png
-echo   - analysis_plots_test\operations_comparison.png
-echo   - analysis_plots_test\time_comparison.png
-echo   - analysis_plots_test\density_analysis.png
-echo   - analysis_plots_test\complexity_verification.png
-echo   - analysis_plots_test\summary_table.png
+echo   - analysis_plots\test\operations_vs_vertices.png
+echo   - analysis_plots\test\time_vs_vertices.png
+echo   - analysis_plots\test\operations_comparison.png
+echo   - analysis_plots\test\time_comparison.png
+echo   - analysis_plots\test\density_analysis.png
+echo   - analysis_plots\test\complexity_verification.png
+echo   - analysis_plots\test\summary_table.png
+echo.
+echo   [Combined Report]
+echo   - analysis_plots\dataset_scaling.png
+echo   - analysis_plots\dataset_summary.png
+echo   - analysis_plots\combined_summary.json
 echo.
 echo Next steps:
 echo   1. Review both output JSON files for detailed MST results
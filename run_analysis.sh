@@ -35,98 +35,40 @@ echo ""
 echo "============================================================"
 echo "Step 3: Running MST analysis with PRIMARY dataset (input.json)..."
 echo "============================================================"
-mvn exec:java
+mvn exec:java -Dexec.args="input.json output_primary.json"
 
 if [ $? -ne 0 ]; then
     echo "❌ Primary dataset analysis failed!"
     exit 1
 fi
 
-# Backup primary results
-echo ""
-echo "Backing up primary dataset results..."
-cp output.json output_primary.json
-
 # Step 4: Run with additional test datasets
 echo ""
 echo "============================================================"
 echo "Step 4: Running MST analysis with ADDITIONAL dataset (test_datasets.json)..."
 echo "============================================================"
-
-# Backup original input.json
-cp input.json input_original_backup.json
-
-# Copy test_datasets.json to input.json
-cp test_datasets.json input.json
-
-# Run analysis on test datasets
-mvn exec:java
+mvn exec:java -Dexec.args="test_datasets.json output_test_datasets.json"
 
 if [ $? -ne 0 ]; then
     echo "❌ Test dataset analysis failed!"
-    # Restore original input
-    mv input_original_backup.json input.json
     exit 1
 fi
 
-# Backup test dataset results
-cp output.json output_test_datasets.json
-
-# Restore original input.json
-mv input_original_backup.json input.json
-
 echo ""
 echo "✓ Both dataset analyses completed successfully!"
 
-# Step 5: Generate visualizations for primary dataset
+# Step 5: Generate visualizations and the combined report in one pass
 echo ""
 echo "============================================================"
-echo "Step 5: Generating complexity visualizations..."
+echo "Step 5: Generating complexity visualizations and combined report..."
 echo "============================================================"
-
-# Generate visualizations for primary dataset
-cp output_primary.json output.json
-python3 visualize_complexity.py
+python3 visualize_complexity.py primary=output_primary.json test=output_test_datasets.json
 
 if [ $? -ne 0 ]; then
-    echo "⚠ Python visualization failed for primary dataset."
+    echo "⚠ Python visualization failed."
     echo "  Make sure matplotlib and numpy are installed: pip install matplotlib numpy"
 else
-    echo "✓ Primary dataset visualizations generated successfully!"
-    # Rename plots folder
-    rm -rf analysis_plots_primary
-    mv analysis_plots analysis_plots_primary
-fi
-
-# Generate visualizations for test dataset
-echo ""
-echo "Generating visualizations for test dataset..."
-cp output_test_datasets.json output.json
-python3 visualize_complexity.py
-
-if [ $? -ne 0 ]; then
-    echo "⚠ Python visualization failed for test dataset."
-else
-    echo "✓ Test dataset visualizations generated successfully!"
-    # Rename plots folder
-    rm -rf analysis_plots_test
-    mv analysis_plots analysis_plots_test
-fi
-
-# Restore primary output as default
-cp output_primary.json output.json
-
-# Step 6: Generate combined summary report
-echo ""
-echo "============================================================"
-echo "Step 6: Generating combined summary report..."
-echo "============================================================"
-python3 generate_combined_report.py
-
-if [ $? -ne 0 ]; then
-    echo "⚠ Combined report generation skipped (script may not exist yet)"
-else
-    echo "✓ Combined report generated successfully!"
+    echo "✓ Visualizations and combined report generated successfully!"
 fi
 
 echo ""
@@ -137,9 +79,9 @@ echo ""
 echo "Results Summary:"
 echo "  - Primary dataset results: output_primary.json"
 echo "  - Test dataset results: output_test_datasets.json"
-echo "  - Current output: output.json"
-echo "  - Primary visualizations: analysis_plots_primary/"
-echo "  - Test visualizations: analysis_plots_test/"
+echo "  - Primary visualizations: analysis_plots/primary/"
+echo "  - Test visualizations: analysis_plots/test/"
+echo "  - Combined report: analysis_plots/dataset_summary.png, analysis_plots/combined_summary.json"
 echo "  - Test results: target/surefire-reports/"
 echo ""
 echo "Total graphs analyzed: 30 (15 primary + 15 test)"
@@ -147,23 +89,28 @@ echo ""
 echo "Files generated:"
 echo "  [Primary Dataset - 15 graphs, IDs 1-15]"
 echo "  - output_primary.json"
-echo "  - analysis_plots_primary/operations_vs_vertices.png"
-echo "  - analysis_plots_primary/time_vs_vertices.png"
-echo "  - analysis_plots_primary/operations_comparison.png"
-echo "  - analysis_plots_primary/time_comparison.png"
-echo "  - analysis_plots_primary/density_analysis.png"
-echo "  - analysis_plots_primary/complexity_verification.png"
-echo "  - analysis_plots_primary/summary_table.png"
+echo "  - analysis_plots/primary/operations_vs_vertices.png"
+echo "  - analysis_plots/primary/time_vs_vertices.png"
+echo "  - analysis_plots/primary/operations_comparison.png"
+echo "  - analysis_plots/primary/time_comparison.png"
+echo "  - analysis_plots/primary/density_analysis.png"
+echo "  - analysis_plots/primary/complexity_verification.png"
+echo "  - analysis_plots/primary/summary_table.png"
 echo ""
 echo "  [Test Dataset - 15 graphs, IDs 101-115]"
 echo "  - output_test_datasets.json"
-echo "  - analysis_plots_test/operations_vs_vertices.png"
-echo "  - analysis_plots_test/time_vs_vertices.png"
-echo "  - analysis_plots_test/operations_comparison.png"
-echo "  - analysis_plots_test/time_comparison.png"
-echo "  - analysis_plots_test/density_analysis.png"
-echo "  - analysis_plots_test/complexity_verification.png"
-echo "  - analysis_plots_test/summary_table.png"
+echo "  - analysis_plots/test/operations_vs_vertices.png"
+echo "  - analysis_plots/test/time_vs_vertices.png"
+echo "  - analysis_plots/test/operations_comparison.png"
+echo "  - analysis_plots/test/time_comparison.png"
+echo "  - analysis_plots/test/density_analysis.png"
+echo "  - analysis_plots/test/complexity_verification.png"
+echo "  - analysis_plots/test/summary_table.png"
+echo ""
+echo "  [Combined Report]"
+echo "  - analysis_plots/dataset_scaling.png"
+echo "  - analysis_plots/dataset_summary.png"
+echo "  - analysis_plots/combined_summary.json"
 echo ""
 echo "Next steps:"
 echo "  1. Review both output JSON files for detailed MST results"
@@ -0,0 +1,332 @@
+"""Edge sensitivity analysis for a computed MST, all edges in one pass.
+
+For a tree edge, the question is how far its weight can rise before some
+other road replaces it. The answer is the lightest non-tree edge whose tree
+path crosses it (cut property). For a non-tree edge, the question is how
+far its weight must fall before it joins the tree. The answer is the
+heaviest edge on the tree path between its endpoints (cycle property).
+
+Both are computed without rerunning the MST:
+
+- Path maxima use binary lifting over the rooted tree. Every non-tree edge
+  is answered by the same O(log V) vectorized jumps.
+- Replacements walk the non-tree edges in increasing weight along their
+  tree paths. A union-find skips tree edges that were already assigned, so
+  each tree edge is visited once: O(E α(V)) overall.
+
+Each algorithm block of a result then gets::
+
+    "sensitivity": {
+      "tree_edges":     [{"from", "to", "weight", "max_weight", "tolerance", "replacement"}],
+      "non_tree_edges": [{"from", "to", "weight", "min_weight", "tolerance", "replaces"}]
+    }
+
+``tree_edges`` follows the order of ``mst_edges``. A tree edge stays in an
+MST while its weight is at most ``max_weight``; a non-tree edge can enter
+one once its weight falls to ``min_weight``. At exactly that weight the two
+trees tie. ``tolerance`` is the distance to that limit. It is null for
+bridges, which no road can replace, and for non-tree edges between two
+trees of the analysed forest, which have no tree path to cycle with.
+"""
+import argparse
+
+import numpy as np
+
+from json_stream import results_writer
+
+def tree_edge_ids(graph, mst):
+    """Positions in the graph's edge arrays of the tree edges, given as (u, v, weight) tuples.
+
+    Endpoint order does not matter. Parallel edges of equal weight are
+    matched one to one.
+    """
+    n = graph.vertex_count
+    src = np.asarray(graph.src, dtype=np.int64)
+    dst = np.asarray(graph.dst, dtype=np.int64)
+    weight = np.asarray(graph.weight, dtype=np.int64)
+    tree = np.asarray(mst, dtype=np.int64).reshape(-1, 3)
+    m = len(weight)
+
+    # Dense key per distinct (endpoint pair, weight), shared by graph and tree edges
+    pair = np.concatenate((np.minimum(src, dst) * n + np.maximum(src, dst),
+                           np.minimum(tree[:, 0], tree[:, 1]) * n + np.maximum(tree[:, 0], tree[:, 1])))
+    weights = np.concatenate((weight, tree[:, 2]))
+    order = np.lexsort((weights, pair))
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (np.diff(pair[order]) != 0) | (np.diff(weights[order]) != 0)
+    keys = np.empty(len(order), dtype=np.int64)
+    keys[order] = np.cumsum(starts) - 1
+    edge_keys, tree_keys = keys[:m], keys[m:]
+
+    # The k-th tree copy of a key takes the k-th graph edge with that key
+    edge_order = np.argsort(edge_keys, kind='stable')
+    sorted_edge_keys = edge_keys[edge_order]
+    tree_order = np.argsort(tree_keys, kind='stable')
+    sorted_tree_keys = tree_keys[tree_order]
+    occurrence = np.arange(len(tree_order)) - np.searchsorted(sorted_tree_keys, sorted_tree_keys)
+    positions = np.searchsorted(sorted_edge_keys, sorted_tree_keys) + occurrence
+    found = positions < m
+    found[found] = sorted_edge_keys[positions[found]] == sorted_tree_keys[found]
+    if not found.all():
+        raise ValueError(f'graph {graph.graph_id}: MST edge is not an edge of the graph')
+    ids = np.empty(len(tree_order), dtype=np.int64)
+    ids[tree_order] = edge_order[positions]
+    return ids
+
+def _root_forest(n, tree_src, tree_dst):
+    """Parent, parent edge (index into the tree arrays) and depth of every vertex, rooting each tree"""
+    heads = np.concatenate((tree_src, tree_dst))
+    order = np.argsort(heads, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(heads, minlength=n), out=indptr[1:])
+    neighbours = np.concatenate((tree_dst, tree_src))[order].tolist()
+    edges = np.tile(np.arange(len(tree_src)), 2)[order].tolist()
+    indptr = indptr.tolist()
+
+    parent = list(range(n))
+    parent_edge = [-1] * n
+    depth = [0] * n
+    seen = [False] * n
+    for root in range(n):
+        if seen[root]:
+            continue
+        seen[root] = True
+        stack = [root]
+        while stack:
+            x = stack.pop()
+            for k in range(indptr[x], indptr[x + 1]):
+                y = neighbours[k]
+                if not seen[y]:
+                    seen[y] = True
+                    parent[y] = x
+                    parent_edge[y] = edges[k]
+                    depth[y] = depth[x] + 1
+                    stack.append(y)
+    return parent, parent_edge, depth
+
+def _component_roots(parent):
+    """Root of every vertex's tree in a rooted forest, by pointer doubling"""
+    root = np.asarray(parent, dtype=np.int64)
+    while True:
+        jumped = root[root]
+        if np.array_equal(jumped, root):
+            return root
+        root = jumped
+
+def _take_max(best, arg, rows, nodes, level_max, level_arg):
+    """Fold the jump maxima of ``nodes`` into best/arg at ``rows``"""
+    candidate = level_max[nodes]
+    better = candidate > best[rows]
+    rows = rows[better]
+    best[rows] = candidate[better]
+    arg[rows] = level_arg[nodes[better]]
+
+def _path_maxima(parent, parent_edge, depth, tree_weight, queries_a, queries_b):
+    """Heaviest tree edge (weight, tree index) on the path between each query pair"""
+    parent = np.asarray(parent, dtype=np.int64)
+    parent_edge = np.asarray(parent_edge, dtype=np.int64)
+    depth = np.asarray(depth, dtype=np.int64)
+    levels = max(1, int(depth.max(initial=0)).bit_length())
+
+    up = [parent]
+    up_max = [np.append(tree_weight, -np.inf)[parent_edge]]  # Roots (parent_edge -1) get -inf
+    up_arg = [parent_edge]
+    for _ in range(1, levels):
+        prev, prev_max, prev_arg = up[-1], up_max[-1], up_arg[-1]
+        upper = prev_max[prev]
+        take_upper = upper > prev_max
+        up.append(prev[prev])
+        up_max.append(np.where(take_upper, upper, prev_max))
+        up_arg.append(np.where(take_upper, prev_arg[prev], prev_arg))
+
+    a = np.asarray(queries_a, dtype=np.int64).copy()
+    b = np.asarray(queries_b, dtype=np.int64).copy()
+    swap = depth[a] < depth[b]
+    a[swap], b[swap] = b[swap], a[swap]
+    best = np.full(len(a), -np.inf)
+    arg = np.full(len(a), -1, dtype=np.int64)
+    rows = np.arange(len(a))
+
+    # Lift the deeper endpoint to the depth of the other
+    diff = depth[a] - depth[b]
+    for level in range(levels):
+        sel = rows[(diff >> level) & 1 == 1]
+        _take_max(best, arg, sel, a[sel], up_max[level], up_arg[level])
+        a[sel] = up[level][a[sel]]
+
+    # Then lift both to just below their lowest common ancestor
+    for level in reversed(range(levels)):
+        next_a, next_b = up[level][a], up[level][b]
+        sel = rows[next_a != next_b]
+        _take_max(best, arg, sel, a[sel], up_max[level], up_arg[level])
+        _take_max(best, arg, sel, b[sel], up_max[level], up_arg[level])
+        a[sel] = next_a[sel]
+        b[sel] = next_b[sel]
+    sel = rows[a != b]
+    _take_max(best, arg, sel, a[sel], up_max[0], up_arg[0])
+    _take_max(best, arg, sel, b[sel], up_max[0], up_arg[0])
+    return best, arg
+
+def _replacements(parent, parent_edge, depth, non_tree_src, non_tree_dst, non_tree_weight):
+    """Lightest covering non-tree edge (index into the non-tree arrays) per tree edge, -1 for bridges.
+
+    Endpoints of every non-tree edge must lie in the same tree of the forest.
+    """
+    replacement = [-1] * sum(1 for e in parent_edge if e >= 0)
+    jump = list(range(len(parent)))  # Skips past vertices whose parent edge is assigned
+
+    def find(x):
+        while jump[x] != x:
+            jump[x] = jump[jump[x]]  # Path halving
+            x = jump[x]
+        return x
+
+    order = np.argsort(non_tree_weight, kind='stable').tolist()
+    non_tree_src = non_tree_src.tolist()
+    non_tree_dst = non_tree_dst.tolist()
+    for f in order:
+        x = find(non_tree_src[f])
+        y = find(non_tree_dst[f])
+        while x != y:
+            if depth[x] < depth[y]:
+                x, y = y, x
+            if parent_edge[x] < 0:
+                break  # Both are roots: the endpoints are in different trees
+            replacement[parent_edge[x]] = f
+            jump[x] = parent[x]
+            x = find(x)
+    return np.asarray(replacement, dtype=np.int64)
+
+def edge_limits(graph, tree_ids):
+    """Status-flip limit and partner edge for every edge of the graph, indexed by edge id.
+
+    For tree edges the limit is the replacement weight and the partner is
+    the replacement edge. For non-tree edges the limit is the path maximum
+    and the partner is the tree edge it would replace. Limits are NaN, and
+    partners -1, where no such edge exists, including non-tree edges that
+    join two trees of the forest (e.g. Prim's tree of a disconnected graph).
+    """
+    n = graph.vertex_count
+    src = np.asarray(graph.src, dtype=np.int64)
+    dst = np.asarray(graph.dst, dtype=np.int64)
+    weight = np.asarray(graph.weight, dtype=np.float64)
+    in_tree = np.zeros(len(weight), dtype=bool)
+    in_tree[tree_ids] = True
+    non_tree_ids = np.flatnonzero(~in_tree)
+
+    limit = np.full(len(weight), np.nan)
+    partner = np.full(len(weight), -1, dtype=np.int64)
+    if n == 0:
+        return limit, partner
+
+    parent, parent_edge, depth = _root_forest(n, src[tree_ids], dst[tree_ids])
+    root = _component_roots(parent)
+    non_tree_ids = non_tree_ids[root[src[non_tree_ids]] == root[dst[non_tree_ids]]]
+
+    path_max, path_arg = _path_maxima(parent, parent_edge, depth, weight[tree_ids],
+                                      src[non_tree_ids], dst[non_tree_ids])
+    reachable = path_arg >= 0  # Self-loops have an empty tree path
+    limit[non_tree_ids[reachable]] = path_max[reachable]
+    partner[non_tree_ids[reachable]] = tree_ids[path_arg[reachable]]
+
+    replacement = _replacements(parent, parent_edge, depth, src[non_tree_ids],
+                                dst[non_tree_ids], weight[non_tree_ids])
+    covered = replacement >= 0
+    replaced_by = non_tree_ids[replacement[covered]]
+    limit[tree_ids[covered]] = weight[replaced_by]
+    partner[tree_ids[covered]] = replaced_by
+    return limit, partner
+
+def _edge_records(names, src, dst, weight, edge_ids):
+    """from/to/weight dicts for ``edge_ids``, None where the id is -1"""
+    return [{'from': names[src[e]], 'to': names[dst[e]], 'weight': weight[e]} if e >= 0 else None
+            for e in edge_ids]
+
+def sensitivity_block(graph, tree_ids, limit, partner, names=None):
+    """Sensitivity records for one tree, in the order of ``tree_ids``"""
+    if names is None:
+        names = list(graph.names)
+    src = graph.src.tolist()
+    dst = graph.dst.tolist()
+    weight = graph.weight.tolist()
+    in_tree = np.zeros(graph.edge_count, dtype=bool)
+    in_tree[tree_ids] = True
+
+    def records(edge_ids, limit_field, partner_field):
+        bounds = limit[edge_ids]
+        known = ~np.isnan(bounds)
+        bound_values = np.where(known, bounds, 0).astype(np.int64)
+        tolerances = np.abs(bound_values - np.asarray(graph.weight)[edge_ids])
+        entries = _edge_records(names, src, dst, weight, edge_ids.tolist())
+        partners = _edge_records(names, src, dst, weight, partner[edge_ids].tolist())
+        for entry, is_known, bound, tolerance, other in zip(
+                entries, known.tolist(), bound_values.tolist(), tolerances.tolist(), partners):
+            entry[limit_field] = bound if is_known else None
+            entry['tolerance'] = tolerance if is_known else None
+            entry[partner_field] = other
+        return entries
+
+    return {
+        'tree_edges': records(np.asarray(tree_ids), 'max_weight', 'replacement'),
+        'non_tree_edges': records(np.flatnonzero(~in_tree), 'min_weight', 'replaces'),
+    }
+
+def add_sensitivity(result, graph):
+    """Attach a sensitivity block next to the mst_edges of every algorithm block in a result.
+
+    Algorithms that found the same tree share one computation.
+    """
+    names = list(graph.names)
+    vertex_ids = {name: i for i, name in enumerate(names)}
+    computed = {}
+    for algorithm in ('prim', 'kruskal'):
+        block = result.get(algorithm)
+        if block is None:
+            continue
+        mst = [(vertex_ids[e['from']], vertex_ids[e['to']], e['weight']) for e in block['mst_edges']]
+        tree_ids = tree_edge_ids(graph, mst)
+        key = np.sort(tree_ids).tobytes()
+        if key not in computed:
+            computed[key] = edge_limits(graph, tree_ids)
+        block['sensitivity'] = sensitivity_block(graph, tree_ids, *computed[key], names=names)
+    return result
+
+def analyze_file(input_file, output_file, results_file=None):
+    """Write results with sensitivity blocks for every graph in input_file.
+
+    With ``results_file`` (e.g. the Java output.json), its trees are
+    analyzed as they are; otherwise the graphs are solved first with the
+    NumPy engine. Returns the number of results written.
+    """
+    from mst_engine import iter_graph_results
+
+    with results_writer(output_file) as writer:
+        for graph, result in iter_graph_results(input_file, results_file):
+            writer.write(add_sensitivity(result, graph))
+            tree = result['kruskal']['sensitivity']['tree_edges']
+            bridges = sum(1 for entry in tree if entry['max_weight'] is None)
+            print(f"Graph {graph.graph_id}: {len(tree)} tree edges ({bridges} bridges), "
+                  f"{len(result['kruskal']['sensitivity']['non_tree_edges'])} non-tree edges")
+    return writer.count
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Weight tolerance of every edge with respect to the MST')
+    parser.add_argument('input', nargs='?', default='input.json',
+                        help='graphs in the input.json schema or a graph_store.py file '
+                             '(default: input.json)')
+    parser.add_argument('results', nargs='?',
+                        help='existing results for these graphs, e.g. from Main '
+                             '(default: solve them with mst_engine.py)')
+    parser.add_argument('-o', '--output', default='output_sensitivity.json',
+                        help='results with sensitivity blocks (default: output_sensitivity.json)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Analyze every graph in the input file"""
+    args = parse_args(argv)
+    count = analyze_file(args.input, args.output, args.results)
+    print(f"Sensitivity for {count} graph(s) saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -52,24 +52,7 @@ public class GraphDataLoader {
             MSTResult primResult = primResults.get(i);
             MSTResult kruskalResult = kruskalResults.get(i);
 
-            JsonObject resultObj = new JsonObject();
-            resultObj.addProperty("graph_id", graph.getGraphId());
-
-            // Input stats
-            JsonObject inputStats = new JsonObject();
-            inputStats.addProperty("vertices", graph.getVertexCount());
-            inputStats.addProperty("edges", graph.getEdgeCount());
-            resultObj.add("input_stats", inputStats);
-
-            // Prim results
-            JsonObject primObj = createAlgorithmResult(primResult);
-            resultObj.add("prim", primObj);
-
-            // Kruskal results
-            JsonObject kruskalObj = createAlgorithmResult(kruskalResult);
-            resultObj.add("kruskal", kruskalObj);
-
-            resultsArray.add(resultObj);
+            resultsArray.add(createResultObject(graph, primResult, kruskalResult));
         }
 
         root.add("results", resultsArray);
@@ -81,6 +64,36 @@ public class GraphDataLoader {
         }
     }
 
+    // Append one compact result line to a JSON Lines stream, flushed so readers see it right away
+    public static void appendResultJsonl(Writer writer, Graph graph,
+                                         MSTResult primResult,
+                                         MSTResult kruskalResult) throws IOException {
+        writer.write(new Gson().toJson(createResultObject(graph, primResult, kruskalResult)));
+        writer.write("\n");
+        writer.flush();
+    }
+
+    private static JsonObject createResultObject(Graph graph, MSTResult primResult, MSTResult kruskalResult) {
+        JsonObject resultObj = new JsonObject();
+        resultObj.addProperty("graph_id", graph.getGraphId());
+
+        // Input stats
+        JsonObject inputStats = new JsonObject();
+        inputStats.addProperty("vertices", graph.getVertexCount());
+        inputStats.addProperty("edges", graph.getEdgeCount());
+        resultObj.add("input_stats", inputStats);
+
+        // Prim results
+        JsonObject primObj = createAlgorithmResult(primResult);
+        resultObj.add("prim", primObj);
+
+        // Kruskal results
+        JsonObject kruskalObj = createAlgorithmResult(kruskalResult);
+        resultObj.add("kruskal", kruskalObj);
+
+        return resultObj;
+    }
+
     private static JsonObject createAlgorithmResult(MSTResult result) {
         JsonObject obj = new JsonObject();
 
@@ -99,6 +112,32 @@ public class GraphDataLoader {
         obj.addProperty("operations_count", result.getOperationsCount());
         obj.addProperty("execution_time_ms", Math.round(result.getExecutionTimeMs() * 100.0) / 100.0);
 
+        // Per-phase breakdown, only present when phase profiling was enabled
+        PhaseProfile phases = result.getPhases();
+        if (phases != null) {
+            JsonObject phasesObj = new JsonObject();
+            for (String phase : phases.getPhases()) {
+                JsonObject phaseObj = new JsonObject();
+                phaseObj.addProperty("count", phases.getCount(phase));
+                phaseObj.addProperty("time_ms", Math.round(phases.getTimeMs(phase) * 10000.0) / 10000.0);
+                phasesObj.add(phase, phaseObj);
+            }
+            obj.add("phases", phasesObj);
+        }
+
+        // Memory measured around the run, only present when memory profiling was enabled
+        MemoryProbe memory = result.getMemory();
+        if (memory != null) {
+            JsonObject memoryObj = new JsonObject();
+            if (memory.getAllocatedBytes() >= 0) {
+                memoryObj.addProperty("allocated_bytes", memory.getAllocatedBytes());
+            }
+            if (memory.getPeakRssBytes() >= 0) {
+                memoryObj.addProperty("peak_rss_bytes", memory.getPeakRssBytes());
+            }
+            obj.add("memory", memoryObj);
+        }
+
         return obj;
     }
 }
@@ -7,6 +7,7 @@ public class KruskalAlgorithm {
     private static class UnionFind {
         private final Map<String, String> parent;
         private final Map<String, Integer> rank;
+        private long findSteps; // Nodes visited by find: one per call plus one per parent hop
 
         public UnionFind(Set<String> vertices) {
             parent = new HashMap<>();
@@ -18,20 +19,15 @@ public class KruskalAlgorithm {
         }
 
         public String find(String vertex) {
+            findSteps++;
             if (!parent.get(vertex).equals(vertex)) {
                 parent.put(vertex, find(parent.get(vertex))); // Path compression
             }
             return parent.get(vertex);
         }
 
-        public boolean union(String vertex1, String vertex2) {
-            String root1 = find(vertex1);
-            String root2 = find(vertex2);
-
-            if (root1.equals(root2)) {
-                return false; // Already in same set
-            }
-
+        // Link two distinct roots returned by find
+        public void link(String root1, String root2) {
             // Union by rank
             int rank1 = rank.get(root1);
             int rank2 = rank.get(root2);
@@ -44,11 +40,26 @@ public class KruskalAlgorithm {
                 parent.put(root2, root1);
                 rank.put(root1, rank1 + 1);
             }
-            return true;
+        }
+
+        public long getFindSteps() {
+            return findSteps;
         }
     }
 
     public MSTResult findMST(Graph graph) {
+        return run(graph, null);
+    }
+
+    // Separate instrumented run, so the clock reads around each primitive
+    // never reach the execution time reported by findMST
+    public PhaseProfile profilePhases(Graph graph) {
+        PhaseProfile phases = new PhaseProfile("sort", "find", "union");
+        run(graph, phases);
+        return phases;
+    }
+
+    private MSTResult run(Graph graph, PhaseProfile phases) {
         operationsCount = 0;
         long startTime = System.nanoTime();
 
@@ -61,7 +72,11 @@ public class KruskalAlgorithm {
 
         // Sort all edges by weight
         List<Edge> sortedEdges = new ArrayList<>(graph.getEdges());
+        long sortStart = phases != null ? System.nanoTime() : 0;
         sortedEdges.sort(Edge::compareTo);
+        if (phases != null) {
+            phases.record("sort", sortedEdges.size(), System.nanoTime() - sortStart);
+        }
         operationsCount += sortedEdges.size() * Math.log(sortedEdges.size()); // Sorting complexity
 
         UnionFind uf = new UnionFind(graph.getVertices());
@@ -74,15 +89,24 @@ public class KruskalAlgorithm {
             String to = edge.getTo();
 
             // Count find operations
+            long findStart = phases != null ? System.nanoTime() : 0;
+            long stepsBefore = uf.getFindSteps();
             String root1 = uf.find(from);
             String root2 = uf.find(to);
+            if (phases != null) {
+                phases.record("find", uf.getFindSteps() - stepsBefore, System.nanoTime() - findStart);
+            }
             operationsCount += 2; // Two find operations
 
             if (!root1.equals(root2)) {
                 operationsCount++; // Comparison
                 mstEdges.add(edge);
                 totalCost += edge.getWeight();
-                uf.union(from, to);
+                long unionStart = phases != null ? System.nanoTime() : 0;
+                uf.link(root1, root2);
+                if (phases != null) {
+                    phases.record("union", 1, System.nanoTime() - unionStart);
+                }
                 operationsCount += 2; // Union operation counting
 
                 // Stop if we have V-1 edges
@@ -5,12 +5,36 @@ public class MSTResult {
     private final int totalCost;
     private final long operationsCount;
     private final double executionTimeMs;
+    private final PhaseProfile phases; // null unless phase profiling was enabled
+    private final MemoryProbe memory; // null unless memory profiling was enabled
 
     public MSTResult(List<Edge> mstEdges, int totalCost, long operationsCount, double executionTimeMs) {
+        this(mstEdges, totalCost, operationsCount, executionTimeMs, null);
+    }
+
+    public MSTResult(List<Edge> mstEdges, int totalCost, long operationsCount, double executionTimeMs,
+                     PhaseProfile phases) {
+        this(mstEdges, totalCost, operationsCount, executionTimeMs, phases, null);
+    }
+
+    public MSTResult(List<Edge> mstEdges, int totalCost, long operationsCount, double executionTimeMs,
+                     PhaseProfile phases, MemoryProbe memory) {
         this.mstEdges = mstEdges;
         this.totalCost = totalCost;
         this.operationsCount = operationsCount;
         this.executionTimeMs = executionTimeMs;
+        this.phases = phases;
+        this.memory = memory;
+    }
+
+    // Copy of this result carrying the phases of a separate instrumented run
+    public MSTResult withPhases(PhaseProfile phases) {
+        return new MSTResult(mstEdges, totalCost, operationsCount, executionTimeMs, phases, memory);
+    }
+
+    // Copy of this result carrying the memory measured around its run
+    public MSTResult withMemory(MemoryProbe memory) {
+        return new MSTResult(mstEdges, totalCost, operationsCount, executionTimeMs, phases, memory);
     }
 
     public List<Edge> getMstEdges() {
@@ -29,6 +53,14 @@ public class MSTResult {
         return executionTimeMs;
     }
 
+    public PhaseProfile getPhases() {
+        return phases;
+    }
+
+    public MemoryProbe getMemory() {
+        return memory;
+    }
+
     @Override
     public String toString() {
         StringBuilder sb = new StringBuilder();
@@ -39,6 +71,9 @@ public class MSTResult {
         sb.append("Total Cost: ").append(totalCost).append("\n");
         sb.append("Operations: ").append(operationsCount).append("\n");
         sb.append("Execution Time: ").append(String.format("%.2f", executionTimeMs)).append(" ms\n");
+        if (phases != null) {
+            sb.append("Phases:\n").append(phases);
+        }
         return sb.toString();
     }
 }
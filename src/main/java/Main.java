@@ -1,6 +1,10 @@
+import java.io.FileWriter;
 import java.io.IOException;
+import java.io.Writer;
 import java.util.ArrayList;
+import java.util.HashMap;
 import java.util.List;
+import java.util.Map;
 import java.util.logging.Logger;
 import java.util.logging.Level;
 
@@ -11,14 +15,30 @@ public class Main {
         try {
             System.out.println("=== City Transportation Network - MST Analysis ===\n");
 
-            // Load graphs from JSON
-            String inputFile = "input.json";
+            // Load graphs from JSON (optional arguments: [input file] [output file] [--phases] [--memory])
+            List<String> fileArgs = new ArrayList<>();
+            boolean profilePhases = false;
+            boolean profileMemory = false;
+            for (String arg : args) {
+                if (arg.equals("--phases")) {
+                    profilePhases = true;
+                } else if (arg.equals("--memory")) {
+                    profileMemory = true;
+                } else {
+                    fileArgs.add(arg);
+                }
+            }
+            String inputFile = fileArgs.size() > 0 ? fileArgs.get(0) : "input.json";
+            String outputFile = fileArgs.size() > 1 ? fileArgs.get(1) : "output.json";
             List<Graph> graphs = GraphDataLoader.loadGraphsFromJson(inputFile);
             System.out.println("Loaded " + graphs.size() + " graph(s) from " + inputFile + "\n");
 
             List<MSTResult> primResults = new ArrayList<>();
             List<MSTResult> kruskalResults = new ArrayList<>();
 
+            // A .jsonl output gets one line per graph as soon as it is solved
+            Writer jsonlWriter = outputFile.endsWith(".jsonl") ? new FileWriter(outputFile) : null;
+
             // Process each graph
             for (Graph graph : graphs) {
                 System.out.println("Processing Graph " + graph.getGraphId() + ":");
@@ -29,30 +49,52 @@ public class Main {
                 // Run Prim's Algorithm
                 System.out.println("\n--- Prim's Algorithm ---");
                 PrimAlgorithm prim = new PrimAlgorithm();
+                MemoryProbe primMemory = profileMemory ? MemoryProbe.start() : null;
                 MSTResult primResult = prim.findMST(graph);
+                if (primMemory != null) {
+                    primResult = primResult.withMemory(primMemory.stop());
+                }
+                if (profilePhases) {
+                    primResult = primResult.withPhases(prim.profilePhases(graph));
+                }
                 primResults.add(primResult);
                 printResult(primResult);
 
                 // Run Kruskal's Algorithm
                 System.out.println("\n--- Kruskal's Algorithm ---");
                 KruskalAlgorithm kruskal = new KruskalAlgorithm();
+                MemoryProbe kruskalMemory = profileMemory ? MemoryProbe.start() : null;
                 MSTResult kruskalResult = kruskal.findMST(graph);
+                if (kruskalMemory != null) {
+                    kruskalResult = kruskalResult.withMemory(kruskalMemory.stop());
+                }
+                if (profilePhases) {
+                    kruskalResult = kruskalResult.withPhases(kruskal.profilePhases(graph));
+                }
                 kruskalResults.add(kruskalResult);
                 printResult(kruskalResult);
 
                 // Comparison
                 System.out.println("\n--- Comparison ---");
                 System.out.println("  Total Cost Match: " + (primResult.getTotalCost() == kruskalResult.getTotalCost()));
+                System.out.println("  Edge Set Match: " + sameEdges(primResult, kruskalResult));
                 System.out.println("  Prim Operations: " + primResult.getOperationsCount());
                 System.out.println("  Kruskal Operations: " + kruskalResult.getOperationsCount());
                 System.out.println("  Prim Time: " + String.format("%.2f", primResult.getExecutionTimeMs()) + " ms");
                 System.out.println("  Kruskal Time: " + String.format("%.2f", kruskalResult.getExecutionTimeMs()) + " ms");
                 System.out.println("\n" + "=".repeat(60) + "\n");
+
+                if (jsonlWriter != null) {
+                    GraphDataLoader.appendResultJsonl(jsonlWriter, graph, primResult, kruskalResult);
+                }
             }
 
             // Save results to JSON
-            String outputFile = "output.json";
-            GraphDataLoader.saveResultsToJson(graphs, primResults, kruskalResults, outputFile);
+            if (jsonlWriter != null) {
+                jsonlWriter.close();
+            } else {
+                GraphDataLoader.saveResultsToJson(graphs, primResults, kruskalResults, outputFile);
+            }
             System.out.println("Results saved to " + outputFile);
 
         } catch (IOException e) {
@@ -61,6 +103,18 @@ public class Main {
         }
     }
 
+    // Equal weights can be broken differently, so two valid MSTs may still differ
+    private static boolean sameEdges(MSTResult first, MSTResult second) {
+        Map<Edge, Integer> counts = new HashMap<>();
+        for (Edge edge : first.getMstEdges()) {
+            counts.merge(edge, 1, Integer::sum);
+        }
+        for (Edge edge : second.getMstEdges()) {
+            counts.merge(edge, -1, Integer::sum);
+        }
+        return counts.values().stream().allMatch(count -> count == 0);
+    }
+
     private static void printResult(MSTResult result) {
         System.out.println("  MST Edges:");
         for (Edge edge : result.getMstEdges()) {
@@ -70,5 +124,20 @@ public class Main {
         System.out.println("  Total Cost: " + result.getTotalCost());
         System.out.println("  Operations: " + result.getOperationsCount());
         System.out.println("  Execution Time: " + String.format("%.2f", result.getExecutionTimeMs()) + " ms");
+        if (result.getPhases() != null) {
+            PhaseProfile phases = result.getPhases();
+            System.out.println("  Phases:");
+            for (String phase : phases.getPhases()) {
+                System.out.println("    " + phase + ": " + phases.getCount(phase) + " ops, " +
+                                 String.format("%.4f", phases.getTimeMs(phase)) + " ms");
+            }
+        }
+        MemoryProbe memory = result.getMemory();
+        if (memory != null) {
+            System.out.println("  Allocated: " + memory.getAllocatedBytes() + " bytes");
+            if (memory.getPeakRssBytes() >= 0) {
+                System.out.println("  Peak RSS Growth: " + memory.getPeakRssBytes() + " bytes");
+            }
+        }
     }
 }
@@ -0,0 +1,84 @@
+import java.io.IOException;
+import java.lang.management.ManagementFactory;
+import java.lang.management.ThreadMXBean;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+
+public class MemoryProbe {
+    private static final Path PROC_STATUS = Paths.get("/proc/self/status");
+    private static final Path PROC_CLEAR_REFS = Paths.get("/proc/self/clear_refs");
+
+    private final long startAllocatedBytes;
+    private final long startRssKb; // -1 when the resident high-water mark cannot be reset
+    private long allocatedBytes = -1;
+    private long peakRssBytes = -1;
+
+    private MemoryProbe() {
+        System.gc();
+        startRssKb = resetResidentPeak() ? readStatusKb("VmRSS") : -1;
+        startAllocatedBytes = threadAllocatedBytes();
+    }
+
+    // Start measuring the current thread; call stop() after the algorithm run
+    public static MemoryProbe start() {
+        return new MemoryProbe();
+    }
+
+    public MemoryProbe stop() {
+        long endAllocatedBytes = threadAllocatedBytes();
+        if (startAllocatedBytes >= 0 && endAllocatedBytes >= 0) {
+            allocatedBytes = endAllocatedBytes - startAllocatedBytes;
+        }
+        if (startRssKb >= 0) {
+            long peakKb = readStatusKb("VmHWM");
+            if (peakKb >= 0) {
+                peakRssBytes = Math.max(0, peakKb - startRssKb) * 1024;
+            }
+        }
+        return this;
+    }
+
+    // Bytes allocated on this thread during the run, or -1 if the JVM does not track them
+    public long getAllocatedBytes() {
+        return allocatedBytes;
+    }
+
+    // Growth of the resident high-water mark during the run, or -1 outside Linux
+    public long getPeakRssBytes() {
+        return peakRssBytes;
+    }
+
+    private static long threadAllocatedBytes() {
+        ThreadMXBean bean = ManagementFactory.getThreadMXBean();
+        if (bean instanceof com.sun.management.ThreadMXBean sunBean
+                && sunBean.isThreadAllocatedMemorySupported()
+                && sunBean.isThreadAllocatedMemoryEnabled()) {
+            return sunBean.getCurrentThreadAllocatedBytes();
+        }
+        return -1;
+    }
+
+    private static boolean resetResidentPeak() {
+        try {
+            Files.write(PROC_CLEAR_REFS, "5".getBytes(StandardCharsets.US_ASCII));
+            return true;
+        } catch (IOException | SecurityException e) {
+            return false;
+        }
+    }
+
+    private static long readStatusKb(String field) {
+        try {
+            for (String line : Files.readAllLines(PROC_STATUS)) {
+                if (line.startsWith(field + ":")) {
+                    return Long.parseLong(line.replaceAll("[^0-9]", ""));
+                }
+            }
+        } catch (IOException | SecurityException | NumberFormatException e) {
+            return -1;
+        }
+        return -1;
+    }
+}
@@ -0,0 +1,42 @@
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.Set;
+
+public class PhaseProfile {
+    // Phase name -> {event count, elapsed nanoseconds}, in recording order
+    private final Map<String, long[]> phases = new LinkedHashMap<>();
+
+    public PhaseProfile(String... names) {
+        for (String name : names) {
+            phases.put(name, new long[2]);
+        }
+    }
+
+    public void record(String phase, long count, long nanos) {
+        long[] totals = phases.get(phase);
+        totals[0] += count;
+        totals[1] += nanos;
+    }
+
+    public Set<String> getPhases() {
+        return phases.keySet();
+    }
+
+    public long getCount(String phase) {
+        return phases.get(phase)[0];
+    }
+
+    public double getTimeMs(String phase) {
+        return phases.get(phase)[1] / 1_000_000.0;
+    }
+
+    @Override
+    public String toString() {
+        StringBuilder sb = new StringBuilder();
+        for (String phase : phases.keySet()) {
+            sb.append("  ").append(phase).append(": ").append(getCount(phase))
+              .append(" ops, ").append(String.format("%.4f", getTimeMs(phase))).append(" ms\n");
+        }
+        return sb.toString();
+    }
+}
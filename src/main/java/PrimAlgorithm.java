@@ -2,8 +2,24 @@ import java.util.*;
 
 public class PrimAlgorithm {
     private long operationsCount;
+    private PhaseProfile phases; // Per-phase counts and times, null outside profilePhases
 
     public MSTResult findMST(Graph graph) {
+        phases = null;
+        return run(graph);
+    }
+
+    // Separate instrumented run, so the clock reads around each primitive
+    // never reach the execution time reported by findMST
+    public PhaseProfile profilePhases(Graph graph) {
+        phases = new PhaseProfile("heap_push", "heap_pop", "visited");
+        run(graph);
+        PhaseProfile profile = phases;
+        phases = null;
+        return profile;
+    }
+
+    private MSTResult run(Graph graph) {
         operationsCount = 0;
         long startTime = System.nanoTime();
 
@@ -22,14 +38,14 @@ public class PrimAlgorithm {
 
         // Add all edges from start vertex to priority queue
         for (Edge edge : graph.getAdjacentEdges(startVertex)) {
-            priorityQueue.offer(edge);
+            offer(priorityQueue, edge);
             operationsCount++; // Queue insertion
         }
 
         int totalCost = 0;
 
         while (!priorityQueue.isEmpty() && visited.size() < graph.getVertexCount()) {
-            Edge currentEdge = priorityQueue.poll();
+            Edge currentEdge = poll(priorityQueue);
             operationsCount++; // Queue removal
 
             String from = currentEdge.getFrom();
@@ -37,16 +53,16 @@ public class PrimAlgorithm {
             operationsCount++; // Comparison operation
 
             // Skip if both vertices are already visited
-            if (visited.contains(from) && visited.contains(to)) {
+            if (isVisited(visited, from) && isVisited(visited, to)) {
                 operationsCount++; // Set lookup operations
                 continue;
             }
 
             // Determine which vertex is new
-            String newVertex = visited.contains(from) ? to : from;
+            String newVertex = isVisited(visited, from) ? to : from;
             operationsCount++; // Set lookup and conditional
 
-            if (!visited.contains(newVertex)) {
+            if (!isVisited(visited, newVertex)) {
                 operationsCount++; // Set lookup
                 visited.add(newVertex);
                 mstEdges.add(currentEdge);
@@ -57,9 +73,9 @@ public class PrimAlgorithm {
                 for (Edge edge : graph.getAdjacentEdges(newVertex)) {
                     operationsCount++; // Iteration
                     String neighbor = edge.getTo();
-                    if (!visited.contains(neighbor)) {
+                    if (!isVisited(visited, neighbor)) {
                         operationsCount++; // Set lookup
-                        priorityQueue.offer(edge);
+                        offer(priorityQueue, edge);
                         operationsCount++; // Queue insertion
                     } else {
                         operationsCount++; // Set lookup
@@ -74,6 +90,38 @@ public class PrimAlgorithm {
         return new MSTResult(mstEdges, totalCost, operationsCount, executionTimeMs);
     }
 
+    // Primitive operations, timed individually when profiling phases
+
+    private void offer(PriorityQueue<Edge> queue, Edge edge) {
+        if (phases == null) {
+            queue.offer(edge);
+            return;
+        }
+        long start = System.nanoTime();
+        queue.offer(edge);
+        phases.record("heap_push", 1, System.nanoTime() - start);
+    }
+
+    private Edge poll(PriorityQueue<Edge> queue) {
+        if (phases == null) {
+            return queue.poll();
+        }
+        long start = System.nanoTime();
+        Edge edge = queue.poll();
+        phases.record("heap_pop", 1, System.nanoTime() - start);
+        return edge;
+    }
+
+    private boolean isVisited(Set<String> visited, String vertex) {
+        if (phases == null) {
+            return visited.contains(vertex);
+        }
+        long start = System.nanoTime();
+        boolean seen = visited.contains(vertex);
+        phases.record("visited", 1, System.nanoTime() - start);
+        return seen;
+    }
+
     public long getOperationsCount() {
         return operationsCount;
     }
@@ -184,6 +184,31 @@ public class MSTAlgorithmTest {
                   "Kruskal should complete in reasonable time");
     }
 
+    @Test
+    @DisplayName("Test 12: Phase profile counts match the MST")
+    public void testPhaseProfile() {
+        Graph graph = createMediumGraph();
+
+        PhaseProfile primPhases = prim.profilePhases(graph);
+        PhaseProfile kruskalPhases = kruskal.profilePhases(graph);
+
+        assertNull(prim.findMST(graph).getPhases(), "findMST should not record phases");
+        assertNull(kruskal.findMST(graph).getPhases(), "findMST should not record phases");
+
+        assertTrue(primPhases.getCount("heap_pop") >= graph.getVertexCount() - 1,
+                  "Every MST edge leaves the heap");
+        assertTrue(primPhases.getCount("heap_push") >= primPhases.getCount("heap_pop"),
+                  "Cannot pop more edges than were pushed");
+        assertTrue(primPhases.getCount("visited") > 0, "Visited lookups should be counted");
+
+        assertEquals(graph.getVertexCount() - 1, kruskalPhases.getCount("union"),
+                    "Kruskal links exactly V-1 times");
+        assertEquals(graph.getEdgeCount(), kruskalPhases.getCount("sort"),
+                    "Sort counts the edges sorted");
+        assertTrue(kruskalPhases.getCount("find") >= 2 * kruskalPhases.getCount("union"),
+                  "Every union is preceded by two finds");
+    }
+
     // Helper methods
 
     private Graph createSmallGraph() {
@@ -0,0 +1,35 @@
+"""Regression tests for auto_select.py"""
+import json
+
+import numpy as np
+
+from auto_select import solve_selected
+from certify import check_status
+from mst_engine import IndexedGraph
+from visualize_complexity import load_columns
+
+# Prim predicted faster below density 0.5, Kruskal above
+MODEL = {'source': 'numpy', 'algorithms': {
+    'prim': {'terms': ['density'], 'intercept': 0.0, 'coefficients': [2.0]},
+    'kruskal': {'terms': [], 'intercept': 1.0, 'coefficients': []},
+}}
+
+def _graph(graph_id, edges):
+    """IndexedGraph from (from, to, weight) tuples"""
+    return IndexedGraph.from_json({'id': graph_id, 'edges': [
+        {'from': u, 'to': v, 'weight': w} for u, v, w in edges]})
+
+def test_dispatched_results_load(tmp_path):
+    """Records with only the picked engine's block go through the column readers and certify.py"""
+    sparse = _graph(1, [('A', 'B', 1), ('B', 'C', 2), ('C', 'D', 3), ('D', 'E', 4)])
+    dense = _graph(2, [('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 5)])
+    results = [solve_selected(sparse, MODEL), solve_selected(dense, MODEL)]
+    assert [sorted(set(r) & {'prim', 'kruskal'}) for r in results] == [['prim'], ['kruskal']]
+    assert [check_status(r) for r in results] == [0, 0]
+
+    filename = tmp_path / 'output_auto.json'
+    filename.write_text(json.dumps({'results': results}))
+    data = load_columns(filename)
+    np.testing.assert_array_equal(data['prim_ops'], [results[0]['prim']['operations_count'], np.nan])
+    np.testing.assert_array_equal(data['kruskal_ops'], [np.nan, results[1]['kruskal']['operations_count']])
+    assert data['total_costs'].tolist() == [10, 3]
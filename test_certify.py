@@ -0,0 +1,20 @@
+"""Regression tests for certify.py"""
+from certify import CERTIFIED, INVALID, certify_result, check_status
+from mst_engine import IndexedGraph, solve_graph
+
+def _graph(edges):
+    """IndexedGraph from (from, to, weight) tuples"""
+    return IndexedGraph.from_json({'id': 1, 'edges': [
+        {'from': u, 'to': v, 'weight': w} for u, v, w in edges]})
+
+def test_single_engine_result():
+    """A record with one algorithm block, as auto_select.py writes, is certified on its own"""
+    graph = _graph([('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 5)])
+    result = solve_graph(graph)
+    del result['prim']
+    assert check_status(result) == 0
+    assert check_status(certify_result(result, graph)) == CERTIFIED
+
+    result['kruskal']['mst_edges'][1] = {'from': 'A', 'to': 'C', 'weight': 5}
+    result['kruskal']['total_cost'] = 6
+    assert check_status(certify_result(result, graph)) == INVALID
@@ -0,0 +1,33 @@
+"""Regression tests for sensitivity.py"""
+import numpy as np
+
+from mst_engine import IndexedGraph, solve_graph
+from sensitivity import add_sensitivity, edge_limits, tree_edge_ids
+
+def _graph(edges):
+    """IndexedGraph from (from, to, weight) tuples"""
+    return IndexedGraph.from_json({'id': 1, 'edges': [
+        {'from': u, 'to': v, 'weight': w} for u, v, w in edges]})
+
+def test_disconnected_graph_prim_tree():
+    """Prim spans only the start component; the edge joining the other one has no tree path"""
+    graph = _graph([('A', 'B', 1), ('C', 'D', 2)])
+    result = add_sensitivity(solve_graph(graph), graph)
+
+    prim = result['prim']['sensitivity']
+    assert [(e['from'], e['to'], e['max_weight']) for e in prim['tree_edges']] == [('A', 'B', None)]
+    assert prim['non_tree_edges'] == [{'from': 'C', 'to': 'D', 'weight': 2, 'min_weight': None,
+                                       'tolerance': None, 'replaces': None}]
+
+    kruskal = result['kruskal']['sensitivity']
+    assert [e['max_weight'] for e in kruskal['tree_edges']] == [None, None]
+    assert kruskal['non_tree_edges'] == []
+
+def test_cross_tree_edges_leave_other_replacements_intact():
+    """Edges between trees of the forest neither hang nor overwrite the last tree edge's replacement"""
+    graph = _graph([('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 5), ('D', 'E', 1), ('C', 'D', 3)])
+    tree_ids = tree_edge_ids(graph, [(0, 1, 1), (1, 2, 2), (3, 4, 1)])
+    limit, partner = edge_limits(graph, tree_ids)
+
+    np.testing.assert_array_equal(limit, [5, 5, 2, np.nan, np.nan])
+    np.testing.assert_array_equal(partner, [2, 2, 1, -1, -1])
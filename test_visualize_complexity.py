@@ -0,0 +1,28 @@
+"""Regression tests for visualize_complexity.py"""
+import json
+
+import numpy as np
+
+from mst_engine import solve_graph
+from visualize_complexity import dataset_summary, load_columns, stats_records
+
+def test_kruskal_only_record(tmp_path):
+    """A record without a Prim block, as external_kruskal.py writes, loads as NaN Prim columns"""
+    result = solve_graph({'id': 7, 'edges': [{'from': 'A', 'to': 'B', 'weight': 1},
+                                             {'from': 'B', 'to': 'C', 'weight': 2},
+                                             {'from': 'A', 'to': 'C', 'weight': 5}]})
+    del result['prim']
+    filename = tmp_path / 'output.json'
+    filename.write_text(json.dumps({'results': [result]}))
+
+    data = load_columns(filename)
+    assert data['graph_ids'].tolist() == [7]
+    assert data['total_costs'].tolist() == [3]
+    assert data['kruskal_ops'].tolist() == [result['kruskal']['operations_count']]
+    assert np.isnan(data['prim_ops']).all() and np.isnan(data['prim_time']).all()
+
+    summary = dataset_summary(data)
+    assert summary['prim']['total_operations'] is None
+    assert summary['kruskal']['total_operations'] == result['kruskal']['operations_count']
+    record, = stats_records(data)
+    assert record['prim_ops'] is None and record['winner'] == '-'
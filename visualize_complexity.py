@@ -1,57 +1,483 @@
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import importlib
 import json
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+import os
+import sys
+import time
+import zipfile
 import numpy as np
 from pathlib import Path
 
+from boruvka_scaling import MAX_SCALING_POINTS, scaling_times
+from certify import CHECK_LABELS, PROBLEMS, check_label, check_status
+from complexity_fit import CANDIDATE_MODELS, describe, fit_all, predict, write_fits
+from json_stream import is_json_lines, iter_results, read_json_lines
+from phase_profile import PHASES
+
+class _LazyModule:
+    """Stand-in that imports a module on first attribute access.
+
+    matplotlib is only needed once a figure is drawn; deferring it keeps
+    --stats runs and tools that only load columns fast to start.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            importlib.import_module('matplotlib').use('Agg')  # Use non-interactive backend
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+matplotlib = _LazyModule('matplotlib')
+plt = _LazyModule('matplotlib.pyplot')
+backend_pdf = _LazyModule('matplotlib.backends.backend_pdf')
+
+# Numeric columns extracted from each result record, in plotting order
+RESULT_COLUMNS = (
+    ('graph_ids', np.int64),
+    ('vertices', np.int64),
+    ('edges', np.int64),
+    # Operation counts and times are NaN for an algorithm whose block the
+    # record lacks (auto_select.py and external_kruskal.py write one block)
+    ('prim_ops', np.float64),
+    ('kruskal_ops', np.float64),
+    ('prim_time', np.float64),
+    ('kruskal_time', np.float64),
+    ('total_costs', np.int64),
+    # 95% confidence interval of the median time, NaN for single-sample results
+    ('prim_time_ci_low', np.float64),
+    ('prim_time_ci_high', np.float64),
+    ('kruskal_time_ci_low', np.float64),
+    ('kruskal_time_ci_high', np.float64),
+    # Per-phase counts and times from mst_engine.py --phases, NaN when absent
+    *((f'{algorithm}_{phase}_{field}', np.float64)
+      for algorithm, phases in PHASES.items() for phase in phases for field in ('count', 'ms')),
+    # Peak allocated and resident bytes from mst_engine.py --memory, NaN when absent
+    ('prim_memory', np.float64),
+    ('kruskal_memory', np.float64),
+    ('prim_rss', np.float64),
+    ('kruskal_rss', np.float64),
+    # Total bytes the JVM allocated during the run (Main --memory), NaN when absent
+    ('prim_jvm_allocated', np.float64),
+    ('kruskal_jvm_allocated', np.float64),
+    # certify.check_status bits: Prim/Kruskal disagreement and certificate outcome
+    ('mst_check', np.int64),
+    # parallel_boruvka.py: time with the most workers, then each (workers, time)
+    # scaling entry by increasing worker count, NaN when absent
+    ('boruvka_time', np.float64),
+    *((f'boruvka_{field}_{point}', np.float64)
+      for point in range(MAX_SCALING_POINTS) for field in ('workers', 'ms')),
+)
+
+# Bump whenever RESULT_COLUMNS or the extraction logic changes so that
+# cached columns written by an older version are rebuilt
+CACHE_SCHEMA_VERSION = 9
+CACHE_DIR = '.analysis_cache'
+
+# Output settings for each rendering profile. 'bundle' writes every figure
+# as a page of one PDF instead of separate files.
+RENDER_PROFILES = {
+    'standard': {'format': 'png', 'dpi': 300},
+    'preview': {'format': 'png', 'dpi': 72},
+    'svg': {'format': 'svg', 'dpi': 72},
+    'pdf': {'format': 'pdf', 'dpi': 72},
+    'bundle': {'format': 'pdf', 'dpi': 72, 'bundle': 'analysis_report.pdf'},
+}
+
+# Above this many graphs, 'auto' plot mode switches from one mark per graph
+# to binned/quantile summaries and the summary table keeps only the top rows
+DETAILED_PLOT_LIMIT = 200
+SUMMARY_TABLE_ROWS = 25
+# Graph id labels under the per-graph phase bars, so they stay legible up to DETAILED_PLOT_LIMIT
+PHASE_BAR_TICKS = 16
+AGGREGATE_BINS = 30
+
+def _result_row(result):
+    """Pick the plotted values out of a single result record, NaN for a missing algorithm block"""
+    prim = result.get('prim', {})
+    kruskal = result.get('kruskal', {})
+    prim_timing = prim.get('timing', {})
+    kruskal_timing = kruskal.get('timing', {})
+    return (
+        result['graph_id'],
+        result['input_stats']['vertices'],
+        result['input_stats']['edges'],
+        prim.get('operations_count', np.nan),
+        kruskal.get('operations_count', np.nan),
+        prim.get('execution_time_ms', np.nan),
+        kruskal.get('execution_time_ms', np.nan),
+        prim['total_cost'] if prim else kruskal['total_cost'],
+        prim_timing.get('ci95_low_ms', np.nan),
+        prim_timing.get('ci95_high_ms', np.nan),
+        kruskal_timing.get('ci95_low_ms', np.nan),
+        kruskal_timing.get('ci95_high_ms', np.nan),
+    ) + tuple(_phase_values(result)) + _memory_values(prim, kruskal) + (check_status(result),) \
+        + _boruvka_values(result)
+
+def _boruvka_values(result):
+    """Borůvka time with the most workers, then (workers, time) per scaling entry, NaN-padded"""
+    boruvka = result.get('boruvka', {})
+    times = scaling_times(boruvka)[:MAX_SCALING_POINTS]
+    times += [(np.nan, np.nan)] * (MAX_SCALING_POINTS - len(times))
+    return (boruvka.get('execution_time_ms', np.nan),) + tuple(value for point in times for value in point)
+
+def _phase_values(result):
+    """Per-phase count and time_ms in RESULT_COLUMNS order, NaN where not recorded"""
+    for algorithm, phases in PHASES.items():
+        breakdown = result.get(algorithm, {}).get('phases', {})
+        for phase in phases:
+            entry = breakdown.get(phase, {})
+            yield entry.get('count', np.nan)
+            yield entry.get('time_ms', np.nan)
+
+def _memory_values(prim, kruskal):
+    """Peak allocated, resident and JVM-allocated bytes per algorithm, NaN where not recorded.
+
+    Java's ``allocated_bytes`` is a running total of allocations, not a peak
+    of live memory, so it has columns of its own.
+    """
+    blocks = (prim.get('memory', {}), kruskal.get('memory', {}))
+    return tuple(block.get(field, np.nan)
+                 for field in ('peak_allocated_bytes', 'peak_rss_bytes', 'allocated_bytes')
+                 for block in blocks)
+
+def _fill_columns(results, capacity=1024):
+    """Fill preallocated NumPy columns from an iterable of result records"""
+    columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in RESULT_COLUMNS}
+    count = 0
+
+    for result in results:
+        if count == capacity:
+            capacity *= 2
+            for name in columns:
+                columns[name].resize(capacity, refcheck=False)
+        for (name, _), value in zip(RESULT_COLUMNS, _result_row(result)):
+            columns[name][count] = value
+        count += 1
+
+    for name in columns:
+        columns[name].resize(count, refcheck=False)
+    return columns
+
 def load_results(filename):
-    """Load results from JSON file"""
-    with open(filename, 'r') as f:
-        data = json.load(f)
-    return data['results']
+    """Load results from an output.json document or a JSON Lines stream"""
+    return list(iter_results(filename))
+
+def load_columns(filename):
+    """Stream results from JSON file straight into NumPy columns.
+
+    Records are decoded one at a time and their ``mst_edges`` arrays are
+    dropped immediately, so memory is bounded by the extracted columns
+    rather than by the size of the JSON document.
+    """
+    return _fill_columns(iter_results(filename))
+
+def _file_digest(filename, chunk_size=1 << 20):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_cached_columns(cache_path, digest):
+    """Return cached columns, or None if the entry is missing, stale or corrupt"""
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if (str(cached['source_digest']) != digest or
+                    int(cached['schema_version']) != CACHE_SCHEMA_VERSION):
+                return None
+            columns = {name: cached[name] for name, _ in RESULT_COLUMNS}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+    lengths = {len(column) for column in columns.values()}
+    dtypes_match = all(columns[name].dtype == dtype for name, dtype in RESULT_COLUMNS)
+    if len(lengths) != 1 or not dtypes_match:
+        return None
+    return columns
+
+def _write_cached_columns(cache_path, digest, columns):
+    """Atomically write columns to the cache and drop older entries for the same source path"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, source_digest=digest,
+                 schema_version=CACHE_SCHEMA_VERSION, **columns)
+    os.replace(tmp_path, cache_path)
+
+    # Entries are named <stem>-<path hash>-<content digest>-v<schema>
+    prefix = '-'.join(cache_path.name.split('-')[:2]) + '-'
+    for old_entry in cache_path.parent.glob(prefix + '*.npz'):
+        if old_entry != cache_path:
+            old_entry.unlink(missing_ok=True)
+
+class ResultsTail:
+    """Columns of a results file that is still being written.
+
+    JSON Lines streams are read on from the last complete line, so each
+    poll parses only the records appended since the previous one. A
+    ``{"results": [...]}`` document is only valid once its writer closes
+    it; it is reloaded whenever it changes and parses.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.columns = _fill_columns((), capacity=0)
+        self._offset = 0
+        self._stamp = None
+
+    def poll(self):
+        """Pick up records written since the last poll and return how many were added"""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return 0
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return 0
+        self._stamp = stamp
+
+        if is_json_lines(self.filename):
+            if stat.st_size < self._offset:  # Rewritten from scratch
+                self.columns = _fill_columns((), capacity=0)
+                self._offset = 0
+            records, self._offset = read_json_lines(self.filename, self._offset)
+            if not records:
+                return 0
+            new = _fill_columns(records, capacity=len(records))
+            self.columns = {name: np.concatenate((self.columns[name], new[name]))
+                            for name in self.columns}
+            return len(records)
+
+        try:
+            columns = load_columns(self.filename)
+        except ValueError:
+            return 0  # Document not finished yet
+        added = len(columns['graph_ids']) - len(self.columns['graph_ids'])
+        self.columns = columns
+        return max(added, 0)
+
+def load_columns_cached(filename, cache_dir=CACHE_DIR):
+    """Load result columns, reusing a binary .npz cache when the source is unchanged.
+
+    Cache entries are keyed by the resolved path of the results file, the
+    SHA-256 of its contents and CACHE_SCHEMA_VERSION, so same-named files
+    in different directories keep separate entries; entries that fail
+    validation are rebuilt.
+    """
+    digest = _file_digest(filename)
+    stem = Path(filename).stem.replace('-', '_')
+    path_hash = hashlib.sha256(str(Path(filename).resolve()).encode()).hexdigest()[:12]
+    cache_path = Path(cache_dir) / f'{stem}-{path_hash}-{digest[:16]}-v{CACHE_SCHEMA_VERSION}.npz'
+
+    columns = _read_cached_columns(cache_path, digest)
+    if columns is not None:
+        return columns
+
+    columns = load_columns(filename)
+    try:
+        _write_cached_columns(cache_path, digest, columns)
+    except OSError as e:
+        print(f"Warning: could not write column cache {cache_path}: {e}")
+    return columns
 
 def extract_data(results):
     """Extract data for plotting"""
-    graph_ids = []
-    vertices = []
-    edges = []
+    return _fill_columns(results, capacity=max(len(results), 1))
 
-    prim_ops = []
-    kruskal_ops = []
-    prim_time = []
-    kruskal_time = []
-    total_costs = []
+# Active rendering profile and, for 'bundle', the open multi-page PDF
+_render_profile = RENDER_PROFILES['standard']
+_pdf_bundle = None
 
-    for result in results:
-        graph_ids.append(result['graph_id'])
-        vertices.append(result['input_stats']['vertices'])
-        edges.append(result['input_stats']['edges'])
-
-        prim_ops.append(result['prim']['operations_count'])
-        kruskal_ops.append(result['kruskal']['operations_count'])
-        prim_time.append(result['prim']['execution_time_ms'])
-        kruskal_time.append(result['kruskal']['execution_time_ms'])
-        total_costs.append(result['prim']['total_cost'])
-
-    return {
-        'graph_ids': graph_ids,
-        'vertices': vertices,
-        'edges': edges,
-        'prim_ops': prim_ops,
-        'kruskal_ops': kruskal_ops,
-        'prim_time': prim_time,
-        'kruskal_time': kruskal_time,
-        'total_costs': total_costs
-    }
+def set_render_profile(name):
+    """Select how _save_figure writes figures in this process"""
+    global _render_profile
+    _render_profile = RENDER_PROFILES[name]
+    if _render_profile['format'] != 'png':
+        # Keep text as text so vector output stays small and searchable
+        matplotlib.rcParams['svg.fonttype'] = 'none'
+        matplotlib.rcParams['pdf.fonttype'] = 42
+
+def _metadata(file_format):
+    """Figure metadata with timestamps removed so reruns produce identical files"""
+    return {'pdf': {'CreationDate': None}, 'svg': {'Date': None}}.get(file_format)
+
+def _save_figure(output_dir, name):
+    """Write the current figure according to the active rendering profile"""
+    if _pdf_bundle is not None:
+        _pdf_bundle.savefig(bbox_inches='tight')
+        print(f"Added: {name} to {output_dir}/{_render_profile['bundle']}")
+    else:
+        file_format = _render_profile['format']
+        filename = f'{output_dir}/{name}.{file_format}'
+        plt.savefig(filename, dpi=_render_profile['dpi'], bbox_inches='tight',
+                    metadata=_metadata(file_format))
+        print(f"Saved: {filename}")
+    plt.close()
+
+def _aggregate_mode(data, mode):
+    """Whether plots should summarize graphs instead of drawing one mark per graph"""
+    if mode == 'auto':
+        return len(data['graph_ids']) > DETAILED_PLOT_LIMIT
+    return mode == 'aggregate'
+
+def _time_errors(data, algorithm):
+    """Asymmetric error bars from the timing confidence interval, or None without trials"""
+    low = np.asarray(data[f'{algorithm}_time_ci_low'], dtype=np.float64)
+    high = np.asarray(data[f'{algorithm}_time_ci_high'], dtype=np.float64)
+    if len(low) == 0 or np.isnan(low).any() or np.isnan(high).any():
+        return None
+    centre = np.asarray(data[f'{algorithm}_time'], dtype=np.float64)
+    return np.vstack((np.clip(centre - low, 0, None), np.clip(high - centre, 0, None)))
+
+def time_winner(data, i):
+    """Faster algorithm for graph i, 'Tie' when the confidence intervals overlap, '-' without both times"""
+    if np.isnan([data['prim_time'][i], data['kruskal_time'][i]]).any():
+        return '-'
+    prim_low, prim_high = data['prim_time_ci_low'][i], data['prim_time_ci_high'][i]
+    kruskal_low, kruskal_high = data['kruskal_time_ci_low'][i], data['kruskal_time_ci_high'][i]
+    if np.isnan([prim_low, prim_high, kruskal_low, kruskal_high]).any():
+        return 'Prim' if data['prim_time'][i] <= data['kruskal_time'][i] else 'Kruskal'
+    if prim_high < kruskal_low:
+        return 'Prim'
+    if kruskal_high < prim_low:
+        return 'Kruskal'
+    return 'Tie'
+
+def time_winners(data):
+    """time_winner for every graph at once, as an array of 'Prim', 'Kruskal', 'Tie' or '-'"""
+    prim_time = np.asarray(data['prim_time'], dtype=np.float64)
+    kruskal_time = np.asarray(data['kruskal_time'], dtype=np.float64)
+    prim_low, prim_high = data['prim_time_ci_low'], data['prim_time_ci_high']
+    kruskal_low, kruskal_high = data['kruskal_time_ci_low'], data['kruskal_time_ci_high']
+    has_ci = ~(np.isnan(prim_low) | np.isnan(prim_high) | np.isnan(kruskal_low) | np.isnan(kruskal_high))
+    prim_wins = np.where(has_ci, prim_high < kruskal_low, prim_time <= kruskal_time)
+    kruskal_wins = np.where(has_ci, kruskal_high < prim_low, prim_time > kruskal_time)
+    winners = np.where(prim_wins, 'Prim', np.where(kruskal_wins, 'Kruskal', 'Tie'))
+    return np.where(np.isnan(prim_time) | np.isnan(kruskal_time), '-', winners)
 
-def plot_operations_vs_vertices(data, output_dir):
+def _bucket_quantiles(x, y, bins=AGGREGATE_BINS, quantiles=(5, 25, 50, 75, 95)):
+    """Quantiles of y within buckets of x (log-spaced when x is positive)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    lo, hi = x.min(), x.max()
+    if hi <= lo:
+        hi = lo + 1
+    geometric = lo > 0
+    edges = np.geomspace(lo, hi, bins + 1) if geometric else np.linspace(lo, hi, bins + 1)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, bins - 1)
+
+    order = np.argsort(bucket, kind='stable')
+    counts = np.bincount(bucket, minlength=bins)
+    groups = np.split(y[order], np.cumsum(counts)[:-1])
+
+    centers = np.sqrt(edges[:-1] * edges[1:]) if geometric else (edges[:-1] + edges[1:]) / 2
+    keep = counts > 0
+    table = np.array([np.percentile(g, quantiles) for g in groups if len(g)])
+    return centers[keep], table
+
+def _plot_series(x, y, style, label, color=None, aggregate=False, loglog=False, yerr=None):
+    """Plot y against x as one mark per graph, or as a binned median with quantile bands.
+
+    Graphs without a value (NaN) are left out, and an empty series is not drawn.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    recorded = ~np.isnan(y)
+    if not recorded.any():
+        return
+    if not recorded.all():
+        x, y = np.asarray(x)[recorded], y[recorded]
+        yerr = None if yerr is None else yerr[:, recorded]
+    if not aggregate and yerr is not None:
+        plt.errorbar(x, y, yerr=yerr, fmt=style, label=label, linewidth=2, markersize=8,
+                     color=color, capsize=3)
+        if loglog:
+            plt.xscale('log')
+            plt.yscale('log')
+        return
+    if not aggregate:
+        plot = plt.loglog if loglog else plt.plot
+        plot(x, y, style, label=label, linewidth=2, markersize=8, color=color)
+        return
+
+    centers, q = _bucket_quantiles(x, y)
+    line, = plt.plot(centers, q[:, 2], style, label=f'{label} (median)',
+                     linewidth=2, markersize=5, color=color)
+    plt.fill_between(centers, q[:, 1], q[:, 3], color=line.get_color(), alpha=0.3,
+                     label=f'{label} (IQR)')
+    plt.fill_between(centers, q[:, 0], q[:, 4], color=line.get_color(), alpha=0.12)
+    if loglog:
+        plt.xscale('log')
+        plt.yscale('log')
+
+def _legend(**kwargs):
+    """plt.legend, or a note on a panel left empty because no graph has the algorithm's block"""
+    if plt.gca().get_legend_handles_labels()[0]:
+        plt.legend(**kwargs)
+    else:
+        plt.text(0.5, 0.5, 'No results recorded', ha='center', va='center',
+                 transform=plt.gca().transAxes, fontsize=12, color='gray')
+
+def _plot_pairwise_density(data, prim_key, kruskal_key, ylabel, title, name, output_dir):
+    """Aggregate replacement for the per-graph bar charts"""
+    prim = np.asarray(data[prim_key], dtype=np.float64)
+    kruskal = np.asarray(data[kruskal_key], dtype=np.float64)
+    # Only graphs with both algorithm blocks have a point in the density panel
+    paired = ~np.isnan(prim) & ~np.isnan(kruskal)
+
+    plt.figure(figsize=(14, 6))
+
+    plt.subplot(1, 2, 1)
+    if paired.any():
+        prim_paired, kruskal_paired = prim[paired], kruskal[paired]
+        log_scale = prim_paired.min() > 0 and kruskal_paired.min() > 0
+        plt.hexbin(prim_paired, kruskal_paired, gridsize=40, mincnt=1, bins='log', cmap='viridis',
+                   xscale='log' if log_scale else 'linear',
+                   yscale='log' if log_scale else 'linear')
+        plt.colorbar(label='Graphs per cell (log)')
+        bounds = [min(prim_paired.min(), kruskal_paired.min()),
+                  max(prim_paired.max(), kruskal_paired.max())]
+        plt.plot(bounds, bounds, '--', color='gray', alpha=0.7, label='Equal performance')
+    plt.xlabel(f'Prim {ylabel}', fontsize=12)
+    plt.ylabel(f'Kruskal {ylabel}', fontsize=12)
+    plt.title(f'{title} - Density', fontsize=14, fontweight='bold')
+    _legend(fontsize=10)
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(1, 2, 2)
+    _plot_series(data['edges'], prim, 'o-', 'Prim', color='skyblue', aggregate=True)
+    _plot_series(data['edges'], kruskal, 's-', 'Kruskal', color='lightcoral', aggregate=True)
+    plt.xscale('log')
+    plt.xlabel('Number of Edges (E) - log scale', fontsize=12)
+    plt.ylabel(ylabel, fontsize=12)
+    plt.title(f'{title} - Quantiles per E bucket', fontsize=14, fontweight='bold')
+    plt.legend(fontsize=10)
+    plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    _save_figure(output_dir, name)
+
+def _scaled_to_max(values):
+    """Values divided by their largest recorded one, all NaN when nothing is recorded"""
+    values = np.asarray(values, dtype=np.float64)
+    recorded = values[~np.isnan(values)]
+    return values / recorded.max() if len(recorded) else values
+
+def plot_operations_vs_vertices(data, output_dir, mode='auto'):
     """Plot operations count vs number of vertices"""
+    aggregate = _aggregate_mode(data, mode)
     plt.figure(figsize=(12, 6))
 
     plt.subplot(1, 2, 1)
-    plt.plot(data['vertices'], data['prim_ops'], 'o-', label='Prim', linewidth=2, markersize=8)
-    plt.plot(data['vertices'], data['kruskal_ops'], 's-', label='Kruskal', linewidth=2, markersize=8)
+    _plot_series(data['vertices'], data['prim_ops'], 'o-', 'Prim', aggregate=aggregate)
+    _plot_series(data['vertices'], data['kruskal_ops'], 's-', 'Kruskal', aggregate=aggregate)
     plt.xlabel('Number of Vertices (V)', fontsize=12)
     plt.ylabel('Operations Count', fontsize=12)
     plt.title('Operations Count vs Vertices', fontsize=14, fontweight='bold')
@@ -64,17 +490,23 @@ def plot_operations_vs_vertices(data, output_dir):
     e = np.array(data['edges'])
 
     # Normalize for comparison
-    prim_norm = np.array(data['prim_ops']) / max(data['prim_ops'])
-    kruskal_norm = np.array(data['kruskal_ops']) / max(data['kruskal_ops'])
+    prim_norm = _scaled_to_max(data['prim_ops'])
+    kruskal_norm = _scaled_to_max(data['kruskal_ops'])
 
     # Theoretical: Prim = O(E log V), Kruskal = O(E log E)
     prim_theoretical = (e * np.log2(v + 1)) / max(e * np.log2(v + 1))
     kruskal_theoretical = (e * np.log2(e + 1)) / max(e * np.log2(e + 1))
 
-    plt.plot(data['vertices'], prim_norm, 'o-', label='Prim (Actual)', linewidth=2, markersize=8)
-    plt.plot(data['vertices'], kruskal_norm, 's-', label='Kruskal (Actual)', linewidth=2, markersize=8)
-    plt.plot(data['vertices'], prim_theoretical, '--', label='Prim O(E log V)', alpha=0.6, linewidth=2)
-    plt.plot(data['vertices'], kruskal_theoretical, '--', label='Kruskal O(E log E)', alpha=0.6, linewidth=2)
+    _plot_series(data['vertices'], prim_norm, 'o-', 'Prim (Actual)', aggregate=aggregate)
+    _plot_series(data['vertices'], kruskal_norm, 's-', 'Kruskal (Actual)', aggregate=aggregate)
+    if aggregate:
+        centers, q = _bucket_quantiles(data['vertices'], prim_theoretical)
+        plt.plot(centers, q[:, 2], '--', label='Prim O(E log V)', alpha=0.6, linewidth=2)
+        centers, q = _bucket_quantiles(data['vertices'], kruskal_theoretical)
+        plt.plot(centers, q[:, 2], '--', label='Kruskal O(E log E)', alpha=0.6, linewidth=2)
+    else:
+        plt.plot(data['vertices'], prim_theoretical, '--', label='Prim O(E log V)', alpha=0.6, linewidth=2)
+        plt.plot(data['vertices'], kruskal_theoretical, '--', label='Kruskal O(E log E)', alpha=0.6, linewidth=2)
     plt.xlabel('Number of Vertices (V)', fontsize=12)
     plt.ylabel('Normalized Operations', fontsize=12)
     plt.title('Actual vs Theoretical Complexity', fontsize=14, fontweight='bold')
@@ -82,39 +514,83 @@ def plot_operations_vs_vertices(data, output_dir):
     plt.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/operations_vs_vertices.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/operations_vs_vertices.png")
-    plt.close()
+    _save_figure(output_dir, 'operations_vs_vertices')
 
-def plot_time_vs_vertices(data, output_dir):
-    """Plot execution time vs number of vertices"""
-    plt.figure(figsize=(12, 6))
+def plot_time_vs_vertices(data, output_dir, mode='auto'):
+    """Plot execution time vs number of vertices, plus Borůvka's speedup curve when recorded"""
+    aggregate = _aggregate_mode(data, mode)
+    boruvka = np.isfinite(data['boruvka_time'])
+    panels = 3 if boruvka.any() else 2
+    plt.figure(figsize=(6 * panels, 6))
 
-    plt.subplot(1, 2, 1)
-    plt.plot(data['vertices'], data['prim_time'], 'o-', label='Prim', linewidth=2, markersize=8, color='blue')
-    plt.plot(data['vertices'], data['kruskal_time'], 's-', label='Kruskal', linewidth=2, markersize=8, color='red')
-    plt.xlabel('Number of Vertices (V)', fontsize=12)
-    plt.ylabel('Execution Time (ms)', fontsize=12)
-    plt.title('Execution Time vs Vertices', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=11)
-    plt.grid(True, alpha=0.3)
+    prim_err = _time_errors(data, 'prim')
+    kruskal_err = _time_errors(data, 'kruskal')
+    for panel, (x, label, title) in enumerate(((data['vertices'], 'Number of Vertices (V)', 'Vertices'),
+                                               (data['edges'], 'Number of Edges (E)', 'Edges')), 1):
+        plt.subplot(1, panels, panel)
+        _plot_series(x, data['prim_time'], 'o-', 'Prim', color='blue',
+                     aggregate=aggregate, yerr=prim_err)
+        _plot_series(x, data['kruskal_time'], 's-', 'Kruskal', color='red',
+                     aggregate=aggregate, yerr=kruskal_err)
+        if boruvka.any():
+            _plot_series(x[boruvka], data['boruvka_time'][boruvka], '^-', 'Borůvka (parallel)',
+                         color='green', aggregate=aggregate)
+        plt.xlabel(label, fontsize=12)
+        plt.ylabel('Execution Time (ms)', fontsize=12)
+        plt.title(f'Execution Time vs {title}', fontsize=14, fontweight='bold')
+        plt.legend(fontsize=11)
+        plt.grid(True, alpha=0.3)
 
-    plt.subplot(1, 2, 2)
-    plt.plot(data['edges'], data['prim_time'], 'o-', label='Prim', linewidth=2, markersize=8, color='blue')
-    plt.plot(data['edges'], data['kruskal_time'], 's-', label='Kruskal', linewidth=2, markersize=8, color='red')
-    plt.xlabel('Number of Edges (E)', fontsize=12)
-    plt.ylabel('Execution Time (ms)', fontsize=12)
-    plt.title('Execution Time vs Edges', fontsize=14, fontweight='bold')
-    plt.legend(fontsize=11)
-    plt.grid(True, alpha=0.3)
+    if boruvka.any():
+        plt.subplot(1, panels, 3)
+        _plot_speedup(data, aggregate)
 
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/time_vs_vertices.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/time_vs_vertices.png")
-    plt.close()
+    _save_figure(output_dir, 'time_vs_vertices')
+
+def _plot_speedup(data, aggregate):
+    """Borůvka speedup over the fewest workers timed against the worker count"""
+    counts = np.column_stack([data[f'boruvka_workers_{point}'] for point in range(MAX_SCALING_POINTS)])
+    ms = np.column_stack([data[f'boruvka_ms_{point}'] for point in range(MAX_SCALING_POINTS)])
+    workers = np.unique(counts[np.isfinite(counts)])
+    times = np.full((len(counts), len(workers)), np.nan)
+    for point in range(MAX_SCALING_POINTS):
+        valid = np.isfinite(counts[:, point])
+        times[valid, np.searchsorted(workers, counts[valid, point])] = ms[valid, point]
+    # Graphs that did not time the fewest workers have no baseline and are left out
+    base = int(workers[0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speedup = times[:, :1] / times
+    rows = np.flatnonzero(np.isfinite(speedup[:, 0]))
+
+    if aggregate:
+        q = np.nanpercentile(speedup[rows], (5, 50, 95), axis=0)
+        line, = plt.plot(workers, q[1], '^-', label='Borůvka (median)', linewidth=2,
+                         markersize=6, color='green')
+        plt.fill_between(workers, q[0], q[2], color=line.get_color(), alpha=0.2,
+                         label='Borůvka (5-95%)')
+    else:
+        for i in rows:
+            valid = np.isfinite(speedup[i])
+            plt.plot(workers[valid], speedup[i][valid], '^-', linewidth=2, markersize=6,
+                     label=f"Graph {data['graph_ids'][i]} (V={data['vertices'][i]})")
+    plt.plot(workers, workers / base, 'k--', alpha=0.5, label='Linear speedup')
+    plt.xscale('log', base=2)
+    plt.xticks(workers, [str(int(count)) for count in workers])
+    plt.xlabel('Worker Processes', fontsize=12)
+    plt.ylabel('Speedup over 1 Worker' if base == 1 else f'Speedup over {base} Workers', fontsize=12)
+    plt.title('Borůvka Speedup vs Cores', fontsize=14, fontweight='bold')
+    plt.legend(fontsize=9 if len(rows) > 4 else 11)
+    plt.grid(True, alpha=0.3)
 
-def plot_operations_comparison(data, output_dir):
+def plot_operations_comparison(data, output_dir, mode='auto'):
     """Plot operations comparison between algorithms"""
+    if _aggregate_mode(data, mode):
+        _plot_pairwise_density(data, 'prim_ops', 'kruskal_ops', 'Operations Count',
+                               'Operations Count Comparison', 'operations_comparison',
+                               output_dir)
+        return
+
     plt.figure(figsize=(10, 6))
 
     x = np.arange(len(data['graph_ids']))
@@ -131,19 +607,25 @@ def plot_operations_comparison(data, output_dir):
     plt.grid(True, axis='y', alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/operations_comparison.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/operations_comparison.png")
-    plt.close()
+    _save_figure(output_dir, 'operations_comparison')
 
-def plot_time_comparison(data, output_dir):
+def plot_time_comparison(data, output_dir, mode='auto'):
     """Plot execution time comparison"""
+    if _aggregate_mode(data, mode):
+        _plot_pairwise_density(data, 'prim_time', 'kruskal_time', 'Execution Time (ms)',
+                               'Execution Time Comparison', 'time_comparison',
+                               output_dir)
+        return
+
     plt.figure(figsize=(10, 6))
 
     x = np.arange(len(data['graph_ids']))
     width = 0.35
 
-    plt.bar(x - width/2, data['prim_time'], width, label='Prim', alpha=0.8, color='green')
-    plt.bar(x + width/2, data['kruskal_time'], width, label='Kruskal', alpha=0.8, color='orange')
+    plt.bar(x - width/2, data['prim_time'], width, label='Prim', alpha=0.8, color='green',
+            yerr=_time_errors(data, 'prim'), capsize=3)
+    plt.bar(x + width/2, data['kruskal_time'], width, label='Kruskal', alpha=0.8, color='orange',
+            yerr=_time_errors(data, 'kruskal'), capsize=3)
 
     plt.xlabel('Graph ID', fontsize=12)
     plt.ylabel('Execution Time (ms)', fontsize=12)
@@ -153,12 +635,11 @@ def plot_time_comparison(data, output_dir):
     plt.grid(True, axis='y', alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/time_comparison.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/time_comparison.png")
-    plt.close()
+    _save_figure(output_dir, 'time_comparison')
 
-def plot_density_analysis(data, output_dir):
+def plot_density_analysis(data, output_dir, mode='auto'):
     """Plot performance vs graph density"""
+    aggregate = _aggregate_mode(data, mode)
     plt.figure(figsize=(12, 6))
 
     # Calculate density: E / (V * (V-1) / 2)
@@ -168,8 +649,12 @@ def plot_density_analysis(data, output_dir):
     density = e / max_edges
 
     plt.subplot(1, 2, 1)
-    plt.scatter(density, data['prim_ops'], s=100, alpha=0.6, label='Prim', c='blue')
-    plt.scatter(density, data['kruskal_ops'], s=100, alpha=0.6, label='Kruskal', c='red', marker='s')
+    if aggregate:
+        _plot_series(density, data['prim_ops'], 'o-', 'Prim', color='blue', aggregate=True)
+        _plot_series(density, data['kruskal_ops'], 's-', 'Kruskal', color='red', aggregate=True)
+    else:
+        plt.scatter(density, data['prim_ops'], s=100, alpha=0.6, label='Prim', c='blue')
+        plt.scatter(density, data['kruskal_ops'], s=100, alpha=0.6, label='Kruskal', c='red', marker='s')
     plt.xlabel('Graph Density (E / Max_E)', fontsize=12)
     plt.ylabel('Operations Count', fontsize=12)
     plt.title('Operations vs Graph Density', fontsize=14, fontweight='bold')
@@ -177,8 +662,12 @@ def plot_density_analysis(data, output_dir):
     plt.grid(True, alpha=0.3)
 
     plt.subplot(1, 2, 2)
-    plt.scatter(density, data['prim_time'], s=100, alpha=0.6, label='Prim', c='blue')
-    plt.scatter(density, data['kruskal_time'], s=100, alpha=0.6, label='Kruskal', c='red', marker='s')
+    if aggregate:
+        _plot_series(density, data['prim_time'], 'o-', 'Prim', color='blue', aggregate=True)
+        _plot_series(density, data['kruskal_time'], 's-', 'Kruskal', color='red', aggregate=True)
+    else:
+        plt.scatter(density, data['prim_time'], s=100, alpha=0.6, label='Prim', c='blue')
+        plt.scatter(density, data['kruskal_time'], s=100, alpha=0.6, label='Kruskal', c='red', marker='s')
     plt.xlabel('Graph Density (E / Max_E)', fontsize=12)
     plt.ylabel('Execution Time (ms)', fontsize=12)
     plt.title('Execution Time vs Graph Density', fontsize=14, fontweight='bold')
@@ -186,12 +675,24 @@ def plot_density_analysis(data, output_dir):
     plt.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/density_analysis.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/density_analysis.png")
-    plt.close()
+    _save_figure(output_dir, 'density_analysis')
+
+def _plot_fitted_model(fit, model, v, e, x, aggregate, color=None):
+    """Overlay a fitted complexity model against x, labelled with its R²"""
+    predicted = predict(fit, model, v, e)
+    r_squared = fit['models'][model]['r_squared']
+    label = f'O({model}) fit' + (f' (R²={r_squared:.3f})' if r_squared is not None else '')
+    if aggregate:
+        x, q = _bucket_quantiles(x, predicted)
+        predicted = q[:, 2]
+    else:
+        order = np.argsort(x, kind='stable')
+        x, predicted = np.asarray(x)[order], predicted[order]
+    plt.loglog(x, predicted, '--', label=label, alpha=0.6, linewidth=2, color=color)
 
-def plot_complexity_verification(data, output_dir):
+def plot_complexity_verification(data, output_dir, mode='auto'):
     """Verify complexity with log-log plots"""
+    aggregate = _aggregate_mode(data, mode)
     plt.figure(figsize=(14, 6))
 
     v = np.array(data['vertices'])
@@ -199,39 +700,41 @@ def plot_complexity_verification(data, output_dir):
 
     # Plot 1: Prim complexity verification
     plt.subplot(1, 3, 1)
-    plt.loglog(v, data['prim_ops'], 'o-', label='Prim Operations', linewidth=2, markersize=8)
+    _plot_series(v, data['prim_ops'], 'o-', 'Prim Operations', aggregate=aggregate, loglog=True)
 
-    # Theoretical lines
-    v_range = np.linspace(min(v), max(v), 100)
-    e_range = np.linspace(min(e), max(e), 100)
-    scale_factor = data['prim_ops'][len(v)//2] / (e[len(e)//2] * np.log2(v[len(v)//2]))
-    plt.loglog(v_range, scale_factor * e_range.mean() * np.log2(v_range), '--',
-               label='O(E log V)', alpha=0.6, linewidth=2)
+    # Least-squares fitted models, evaluated at each graph's own (V, E)
+    fits = fit_all(data)['algorithms']
+    if 'prim' in fits:
+        _plot_fitted_model(fits['prim']['operations'], 'E log V', v, e, v, aggregate)
 
     plt.xlabel('Vertices (V) - log scale', fontsize=11)
     plt.ylabel('Operations - log scale', fontsize=11)
     plt.title("Prim's Complexity", fontsize=13, fontweight='bold')
-    plt.legend(fontsize=10)
+    _legend(fontsize=10)
     plt.grid(True, alpha=0.3, which="both")
 
     # Plot 2: Kruskal complexity verification
     plt.subplot(1, 3, 2)
-    plt.loglog(e, data['kruskal_ops'], 's-', label='Kruskal Operations', linewidth=2, markersize=8, color='red')
+    _plot_series(e, data['kruskal_ops'], 's-', 'Kruskal Operations', color='red',
+                 aggregate=aggregate, loglog=True)
 
-    scale_factor = data['kruskal_ops'][len(e)//2] / (e[len(e)//2] * np.log2(e[len(e)//2]))
-    plt.loglog(e_range, scale_factor * e_range * np.log2(e_range), '--',
-               label='O(E log E)', alpha=0.6, linewidth=2, color='darkred')
+    if 'kruskal' in fits:
+        _plot_fitted_model(fits['kruskal']['operations'], 'E log E', v, e, e, aggregate,
+                           color='darkred')
 
     plt.xlabel('Edges (E) - log scale', fontsize=11)
     plt.ylabel('Operations - log scale', fontsize=11)
     plt.title("Kruskal's Complexity", fontsize=13, fontweight='bold')
-    plt.legend(fontsize=10)
+    _legend(fontsize=10)
     plt.grid(True, alpha=0.3, which="both")
 
     # Plot 3: Direct comparison
     plt.subplot(1, 3, 3)
     ratio = np.array(data['kruskal_ops']) / np.array(data['prim_ops'])
-    plt.plot(data['vertices'], ratio, 'o-', linewidth=2, markersize=8, color='purple')
+    if aggregate:
+        _plot_series(data['vertices'], ratio, 'o-', 'Kruskal / Prim', color='purple', aggregate=True)
+    else:
+        plt.plot(data['vertices'], ratio, 'o-', linewidth=2, markersize=8, color='purple')
     plt.axhline(y=1, color='gray', linestyle='--', alpha=0.5, label='Equal performance')
     plt.xlabel('Number of Vertices (V)', fontsize=11)
     plt.ylabel('Kruskal Ops / Prim Ops', fontsize=11)
@@ -240,44 +743,143 @@ def plot_complexity_verification(data, output_dir):
     plt.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/complexity_verification.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/complexity_verification.png")
-    plt.close()
+    _save_figure(output_dir, 'complexity_verification')
+
+def _summary_rows(data, mode):
+    """Indices of the graphs listed in the summary table.
+
+    In aggregate mode only SUMMARY_TABLE_ROWS graphs are kept so the table
+    size no longer grows with the result set: every graph flagged by
+    certify.check_status, then the largest by edge count.
+    """
+    count = len(data['graph_ids'])
+    if not _aggregate_mode(data, mode) or count <= SUMMARY_TABLE_ROWS:
+        return np.arange(count)
+    # Flagged graphs first, then the largest of the rest
+    flagged = np.flatnonzero(np.asarray(data['mst_check']) & PROBLEMS)[:SUMMARY_TABLE_ROWS]
+    by_size = np.argsort(np.asarray(data['edges']), kind='stable')[::-1]
+    largest = by_size[~np.isin(by_size, flagged)][:SUMMARY_TABLE_ROWS - len(flagged)]
+    return np.sort(np.concatenate((flagged, largest)))
 
-def create_summary_table(data, output_dir):
+# Memory figures in the summary table, as (column suffix, header suffix) pairs
+MEMORY_COLUMNS = (('memory', '\nPeak (KB)'), ('jvm_allocated', ' JVM\nAlloc (KB)'))
+
+def _has_values(data, *columns):
+    """Whether any of these columns holds a recorded (non-NaN) value"""
+    return any(not np.isnan(data[column]).all() for column in columns)
+
+def has_memory_data(data):
+    """Whether any graph carries memory figures"""
+    return _has_values(data, 'prim_memory', 'kruskal_memory', 'prim_rss', 'kruskal_rss',
+                       'prim_jvm_allocated', 'kruskal_jvm_allocated')
+
+def check_counts(data):
+    """Number of graphs per certify.check_label outcome"""
+    labels = [check_label(int(status)) for status in data['mst_check']]
+    order = [label for _, label in CHECK_LABELS] + ['agree']
+    return {label: labels.count(label) for label in order if label in labels}
+
+def _format_count(value):
+    """Operation count as a table cell, '-' when not recorded"""
+    return '-' if np.isnan(value) else int(value)
+
+def _format_ms(value):
+    """Milliseconds as a table cell, '-' when not recorded"""
+    return '-' if value is None or np.isnan(value) else f'{value:.2f}'
+
+def _format_kb(value):
+    """Bytes as a table cell in KB, '-' when not recorded"""
+    return '-' if np.isnan(value) else f'{value / 1024:,.0f}'
+
+def plot_memory_vs_vertices(data, output_dir, mode='auto'):
+    """Plot peak memory vs number of vertices and edges"""
+    if not has_memory_data(data):
+        print("Skipped: memory_vs_vertices (no memory data; solve with mst_engine.py --memory)")
+        return False
+    aggregate = _aggregate_mode(data, mode)
+    series = [('prim_memory', 'o-', 'Prim allocated', 'blue'),
+              ('kruskal_memory', 's-', 'Kruskal allocated', 'red'),
+              ('prim_rss', 'o--', 'Prim resident', 'skyblue'),
+              ('kruskal_rss', 's--', 'Kruskal resident', 'lightcoral'),
+              ('prim_jvm_allocated', 'o:', 'Prim JVM allocated (total)', 'navy'),
+              ('kruskal_jvm_allocated', 's:', 'Kruskal JVM allocated (total)', 'darkred')]
+    # JVM totals count every allocation, so the axis is no longer only peaks
+    quantity = 'Memory' if _has_values(data, 'prim_jvm_allocated', 'kruskal_jvm_allocated') \
+        else 'Peak Memory'
+    plt.figure(figsize=(12, 6))
+
+    for position, (size_key, size_label) in enumerate((('vertices', 'Vertices (V)'),
+                                                        ('edges', 'Edges (E)')), start=1):
+        plt.subplot(1, 2, position)
+        for key, style, label, color in series:
+            values = np.asarray(data[key], dtype=np.float64) / 2**20
+            # Graphs that fit in memory the process already held show no resident growth
+            rows = values > 0
+            if not rows.any():
+                continue
+            x = np.asarray(data[size_key], dtype=np.float64)[rows]
+            order = np.argsort(x, kind='stable')
+            _plot_series(x[order], values[rows][order], style, label,
+                         color=color, aggregate=aggregate, loglog=True)
+        plt.xlabel(f'Number of {size_label} - log scale', fontsize=12)
+        plt.ylabel(f'{quantity} (MB) - log scale', fontsize=12)
+        plt.title(f'{quantity} vs {size_label.split()[0]}', fontsize=14, fontweight='bold')
+        plt.legend(fontsize=10)
+        plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    _save_figure(output_dir, 'memory_vs_vertices')
+
+def create_summary_table(data, output_dir, mode='auto'):
     """Create a summary table as an image"""
-    fig, ax = plt.subplots(figsize=(14, len(data['graph_ids']) * 0.5 + 1))
+    rows = _summary_rows(data, mode)
+    fig, ax = plt.subplots(figsize=(14, len(rows) * 0.5 + 1))
     ax.axis('tight')
     ax.axis('off')
 
     headers = ['Graph\nID', 'Vertices\n(V)', 'Edges\n(E)', 'Density',
                'Prim\nOps', 'Kruskal\nOps', 'Prim\nTime (ms)',
                'Kruskal\nTime (ms)', 'MST\nCost', 'Winner\n(Time)']
+    col_widths = [0.08, 0.09, 0.08, 0.09, 0.10, 0.10, 0.11, 0.11, 0.09, 0.10]
+    memory_columns = [(f'{algorithm}_{suffix}', f'{algorithm.capitalize()}{header}')
+                      for suffix, header in MEMORY_COLUMNS
+                      if _has_values(data, f'prim_{suffix}', f'kruskal_{suffix}')
+                      for algorithm in ('prim', 'kruskal')]
+    headers[8:8] = [header for _, header in memory_columns]
+    col_widths[8:8] = [0.10] * len(memory_columns)
+    # Only once some graph is flagged or certified (mst_engine.py --certify)
+    show_check = bool(np.any(np.asarray(data['mst_check'])[rows]))
+    if show_check:
+        headers.append('MST\nCheck')
+        col_widths.append(0.11)
 
     table_data = []
-    for i in range(len(data['graph_ids'])):
+    for i in rows:
         v = data['vertices'][i]
         e = data['edges'][i]
         density = e / (v * (v - 1) / 2) if v > 1 else 0
-        winner = 'Prim' if data['prim_time'][i] <= data['kruskal_time'][i] else 'Kruskal'
+        winner = time_winner(data, i)
 
         row = [
             data['graph_ids'][i],
             v,
             e,
             f'{density:.3f}',
-            data['prim_ops'][i],
-            data['kruskal_ops'][i],
-            f"{data['prim_time'][i]:.2f}",
-            f"{data['kruskal_time'][i]:.2f}",
+            _format_count(data['prim_ops'][i]),
+            _format_count(data['kruskal_ops'][i]),
+            _format_ms(data['prim_time'][i]),
+            _format_ms(data['kruskal_time'][i]),
             data['total_costs'][i],
             winner
         ]
+        row[8:8] = [_format_kb(data[column][i]) for column, _ in memory_columns]
+        if show_check:
+            row.append(check_label(int(data['mst_check'][i])))
         table_data.append(row)
 
     table = ax.table(cellText=table_data, colLabels=headers,
                      cellLoc='center', loc='center',
-                     colWidths=[0.08, 0.09, 0.08, 0.09, 0.10, 0.10, 0.11, 0.11, 0.09, 0.10])
+                     colWidths=col_widths)
 
     table.auto_set_font_size(False)
     table.set_fontsize(9)
@@ -294,43 +896,562 @@ def create_summary_table(data, output_dir):
             if i % 2 == 0:
                 table[(i, j)].set_facecolor('#f0f0f0')
 
-    plt.title('MST Algorithm Performance Summary', fontsize=16, fontweight='bold', pad=20)
-    plt.savefig(f'{output_dir}/summary_table.png', dpi=300, bbox_inches='tight')
-    print(f"Saved: {output_dir}/summary_table.png")
-    plt.close()
+    # Highlight graphs where the two trees disagree or a certificate failed
+    if show_check:
+        for i, index in enumerate(rows, start=1):
+            if data['mst_check'][index] & PROBLEMS:
+                table[(i, len(headers) - 1)].set_facecolor('#ffcdd2')
+
+    title = 'MST Algorithm Performance Summary'
+    if len(rows) < len(data['graph_ids']):
+        title += f"\n(top {len(rows)} of {len(data['graph_ids'])} graphs by edge count)"
+    plt.title(title, fontsize=16, fontweight='bold', pad=20)
+    _save_figure(output_dir, 'summary_table')
+
+def time_win_counts(data):
+    """Number of graphs won by Prim and by Kruskal, and ties, using time_winner's rule"""
+    winners = time_winners(data)
+    return {label: int((winners == label).sum()) for label in ('Prim', 'Kruskal', 'Tie')}
+
+def dataset_summary(data):
+    """Headline numbers for one dataset, used by the combined report"""
+    count = len(data['graph_ids'])
+    summary = {
+        'graphs': count,
+        'vertices': [int(data['vertices'].min()), int(data['vertices'].max())] if count else None,
+        'edges': [int(data['edges'].min()), int(data['edges'].max())] if count else None,
+        'total_mst_cost': int(data['total_costs'].sum()),
+        'time_wins': time_win_counts(data),
+        'mst_checks': check_counts(data),
+    }
+    # Totals cover the graphs that carry the algorithm's block, None when none does
+    for algorithm in ('prim', 'kruskal'):
+        ops = data[f'{algorithm}_ops']
+        recorded = ~np.isnan(ops)
+        summary[algorithm] = {
+            'total_operations': int(ops[recorded].sum()) if recorded.any() else None,
+            'total_time_ms': round(float(data[f'{algorithm}_time'][recorded].sum()), 4)
+            if recorded.any() else None,
+        }
+    # The ratio only compares graphs that ran both algorithms
+    paired = ~np.isnan(data['prim_ops']) & ~np.isnan(data['kruskal_ops'])
+    prim_ops = data['prim_ops'][paired].sum()
+    summary['kruskal_to_prim_ops'] = float(data['kruskal_ops'][paired].sum() / prim_ops) if prim_ops else None
+    return summary
+
+def write_combined_summary(datasets, filename):
+    """Write dataset_summary for every dataset as JSON"""
+    summaries = {name: dataset_summary(data) for name, data in datasets.items()}
+    with open(filename, 'w') as f:
+        json.dump({'datasets': summaries}, f, indent=2)
+    return summaries
+
+# Per-graph fields emitted by --stats, in output order
+STATS_FIELDS = (
+    'graph_id', 'vertices', 'edges', 'density', 'prim_ops', 'kruskal_ops',
+    'prim_time_ms', 'kruskal_time_ms', 'prim_memory_kb', 'kruskal_memory_kb',
+    'prim_jvm_allocated_kb', 'kruskal_jvm_allocated_kb', 'mst_cost', 'winner',
+    'mst_check', 'kruskal_to_prim_ops', 'prim_ops_per_e_log_v', 'kruskal_ops_per_e_log_e',
+)
+
+def graph_stats(data):
+    """Numbers behind create_summary_table plus complexity ratios, one column per STATS_FIELDS entry.
+
+    The ratios divide each operation count by its theoretical bound, so a
+    flat value across graph sizes confirms the expected growth rate.
+    """
+    v = np.asarray(data['vertices'], dtype=np.float64)
+    e = np.asarray(data['edges'], dtype=np.float64)
+    prim_ops = np.asarray(data['prim_ops'], dtype=np.float64)
+    kruskal_ops = np.asarray(data['kruskal_ops'], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = np.where(v > 1, e / (v * (v - 1) / 2), 0.0)
+        ops_ratio = kruskal_ops / prim_ops
+        prim_normalized = prim_ops / CANDIDATE_MODELS['E log V'](v, e)
+        kruskal_normalized = kruskal_ops / CANDIDATE_MODELS['E log E'](v, e)
+    columns = (data['graph_ids'], data['vertices'], data['edges'], density,
+               _counts(prim_ops), _counts(kruskal_ops), data['prim_time'], data['kruskal_time'],
+               np.asarray(data['prim_memory']) / 1024, np.asarray(data['kruskal_memory']) / 1024,
+               np.asarray(data['prim_jvm_allocated']) / 1024,
+               np.asarray(data['kruskal_jvm_allocated']) / 1024,
+               data['total_costs'], time_winners(data),
+               np.array([check_label(int(status)) for status in data['mst_check']], dtype=object),
+               ops_ratio, prim_normalized, kruskal_normalized)
+    return dict(zip(STATS_FIELDS, columns))
+
+def _counts(values):
+    """Float operation counts as ints, None where not recorded"""
+    counts = np.nan_to_num(values).astype(np.int64).astype(object)
+    counts[np.isnan(values)] = None
+    return counts
+
+def _stats_value(value):
+    """Plain Python value for JSON/CSV output, with non-finite floats as None"""
+    if isinstance(value, float):
+        return round(value, 6) if np.isfinite(value) else None
+    return value
 
-def main():
+def stats_records(data):
+    """graph_stats as one dict per graph"""
+    columns = [column.tolist() for column in graph_stats(data).values()]
+    return [dict(zip(STATS_FIELDS, map(_stats_value, row))) for row in zip(*columns)]
+
+def write_stats(datasets, stream, file_format='table'):
+    """Write per-graph stats and dataset totals for every dataset as a table, JSON or CSV"""
+    if file_format == 'json':
+        report = {name: {'summary': dataset_summary(data), 'graphs': stats_records(data)}
+                  for name, data in datasets.items()}
+        json.dump({'datasets': report}, stream, indent=2)
+        stream.write('\n')
+        return
+
+    if file_format == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(('dataset',) + STATS_FIELDS)
+        for name, data in datasets.items():
+            for record in stats_records(data):
+                writer.writerow([name] + ['' if value is None else value for value in record.values()])
+        return
+
+    headers = ('Graph', 'V', 'E', 'Density', 'Prim Ops', 'Kruskal Ops', 'Prim ms',
+               'Kruskal ms', 'Prim KB', 'Kruskal KB', 'P JVM KB', 'K JVM KB', 'Cost', 'Winner',
+               'Check', 'K/P Ops', 'P/ElogV', 'K/ElogE')
+    widths = (8, 7, 8, 8, 12, 12, 10, 10, 10, 10, 10, 10, 10, 8, 13, 8, 8, 8)
+    formats = ('{}', '{}', '{}', '{:.3f}', '{}', '{}', '{:.2f}', '{:.2f}', '{:.1f}', '{:.1f}',
+               '{:.1f}', '{:.1f}', '{}', '{}', '{}', '{:.3f}', '{:.3f}', '{:.3f}')
+    for name, data in datasets.items():
+        summary = dataset_summary(data)
+        wins = summary['time_wins']
+        checks = ', '.join(f'{label} {count}' for label, count in summary['mst_checks'].items())
+        stream.write(f"{name}: {summary['graphs']} graphs, wins Prim {wins['Prim']} / "
+                     f"Kruskal {wins['Kruskal']} / Tie {wins['Tie']}"
+                     + (f", MST check: {checks}" if checks else '') + "\n")
+        stream.write(' '.join(h.rjust(w) for h, w in zip(headers, widths)) + '\n')
+        for record in stats_records(data):
+            cells = ('-' if value is None else fmt.format(value)
+                     for value, fmt in zip(record.values(), formats))
+            stream.write(' '.join(c.rjust(w) for c, w in zip(cells, widths)) + '\n')
+
+def plot_dataset_scaling(datasets, output_dir, mode='auto'):
+    """Operations and time against edge count for every dataset on shared axes"""
+    plt.figure(figsize=(14, 6))
+    colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+
+    for panel, (suffix, ylabel, title) in enumerate((
+            ('ops', 'Operations Count', 'Operations Count vs Edges'),
+            ('time', 'Execution Time (ms)', 'Execution Time vs Edges')), start=1):
+        plt.subplot(1, 2, panel)
+        for k, (name, data) in enumerate(datasets.items()):
+            if len(data['graph_ids']) == 0:
+                continue
+            aggregate = _aggregate_mode(data, mode)
+            order = np.argsort(data['edges'], kind='stable')
+            color = colors[k % len(colors)]
+            _plot_series(data['edges'][order], data[f'prim_{suffix}'][order], 'o-',
+                         f'{name} Prim', color=color, aggregate=aggregate)
+            _plot_series(data['edges'][order], data[f'kruskal_{suffix}'][order], 's--',
+                         f'{name} Kruskal', color=color, aggregate=aggregate)
+        plt.xscale('log')
+        plt.xlabel('Number of Edges (E) - log scale', fontsize=12)
+        plt.ylabel(ylabel, fontsize=12)
+        plt.title(title, fontsize=14, fontweight='bold')
+        plt.legend(fontsize=9)
+        plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    _save_figure(output_dir, 'dataset_scaling')
+
+def create_dataset_summary_table(datasets, output_dir, mode='auto'):
+    """One table row per dataset with totals and time wins"""
+    fig, ax = plt.subplots(figsize=(14, len(datasets) * 0.5 + 1.5))
+    ax.axis('tight')
+    ax.axis('off')
+
+    headers = ['Dataset', 'Graphs', 'Vertices\n(range)', 'Edges\n(range)',
+               'Prim\nOps', 'Kruskal\nOps', 'Prim\nTime (ms)', 'Kruskal\nTime (ms)',
+               'Wins\nP / K / Tie']
+
+    table_data = []
+    for name, data in datasets.items():
+        summary = dataset_summary(data)
+        wins = summary['time_wins']
+        table_data.append([
+            name,
+            summary['graphs'],
+            '-' if summary['vertices'] is None else '{}-{}'.format(*summary['vertices']),
+            '-' if summary['edges'] is None else '{}-{}'.format(*summary['edges']),
+            '-' if summary['prim']['total_operations'] is None else summary['prim']['total_operations'],
+            '-' if summary['kruskal']['total_operations'] is None else summary['kruskal']['total_operations'],
+            _format_ms(summary['prim']['total_time_ms']),
+            _format_ms(summary['kruskal']['total_time_ms']),
+            f"{wins['Prim']} / {wins['Kruskal']} / {wins['Tie']}",
+        ])
+
+    table = ax.table(cellText=table_data, colLabels=headers,
+                     cellLoc='center', loc='center',
+                     colWidths=[0.16, 0.08, 0.11, 0.11, 0.11, 0.11, 0.11, 0.11, 0.12])
+
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    table.scale(1, 2)
+
+    for i in range(len(headers)):
+        table[(0, i)].set_facecolor('#4CAF50')
+        table[(0, i)].set_text_props(weight='bold', color='white')
+
+    for i in range(1, len(table_data) + 1):
+        for j in range(len(headers)):
+            if i % 2 == 0:
+                table[(i, j)].set_facecolor('#f0f0f0')
+
+    plt.title('MST Performance Across Datasets (totals)', fontsize=16, fontweight='bold', pad=20)
+    _save_figure(output_dir, 'dataset_summary')
+
+# Fill colours for phase_profile.PHASES, shared by the phase figures
+PHASE_COLORS = {
+    'heap_push': 'steelblue',
+    'heap_pop': 'darkorange',
+    'visited': 'seagreen',
+    'sort': 'mediumpurple',
+    'find': 'indianred',
+    'union': 'goldenrod',
+}
+
+def _phase_rows(data, algorithm):
+    """Mask of graphs whose results carry a phase breakdown for this algorithm"""
+    columns = [data[f'{algorithm}_{phase}_ms'] for phase in PHASES[algorithm]]
+    return ~np.isnan(np.vstack(columns)).any(axis=0)
+
+def _has_phase_data(data, name):
+    """Whether any graph has a phase breakdown; reports the skipped figure otherwise"""
+    if any(_phase_rows(data, algorithm).any() for algorithm in PHASES):
+        return True
+    print(f"Skipped: {name} (no phase data; solve with mst_engine.py --phases)")
+    return False
+
+def plot_phase_breakdown(data, output_dir, mode='auto'):
+    """Plot where each algorithm spends its time, phase by phase"""
+    if not _has_phase_data(data, 'phase_breakdown'):
+        return False
+    aggregate = _aggregate_mode(data, mode)
+    plt.figure(figsize=(14, 6))
+
+    for position, algorithm in enumerate(PHASES, start=1):
+        plt.subplot(1, 2, position)
+        rows = _phase_rows(data, algorithm)
+        phases = PHASES[algorithm]
+        times = [np.asarray(data[f'{algorithm}_{phase}_ms'])[rows] for phase in phases]
+        colors = [PHASE_COLORS[phase] for phase in phases]
+        if aggregate:
+            medians = []
+            for phase_times in times:
+                centers, q = _bucket_quantiles(np.asarray(data['edges'])[rows], phase_times)
+                medians.append(q[:, 2])
+            plt.stackplot(centers, *medians, labels=phases, colors=colors, alpha=0.8)
+            plt.xscale('log')
+            plt.xlabel('Number of Edges (E) - log scale', fontsize=12)
+            plt.ylabel('Median Phase Time (ms)', fontsize=12)
+        else:
+            order = np.argsort(np.asarray(data['edges'])[rows], kind='stable')
+            x = np.arange(len(order))
+            bottom = np.zeros(len(order))
+            for phase, phase_times, color in zip(phases, times, colors):
+                plt.bar(x, phase_times[order], bottom=bottom, label=phase, color=color, alpha=0.8)
+                bottom += phase_times[order]
+            # Every graph keeps its bar, but at most PHASE_BAR_TICKS are labelled
+            step = -(-len(x) // PHASE_BAR_TICKS)
+            plt.xticks(x[::step], np.asarray(data['graph_ids'])[rows][order][::step],
+                       rotation=45 if step > 1 else 0)
+            plt.xlabel('Graph ID (by number of edges)', fontsize=12)
+            plt.ylabel('Phase Time (ms)', fontsize=12)
+        plt.title(f'{algorithm.capitalize()} - Time per Phase', fontsize=14, fontweight='bold')
+        plt.legend(fontsize=10)
+        plt.grid(True, axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    _save_figure(output_dir, 'phase_breakdown')
+
+def plot_phase_scaling(data, output_dir, mode='auto'):
+    """Plot how each phase's operation count grows with the number of edges"""
+    if not _has_phase_data(data, 'phase_scaling'):
+        return False
+    aggregate = _aggregate_mode(data, mode)
+    plt.figure(figsize=(14, 6))
+
+    for position, algorithm in enumerate(PHASES, start=1):
+        plt.subplot(1, 2, position)
+        rows = _phase_rows(data, algorithm)
+        edges = np.asarray(data['edges'], dtype=np.float64)[rows]
+        order = np.argsort(edges, kind='stable')
+        for phase in PHASES[algorithm]:
+            counts = np.asarray(data[f'{algorithm}_{phase}_count'])[rows]
+            _plot_series(edges[order], np.clip(counts[order], 1, None), 'o-', phase,
+                         color=PHASE_COLORS[phase], aggregate=aggregate, loglog=True)
+        plt.xlabel('Number of Edges (E) - log scale', fontsize=12)
+        plt.ylabel('Phase Operations - log scale', fontsize=12)
+        plt.title(f'{algorithm.capitalize()} - Operations per Phase', fontsize=14, fontweight='bold')
+        plt.legend(fontsize=10)
+        plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    _save_figure(output_dir, 'phase_scaling')
+
+# Figures rendered for each dataset, in output order
+PLOT_FUNCTIONS = (
+    plot_operations_vs_vertices,
+    plot_time_vs_vertices,
+    plot_operations_comparison,
+    plot_time_comparison,
+    plot_density_analysis,
+    plot_complexity_verification,
+    create_summary_table,
+    plot_phase_breakdown,
+    plot_phase_scaling,
+    plot_memory_vs_vertices,
+)
+
+# Cross-dataset figures, rendered once when several datasets are given
+COMBINED_PLOT_FUNCTIONS = (
+    plot_dataset_scaling,
+    create_dataset_summary_table,
+)
+
+# Read-only datasets (name -> columns) shared with render workers, set once per process
+_worker_datasets = None
+
+def _init_render_worker(datasets, profile='standard'):
+    """Install the shared datasets and rendering profile in a worker process"""
+    global _worker_datasets
+    _worker_datasets = datasets
+    set_render_profile(profile)
+
+def _render_plot(name, index, output_dir, mode):
+    """Render one figure of dataset ``name``, or a combined figure when name is None.
+
+    Returns whether a figure was drawn; plot functions return False when
+    the dataset lacks the data they need.
+    """
+    if name is None:
+        drawn = COMBINED_PLOT_FUNCTIONS[index](_worker_datasets, output_dir, mode=mode)
+    else:
+        drawn = PLOT_FUNCTIONS[index](_worker_datasets[name], output_dir, mode=mode)
+    return drawn is not False
+
+def render_datasets(datasets, output_dirs, combined_dir=None, workers=None, mode='auto',
+                    profile='standard'):
+    """Render the figures of several datasets, and optionally the combined report, in one pool.
+
+    ``datasets`` maps a name to its columns and ``output_dirs`` maps the same
+    names to directories. Every figure of every dataset is an independent
+    task, so the pool stays busy regardless of how the work is split between
+    datasets. Combined figures go to ``combined_dir`` when it is given.
+    Returns the number of figures drawn.
+    """
+    global _pdf_bundle
+    tasks = [(name, i, output_dirs[name]) for name in datasets for i in range(len(PLOT_FUNCTIONS))]
+    if combined_dir is not None:
+        tasks += [(None, i, combined_dir) for i in range(len(COMBINED_PLOT_FUNCTIONS))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+    set_render_profile(profile)
+
+    if 'bundle' in _render_profile or workers == 1:
+        _init_render_worker(datasets, profile)
+
+    drawn = 0
+    if 'bundle' in _render_profile:
+        # One multi-page PDF per output directory
+        for output_dir in dict.fromkeys(task[2] for task in tasks):
+            filename = f"{output_dir}/{_render_profile['bundle']}"
+            with backend_pdf.PdfPages(filename, metadata=_metadata('pdf')) as pdf:
+                _pdf_bundle = pdf
+                try:
+                    for name, index, task_dir in tasks:
+                        if task_dir == output_dir:
+                            drawn += _render_plot(name, index, output_dir, mode)
+                finally:
+                    _pdf_bundle = None
+            print(f"Saved: {filename}")
+        return drawn
+
+    if workers == 1:
+        for name, index, output_dir in tasks:
+            drawn += _render_plot(name, index, output_dir, mode)
+        return drawn
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(datasets, profile)) as pool:
+        futures = [pool.submit(_render_plot, name, index, output_dir, mode)
+                   for name, index, output_dir in tasks]
+        # Surface the first failure instead of silently skipping a figure
+        for future in futures:
+            drawn += future.result()
+    return drawn
+
+def render_plots(data, output_dir, workers=None, mode='auto', profile='standard'):
+    """Render all figures of one dataset, spreading them across a process pool.
+
+    Each figure writes its own file, so output is identical to a sequential
+    run regardless of completion order. ``workers=1`` renders in-process.
+    ``mode`` is 'detailed', 'aggregate' or 'auto' (aggregate above
+    DETAILED_PLOT_LIMIT graphs). ``profile`` names an entry of
+    RENDER_PROFILES; the 'bundle' profile writes all figures into one PDF in
+    a single pass, so it always renders in-process.
+    """
+    return render_datasets({output_dir: data}, {output_dir: output_dir}, workers=workers,
+                           mode=mode, profile=profile)
+
+def load_datasets(filenames, use_cache=True, workers=None):
+    """Load several result files concurrently, returning columns in the same order"""
+    loader = load_columns_cached if use_cache else load_columns
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(filenames)))
+    if workers == 1:
+        return [loader(filename) for filename in filenames]
+    # Parsing is CPU-bound, so use processes rather than threads
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(loader, filenames))
+
+def _dataset_spec(text):
+    """Split a NAME=PATH command-line dataset into (name, path); the name defaults to the file stem"""
+    name, separator, path = text.partition('=')
+    if not separator:
+        return Path(text).stem, text
+    if not name or not path:
+        raise argparse.ArgumentTypeError(f'expected NAME=PATH or PATH, got {text!r}')
+    return name, path
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description='Generate MST complexity visualizations')
+    parser.add_argument('results', nargs='*', type=_dataset_spec,
+                        help='result files (output.json documents or JSON Lines), optionally as NAME=PATH '
+                             '(default: output.json). With several files each gets its own '
+                             'plot directory plus a combined cross-dataset report')
+    parser.add_argument('--output-dir', default='analysis_plots',
+                        help='directory for the plots (default: analysis_plots)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'always re-parse the result files instead of using {CACHE_DIR}/')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of processes used to load and render (default: CPU count)')
+    parser.add_argument('--profile', choices=tuple(RENDER_PROFILES), default='standard',
+                        help='standard (300-dpi PNG), preview (72-dpi PNG), svg, pdf, '
+                             'or bundle (all figures in one multi-page PDF)')
+    parser.add_argument('--plot-mode', choices=('auto', 'detailed', 'aggregate'), default='auto',
+                        help='one mark per graph, binned/quantile summaries, or pick by '
+                             f'result count (aggregate above {DETAILED_PLOT_LIMIT} graphs)')
+    parser.add_argument('--stats', choices=('table', 'json', 'csv'),
+                        help='print the summary-table numbers and complexity ratios in this '
+                             'format instead of drawing figures (matplotlib is never imported)')
+    parser.add_argument('--stats-output',
+                        help='write --stats output to this file instead of stdout')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-render whenever the result files gain '
+                             'records; JSON Lines streams are read incrementally')
+    parser.add_argument('--interval', type=float, default=2.0,
+                        help='seconds between --watch polls (default: 2)')
+    args = parser.parse_args(argv)
+    if not args.results:
+        args.results = [_dataset_spec('output.json')]
+    names = [name for name, _ in args.results]
+    if len(set(names)) != len(names):
+        parser.error('dataset names must be unique; use NAME=PATH to disambiguate')
+    return args
+
+def write_stats_report(args):
+    """--stats entry point: load the result files and emit numbers only"""
+    names = [name for name, _ in args.results]
+    filenames = [path for _, path in args.results]
+    columns = load_datasets(filenames, use_cache=not args.no_cache, workers=args.workers)
+    datasets = dict(zip(names, columns))
+    if args.stats_output:
+        with open(args.stats_output, 'w', newline='') as f:
+            write_stats(datasets, f, args.stats)
+    else:
+        write_stats(datasets, sys.stdout, args.stats)
+
+def write_reports(datasets, output_dirs, combined_dir=None):
+    """Write complexity_fit.json for each dataset, plus combined_summary.json into combined_dir"""
+    for name, data in datasets.items():
+        fits_file = f'{output_dirs[name]}/complexity_fit.json'
+        fits = write_fits(data, fits_file)
+        print(f"Saved: {fits_file}")
+        for line in describe(fits):
+            print(f"  {line}")
+    if combined_dir is not None:
+        write_combined_summary(datasets, f'{combined_dir}/combined_summary.json')
+        print(f"Saved: {combined_dir}/combined_summary.json")
+
+def watch_results(args, output_dirs, combined_dir=None):
+    """--watch entry point: re-render every time the result files gain records"""
+    tails = {name: ResultsTail(path) for name, path in args.results}
+    print(f"\nWatching {', '.join(path for _, path in args.results)} "
+          f"every {args.interval:g} s (Ctrl+C to stop)")
+    try:
+        while True:
+            added = sum(tail.poll() for tail in tails.values())
+            datasets = {name: tail.columns for name, tail in tails.items()}
+            if added and all(len(data['graph_ids']) for data in datasets.values()):
+                plot_count = render_datasets(datasets, output_dirs, combined_dir=combined_dir,
+                                             workers=args.workers, mode=args.plot_mode,
+                                             profile=args.profile)
+                write_reports(datasets, output_dirs, combined_dir=combined_dir)
+                total = sum(len(data['graph_ids']) for data in datasets.values())
+                print(f"[{time.strftime('%H:%M:%S')}] +{added} result(s), {total} in total, "
+                      f"{plot_count} plot(s) rendered")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+def main(argv=None):
     """Main function to generate all visualizations"""
+    args = parse_args(argv)
+    if args.stats:
+        write_stats_report(args)
+        return
+
     print("=" * 60)
     print("MST Algorithm Complexity Analysis - Visualization Generator")
     print("=" * 60)
 
-    # Create output directory
-    output_dir = 'analysis_plots'
-    Path(output_dir).mkdir(exist_ok=True)
+    # One dataset writes straight into the output directory; several get a
+    # subdirectory each and the combined report at the top level
+    output_dir = args.output_dir
+    combined = len(args.results) > 1
+    output_dirs = {name: f'{output_dir}/{name}' if combined else output_dir
+                   for name, _ in args.results}
+    for directory in output_dirs.values():
+        Path(directory).mkdir(parents=True, exist_ok=True)
     print(f"\nOutput directory: {output_dir}/")
 
+    if args.watch:
+        watch_results(args, output_dirs, combined_dir=output_dir if combined else None)
+        return
+
     # Load results
-    print("\nLoading results from output.json...")
-    results = load_results('output.json')
-    data = extract_data(results)
-    print(f"Loaded {len(results)} graph results")
+    filenames = [path for _, path in args.results]
+    print(f"\nLoading results from {', '.join(filenames)}...")
+    columns = load_datasets(filenames, use_cache=not args.no_cache, workers=args.workers)
+    datasets = dict(zip(output_dirs, columns))
+    for name, data in datasets.items():
+        label = f'{name}: ' if combined else ''
+        print(f"{label}Loaded {len(data['graph_ids'])} graph results")
 
     # Generate plots
     print("\nGenerating visualizations...")
     print("-" * 60)
 
-    plot_operations_vs_vertices(data, output_dir)
-    plot_time_vs_vertices(data, output_dir)
-    plot_operations_comparison(data, output_dir)
-    plot_time_comparison(data, output_dir)
-    plot_density_analysis(data, output_dir)
-    plot_complexity_verification(data, output_dir)
-    create_summary_table(data, output_dir)
+    plot_count = render_datasets(datasets, output_dirs, combined_dir=output_dir if combined else None,
+                                 workers=args.workers, mode=args.plot_mode, profile=args.profile)
+    write_reports(datasets, output_dirs, combined_dir=output_dir if combined else None)
 
     print("-" * 60)
     print(f"\n✓ All visualizations generated successfully!")
-    print(f"✓ Total plots created: 7")
+    print(f"✓ Total plots created: {plot_count}")
     print(f"✓ Check the '{output_dir}/' directory for all images")
     print("=" * 60)
 